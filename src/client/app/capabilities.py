@@ -0,0 +1,202 @@
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import time
+
+KINDS = ("tools", "resources", "prompts")
+
+# Server notifications that invalidate a cached list
+LIST_CHANGED = {
+    "ToolListChangedNotification": "tools",
+    "ResourceListChangedNotification": "resources",
+    "PromptListChangedNotification": "prompts",
+    # A subscribed resource changed, so its version in the resource list is stale
+    "ResourceUpdatedNotification": "resources",
+}
+
+
+def _dump(item):
+    if hasattr(item, "model_dump"):
+        return item.model_dump(mode="json", exclude_none=True)
+    return item
+
+
+def _restore(kind, item):
+    """Turn a saved entry back into the mcp type the live client returns, when mcp is installed"""
+    if not isinstance(item, dict):
+        return item
+    try:
+        import mcp.types
+        model = {"tools": mcp.types.Tool, "resources": mcp.types.Resource, "prompts": mcp.types.Prompt}[kind]
+        return model.model_validate(item)
+    except Exception:
+        return item
+
+
+class CapabilityCache:
+    """
+    Client-side cache of the server's tools, resources and prompts.
+
+    - get(): Returns all three lists, fetching the stale ones concurrently.
+    - list(kind): Returns one list, fetching only that one when stale.
+    - invalidate(kind=None): Marks one list (or all) stale; called on list-changed notifications.
+    - save()/load(): Persists the cache as JSON for warm starts.
+
+    Lists are refetched when invalidated or older than `ttl` seconds. `version`
+    increases whenever the cached contents actually change, so callers can key
+    derived data (formatted capabilities, rendered prompts) on it.
+
+    Each kind is fetched on its own: when one list_* call fails (e.g. a server
+    without prompts), the previous list of that kind is kept (get() reports an
+    empty one if there is none, list() raises the error) and it is retried after
+    `ttl` seconds, or on the next call if it had been invalidated.
+    """
+    def __init__(self, fastmcp_client, ttl=300.0, path=None):
+        """
+        Args:
+            fastmcp_client: Client providing list_tools/list_resources/list_prompts
+            ttl (float): Seconds before a cached list is refetched (None never expires)
+            path (str): JSON file used by save() and load()
+        """
+        self._client = fastmcp_client
+        self.ttl = ttl
+        self.path = path
+        self.version = 0
+        self.fingerprint = None
+        self._lists = {}
+        self._fetched_at = {}
+        self._dirty = set()
+        self._fetches = {}
+        self.errors = {}
+        self.stats = {"hits": 0, "fetches": 0, "invalidations": 0, "errors": 0}
+
+    def _stale(self, now=None):
+        now = now or time.time()
+        return [
+            kind for kind in KINDS
+            if kind not in self._fetched_at or kind in self._dirty
+            or (self.ttl is not None and now - self._fetched_at[kind] >= self.ttl)
+        ]
+
+    async def get(self, refresh=False):
+        """
+        Return {"tools", "resources", "prompts", "version"}, fetching stale lists first.
+        Concurrent callers share the in-flight fetch of each kind.
+        """
+        if refresh:
+            self.invalidate()
+        await self._ensure(KINDS)
+        return {**{kind: self._lists.get(kind, []) for kind in KINDS}, "version": self.version}
+
+    async def _ensure(self, kinds):
+        stale = [kind for kind in self._stale() if kind in kinds]
+        if not stale:
+            self.stats["hits"] += 1
+            return
+        missing = [kind for kind in stale if kind not in self._fetches]
+        if missing:
+            fetch = asyncio.ensure_future(self._refresh(missing))
+            for kind in missing:
+                self._fetches[kind] = fetch
+            fetch.add_done_callback(functools.partial(self._fetch_done, missing))
+        # wait() rather than gather(): a cancelled caller must not cancel a fetch others share
+        await asyncio.wait({self._fetches[kind] for kind in stale})
+
+    def _fetch_done(self, kinds, fetch):
+        for kind in kinds:
+            if self._fetches.get(kind) is fetch:
+                del self._fetches[kind]
+
+    async def _refresh(self, kinds):
+        # Invalidations that arrive while fetching stay pending for the next get()
+        invalidated = self._dirty.intersection(kinds)
+        self._dirty.difference_update(kinds)
+        results = await asyncio.gather(*(getattr(self._client, f"list_{kind}")() for kind in kinds),
+                                       return_exceptions=True)
+        now = time.time()
+        stored = False
+        for kind, items in zip(kinds, results):
+            self._fetched_at[kind] = now
+            if isinstance(items, BaseException):
+                self.errors[kind] = items
+                self.stats["errors"] += 1
+                if kind in invalidated:
+                    self._dirty.add(kind)
+                continue
+            self.errors.pop(kind, None)
+            self._lists[kind] = items
+            stored = True
+        self.stats["fetches"] += 1
+        if stored:
+            self._update_version()
+
+    def _update_version(self):
+        snapshot = json.dumps({kind: [_dump(item) for item in self._lists.get(kind, [])] for kind in KINDS},
+                              sort_keys=True, default=str)
+        fingerprint = hashlib.sha1(snapshot.encode("utf-8")).hexdigest()
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.version += 1
+
+    async def list(self, kind):
+        """
+        Cached list of one kind ("tools", "resources" or "prompts").
+        Raises the fetch error if the list could not be fetched and nothing is cached.
+        """
+        await self._ensure((kind,))
+        if kind not in self._lists:
+            raise self.errors.get(kind) or RuntimeError(f"The {kind} list could not be fetched")
+        return self._lists[kind]
+
+    def invalidate(self, kind=None):
+        """Mark one list, or all of them, as stale"""
+        self.stats["invalidations"] += 1
+        self._dirty.update((kind,) if kind else KINDS)
+
+    async def handle_message(self, message):
+        """
+        Message handler for the FastMCP client: invalidates the matching list
+        when the server sends a tools/resources/prompts list_changed notification,
+        and the resource list on resources/updated.
+        """
+        root = getattr(message, "root", message)
+        kind = LIST_CHANGED.get(type(root).__name__)
+        if kind:
+            self.invalidate(kind)
+
+    def save(self, path=None):
+        """Write the cached lists to a JSON file (atomically)"""
+        path = path or self.path
+        data = {
+            "version": self.version,
+            "fingerprint": self.fingerprint,
+            "fetched_at": {kind: self._fetched_at[kind] for kind in KINDS if kind in self._lists},
+            "lists": {kind: [_dump(item) for item in self._lists[kind]] for kind in KINDS if kind in self._lists},
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """
+        Load lists saved by save(). Entries keep their original fetch time, so the TTL still applies.
+        Returns True if a cache file was loaded.
+        """
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        for kind, items in data.get("lists", {}).items():
+            if kind in KINDS:
+                self._lists[kind] = [_restore(kind, item) for item in items]
+                self._fetched_at[kind] = data.get("fetched_at", {}).get(kind, 0)
+        self.version = data.get("version", 0)
+        self.fingerprint = data.get("fingerprint")
+        return True
@@ -0,0 +1,273 @@
+import json
+import math
+import re
+from collections import Counter, OrderedDict
+
+KINDS = ("tools", "prompts", "resources")
+
+# Rough token estimate used for budgets: about 4 characters of JSON per token
+CHARS_PER_TOKEN = 4
+
+# Schema keys that cost tokens without helping a planner pick or call a tool
+_NOISE_KEYS = ("title", "additionalProperties")
+
+_WORD = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+
+
+def _terms(text):
+    """Lowercased words, splitting snake_case, kebab-case and camelCase"""
+    return [word.lower() for word in _WORD.findall(text or "")]
+
+
+def truncate(text, max_tokens):
+    """First paragraph of a description, cut at a word boundary to about max_tokens"""
+    text = " ".join((text or "").strip().split("\n\n")[0].split())
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut.rstrip(",;:") + "…"
+
+
+def _field(item, name, default=None):
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+def _key(kind, item):
+    """Name of a tool or prompt, URI of a resource"""
+    if isinstance(item, str):
+        return item
+    if kind == "resources":
+        return str(_field(item, "uri", "") or _field(item, "name", ""))
+    return _field(item, "name", "")
+
+
+def _strip(schema):
+    if isinstance(schema, dict):
+        return {key: _strip(value) for key, value in schema.items() if key not in _NOISE_KEYS}
+    if isinstance(schema, list):
+        return [_strip(value) for value in schema]
+    return schema
+
+
+class LexicalIndex:
+    """BM25 index over capability names, descriptions and parameter names"""
+    def __init__(self, documents, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs = [Counter(terms) for terms in documents]
+        self._lengths = [len(terms) for terms in documents]
+        self._avg = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        frequency = Counter(term for doc in self._docs for term in doc)
+        count = len(self._docs)
+        self._idf = {term: math.log(1 + (count - df + 0.5) / (df + 0.5)) for term, df in frequency.items()}
+
+    def scores(self, query):
+        terms = [term for term in _terms(query) if term in self._idf]
+        result = []
+        for doc, length in zip(self._docs, self._lengths):
+            score = 0.0
+            for term in terms:
+                tf = doc.get(term)
+                if tf:
+                    norm = self.k1 * (1 - self.b + self.b * length / (self._avg or 1))
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            result.append(score)
+        return result
+
+
+class CapabilityEncoder:
+    """
+    Compact, token-budgeted encoding of tools, prompts and resources for LLM planning.
+
+    - Parameters are written as {"name": "type"} (optional ones as "name?"); schema
+      fragments used by more than one tool are stored once under "defs" and referenced by key.
+    - Descriptions are cut to their first paragraph and `description_tokens`.
+    - With a query, capabilities are ranked by BM25 relevance; under a budget the best
+      ranked ones keep their details, then names only, and the rest are counted in "omitted".
+    - Results are cached by capability version, query and budget.
+    """
+    def __init__(self, budget=None, description_tokens=40, cache_size=128):
+        """
+        Args:
+            budget (int): Default token budget for encode() (None = unlimited)
+            description_tokens (int): Maximum tokens kept per description
+            cache_size (int): Encoded results kept per capability version
+        """
+        self.budget = budget
+        self.description_tokens = description_tokens
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._prepared = None
+        self.stats = {"hits": 0, "misses": 0}
+
+    def encode(self, caps, query=None, budget=None, version=None):
+        """
+        Encode {"tools", "prompts", "resources"} into a compact JSON string.
+        Pass the capability version (e.g. CapabilityCache.version) to reuse earlier work.
+        """
+        budget = budget if budget is not None else self.budget
+        key = (version, " ".join(_terms(query)), budget)
+        if version is not None and key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._cache[key]
+        self.stats["misses"] += 1
+        entries, defs, index = self._prepare(caps, version)
+        encoded = self._select(entries, defs, index, query, budget)
+        if version is not None:
+            self._cache[key] = encoded
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return encoded
+
+    def _prepare(self, caps, version):
+        """Per-version work: compact entries, shared schema fragments and the lexical index"""
+        if version is not None and self._prepared is not None and self._prepared[0] == version:
+            return self._prepared[1]
+        # Encodings of an older version are stale
+        self._cache.clear()
+
+        params = {}
+        for position, item in enumerate(caps.get("tools") or []):
+            if not isinstance(item, str):
+                params[position] = self._params(_field(item, "inputSchema") or {})
+        fragments = Counter(_dumps(value) for compact in params.values() for value in compact.values()
+                            if not isinstance(value, str))
+        defs, refs = {}, {}
+
+        def ref(fragment):
+            if fragment not in refs:
+                refs[fragment] = f"#{len(refs) + 1}"
+                defs[refs[fragment]] = json.loads(fragment)
+            return refs[fragment]
+
+        entries, documents = [], []
+        for kind in KINDS:
+            for position, item in enumerate(caps.get(kind) or []):
+                tool_params = params.get(position, {}) if kind == "tools" else {}
+                entry, uses, terms = self._entry(kind, item, tool_params, fragments, ref)
+                entries.append((kind, entry, uses))
+                documents.append(terms)
+        prepared = (entries, defs, LexicalIndex(documents))
+        self._prepared = (version, prepared)
+        return prepared
+
+    @staticmethod
+    def _params(schema):
+        """
+        Compact parameters of an input schema: {"name" or "name?": type or schema fragment},
+        with the schema's own $defs inlined so identical fragments compare equal across tools
+        """
+        schema = _strip(schema)
+        local = schema.get("$defs") or {}
+
+        def inline(value, seen):
+            if isinstance(value, dict):
+                target = value.get("$ref")
+                if isinstance(target, str) and target.startswith("#/$defs/"):
+                    name = target[len("#/$defs/"):]
+                    if name in local and name not in seen:
+                        return inline(local[name], seen | {name})
+                return {key: inline(item, seen) for key, item in value.items()}
+            if isinstance(value, list):
+                return [inline(item, seen) for item in value]
+            return value
+
+        required = set(schema.get("required") or [])
+        params = {}
+        for name, value in (schema.get("properties") or {}).items():
+            value = inline(value, frozenset())
+            if isinstance(value, dict):
+                value.pop("description", None)
+                value.pop("default", None)
+                if set(value) == {"type"} and isinstance(value["type"], str):
+                    value = value["type"]
+            params[name if name in required else f"{name}?"] = value
+        return params
+
+    def _entry(self, kind, item, tool_params, fragments, ref):
+        """Compact form of one capability, the defs it references and its index terms"""
+        name = _key(kind, item)
+        if isinstance(item, str):
+            return item, (), _terms(item) * 2
+        description = truncate(_field(item, "description"), self.description_tokens)
+        terms = _terms(name) * 2 + _terms(_field(item, "title")) + _terms(description)
+        entry = {"uri" if kind == "resources" else "name": name}
+        if description:
+            entry["description"] = description
+        uses = []
+        if kind == "tools":
+            params = {}
+            for param, value in tool_params.items():
+                if not isinstance(value, str):
+                    fragment = _dumps(value)
+                    if fragments[fragment] > 1:
+                        value = ref(fragment)
+                        uses.append(value)
+                params[param] = value
+                terms += _terms(param)
+            if params:
+                entry["params"] = params
+        elif kind == "prompts":
+            args = [_field(arg, "name") + ("" if _field(arg, "required") else "?")
+                    for arg in _field(item, "arguments") or []]
+            if args:
+                entry["args"] = args
+                terms += _terms(" ".join(args))
+        elif _field(item, "mimeType"):
+            entry["mimeType"] = _field(item, "mimeType")
+        if len(entry) == 1:
+            entry = name
+        return entry, tuple(uses), terms
+
+    def _select(self, entries, defs, index, query, budget):
+        order = list(range(len(entries)))
+        if query:
+            scores = index.scores(query)
+            order.sort(key=lambda i: -scores[i])
+        if budget is None:
+            chosen = {i: entries[i][1] for i in order}
+            used = {ref for _, _, uses in entries for ref in uses}
+            omitted = {}
+        else:
+            chosen, used, omitted = {}, set(), {}
+            # Braces, keys and separators of the envelope
+            remaining = budget - estimate_tokens('{"tools":[],"prompts":[],"resources":[],"defs":{}}')
+            for i in order:
+                kind, entry, uses = entries[i]
+                new_refs = [ref for ref in dict.fromkeys(uses) if ref not in used]
+                cost = estimate_tokens(_dumps(entry)) + 1 + sum(
+                    estimate_tokens(_dumps({ref: defs[ref]})) for ref in new_refs)
+                if cost <= remaining:
+                    chosen[i] = entry
+                    used.update(new_refs)
+                    remaining -= cost
+                    continue
+                name = entry if isinstance(entry, str) else entry.get("name") or entry.get("uri")
+                cost = estimate_tokens(_dumps(name)) + 1
+                if cost <= remaining:
+                    chosen[i] = name
+                    remaining -= cost
+                else:
+                    omitted[kind] = omitted.get(kind, 0) + 1
+        result = {kind: [] for kind in KINDS}
+        for i in order:
+            if i in chosen:
+                result[entries[i][0]].append(chosen[i])
+        if used:
+            result["defs"] = {ref: defs[ref] for ref in defs if ref in used}
+        if omitted:
+            result["omitted"] = omitted
+        return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+
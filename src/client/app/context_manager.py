@@ -1,9 +1,80 @@
 import yaml
 
+_MISSING = object()
+
+
+def compile_plan(structure, prefix=()):
+    """
+    Flatten a context structure into a projection plan.
+
+    Returns a list of (path, kind) steps in output order, where path is the tuple of
+    keys from the message root and kind is "value" (copy the value if present) or
+    "object" (descend into a nested dict, whose own steps follow).
+    """
+    plan = []
+    for item in structure or []:
+        if isinstance(item, dict):
+            for key, substructure in item.items():
+                plan.append((prefix + (key,), "object"))
+                plan.extend(compile_plan(substructure, prefix + (key,)))
+        elif isinstance(item, str):
+            plan.append((prefix + (item,), "value"))
+    return plan
+
+
+def _build_projection(plan):
+    """
+    Build the projection function for a plan: one dict lookup per field, with a
+    nested projection for each object field, so no structure is walked per message.
+    """
+    fields = []
+    index = 0
+    while index < len(plan):
+        path, kind = plan[index]
+        index += 1
+        if kind == "value":
+            fields.append((path[-1], None))
+            continue
+        # The steps nested under an object follow it and have longer paths
+        end = index
+        while end < len(plan) and len(plan[end][0]) > len(path):
+            end += 1
+        fields.append((path[-1], _build_projection(plan[index:end])))
+        index = end
+    fields = tuple(fields)
+
+    def project(context):
+        result = {}
+        get = context.get
+        for key, nested in fields:
+            value = get(key, _MISSING)
+            if nested is None:
+                if value is not _MISSING:
+                    result[key] = value
+            elif isinstance(value, dict):
+                result[key] = nested(value)
+        return result
+    return project
+
+
 class ContextManager:
+    """
+    Projects messages onto the fields listed in a context structure YAML file.
+
+    The structure is compiled once into a flat plan and a projection function
+    built from it, so formatting a message is a fixed sequence of dict lookups.
+    """
     def __init__(self, structure_path):
         with open(structure_path) as f:
             self.structure = yaml.safe_load(f)
+        self.compile()
+
+    def compile(self, structure=None):
+        """(Re)compile the projection for a structure, e.g. after editing self.structure"""
+        if structure is not None:
+            self.structure = structure
+        self.plan = compile_plan(self.structure)
+        self._project = _build_projection(self.plan)
 
     def _assemble(self, structure, context):
         result = {}
@@ -18,4 +89,9 @@ class ContextManager:
         return result
 
     def format_message(self, context):
-        return self._assemble(self.structure, context)
+        return self._project(context)
+
+    def format_messages(self, contexts):
+        """Format a batch of messages"""
+        project = self._project
+        return [project(context) for context in contexts]
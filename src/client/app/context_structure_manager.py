@@ -1,18 +1,80 @@
-import yaml
+import atexit
 import os
+import tempfile
+import threading
+import weakref
+
+import yaml
 
 GENERATED_START = '# --- GENERATED START ---'
 GENERATED_END = '# --- GENERATED END ---'
 UNCAT_HEADER = '### uncategorized--chronological ###'
 
+# Live managers, flushed by one exit hook so debounced fields are not lost when the
+# process exits before their timer fires
+_managers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for manager in list(_managers):
+        manager.flush()
+
 class ContextStructureManager:
-    def __init__(self, yaml_path):
+    """
+    Keeps the context structure YAML in memory and writes it back lazily.
+
+    add_field() only appends to the in-memory model; pending fields are written
+    `debounce` seconds after the first unsaved addition, or on flush()/close().
+    Writes go to a temporary file that is renamed over the original, so readers
+    never see a half-written file. If the file was edited externally since it was
+    last read (detected by mtime and size), it is re-read and the pending fields
+    are merged into the new content before writing.
+    """
+    def __init__(self, yaml_path, debounce=1.0):
+        """
+        Args:
+            yaml_path (str): Path to the context structure YAML file.
+            debounce (float): Seconds to wait before writing added fields (None: only on flush()).
+        """
         self.yaml_path = yaml_path
-        self.structure, self.uncategorized = self._parse_yaml()
+        self.debounce = debounce
+        self._lock = threading.RLock()
+        self._pending = []
+        self._timer = None
+        self.writes = 0
+        self._load()
+        _managers.add(self)
+
+    def _stat(self):
+        try:
+            st = os.stat(self.yaml_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
 
-    def _parse_yaml(self):
+    def _load(self):
         with open(self.yaml_path) as f:
             lines = f.readlines()
+        self._file_stat = self._stat()
+        self.structure, self.uncategorized = self._parse_lines(lines)
+        # Everything before the uncategorized section is written back verbatim
+        header_index = next((i for i, line in enumerate(lines) if UNCAT_HEADER in line), None)
+        self._had_header = header_index is not None
+        if header_index is None:
+            self._head = ''.join(lines)
+            self._uncat_comments = ''
+        else:
+            self._head = ''.join(lines[:header_index])
+            comments = []
+            for line in lines[header_index + 1:]:
+                if line.strip() and not line.strip().startswith('#'):
+                    break
+                comments.append(line)
+            self._uncat_comments = ''.join(comments)
+
+    @staticmethod
+    def _parse_lines(lines):
         in_generated = False
         in_uncat = False
         generated_lines = []
@@ -36,53 +98,91 @@ class ContextStructureManager:
         return structure, uncategorized
 
     def add_field(self, field):
-        # Add a new uncategorized field
-        if not self.uncategorized:
-            self.uncategorized = []
-        self.uncategorized.append(field)
-        # If the uncategorized header is missing, add it to the file
-        with open(self.yaml_path, 'r') as f:
-            content = f.read()
-        if UNCAT_HEADER not in content:
-            # Add the header and a newline at the end
-            with open(self.yaml_path, 'a') as f:
-                f.write(f'\n{UNCAT_HEADER}\n')
-        self._write_yaml()
+        # Add a new uncategorized field (written on the next flush)
+        with self._lock:
+            if not self.uncategorized:
+                self.uncategorized = []
+            self.uncategorized.append(field)
+            self._pending.append(field)
+            if self.debounce is not None and self._timer is None:
+                self._timer = threading.Timer(self.debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def add_fields(self, fields):
+        """Add several uncategorized fields at once"""
+        for field in fields:
+            self.add_field(field)
+
+    @property
+    def dirty(self):
+        return bool(self._pending)
+
+    def reload_if_changed(self):
+        """
+        Re-read the file if it was modified externally, keeping fields added but not yet written.
+        Returns True if the file was reloaded.
+        """
+        with self._lock:
+            if self._stat() == self._file_stat:
+                return False
+            pending = self._pending
+            self._load()
+            if not self.uncategorized:
+                self.uncategorized = []
+            for field in pending:
+                if field not in self.uncategorized:
+                    self.uncategorized.append(field)
+            return True
+
+    def flush(self):
+        """Write pending fields to disk now. Returns True if the file was written."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return False
+            self.reload_if_changed()
+            self._write_yaml()
+            self._pending = []
+            return True
+
+    def close(self):
+        """Flush pending fields and stop the debounce timer"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def _write_yaml(self):
-        with open(self.yaml_path, 'r') as f:
-            lines = f.readlines()
-        out_lines = []
-        in_uncat = False
-        wrote_uncat = False
-        for idx, line in enumerate(lines):
-            if UNCAT_HEADER in line:
-                out_lines.append(line)
-                in_uncat = True
-                # Write uncategorized fields (with proper indentation)
-                if self.uncategorized:
-                    dumped = yaml.dump(self.uncategorized, default_flow_style=False)
-                    # Indent if needed (YAML dump may not indent top-level list)
-                    for yaml_line in dumped.splitlines():
-                        out_lines.append(yaml_line + '\n')
-                wrote_uncat = True
-                # Skip any old uncategorized fields until next non-empty, non-comment line or EOF
-                j = idx + 1
-                while j < len(lines):
-                    if lines[j].strip() == '' or lines[j].strip().startswith('#'):
-                        out_lines.append(lines[j])
-                        j += 1
-                    else:
-                        break
-                # Continue from where we left off
-                continue
-            if in_uncat and wrote_uncat:
-                # After writing uncategorized, just copy the rest
-                in_uncat = False
-            if not in_uncat:
-                out_lines.append(line)
-        with open(self.yaml_path, 'w') as f:
-            f.writelines(out_lines)
+        head = self._head
+        if not self._had_header:
+            # Append the uncategorized section after a blank line
+            if head and not head.endswith('\n'):
+                head += '\n'
+            head += '\n'
+        content = f"{head}{UNCAT_HEADER}\n{self._uncat_comments}"
+        if self.uncategorized:
+            content += yaml.dump(self.uncategorized, default_flow_style=False)
+        directory = os.path.dirname(os.path.abspath(self.yaml_path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.context_structure.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+            if os.path.exists(self.yaml_path):
+                os.chmod(tmp_path, os.stat(self.yaml_path).st_mode & 0o777)
+            os.replace(tmp_path, self.yaml_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._file_stat = self._stat()
+        self._head, self._had_header = head, True
+        self.writes += 1
 
     def get_full_structure(self):
         # Return generated + uncategorized
@@ -94,4 +194,5 @@ if __name__ == '__main__':
     mgr = ContextStructureManager(path)
     print('Initial structure:', mgr.get_full_structure())
     mgr.add_field('new_field')
+    mgr.flush()
     print('After adding:', mgr.get_full_structure())
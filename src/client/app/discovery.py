@@ -1,15 +1,23 @@
 class DiscoveryClient:
     """
     Client for discovering tools, resources, and prompts via FastMCP.
+    Served from the client's CapabilityCache when one is provided.
     """
-    def __init__(self, fastmcp_client):
+    def __init__(self, fastmcp_client, cache=None):
         self._client = fastmcp_client
+        self._cache = cache
 
     async def list_tools(self):
+        if self._cache is not None:
+            return await self._cache.list("tools")
         return await self._client.list_tools()
 
     async def list_resources(self):
+        if self._cache is not None:
+            return await self._cache.list("resources")
         return await self._client.list_resources()
 
     async def list_prompts(self):
+        if self._cache is not None:
+            return await self._cache.list("prompts")
         return await self._client.list_prompts()
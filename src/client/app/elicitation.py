@@ -1,15 +1,189 @@
+import asyncio
+import inspect
+import itertools
+import json
+import time
+
+ACCEPT = "accept"
+DECLINE = "decline"
+CANCEL = "cancel"
+ACTIONS = (ACCEPT, DECLINE, CANCEL)
+
+
+class PendingElicitation:
+    """One elicitation waiting for an answer"""
+    def __init__(self, id, schema, prompt, timeout, future):
+        self.id = id
+        self.schema = schema
+        self.prompt = prompt
+        self.created = time.time()
+        self.deadline = self.created + timeout if timeout is not None else None
+        self.future = future
+        self._timer = None
+        self._task = None
+
+    def to_dict(self):
+        return {"id": self.id, "prompt": self.prompt, "schema": self.schema,
+                "created": self.created, "deadline": self.deadline}
+
+
+def _result(answer):
+    """Normalize a responder answer into {"action", "content"}"""
+    if isinstance(answer, dict) and answer.get("action") in ACTIONS:
+        return {"action": answer["action"], "content": answer.get("content")}
+    return {"action": ACCEPT, "content": answer}
+
+
+def defaults_responder(request):
+    """
+    Policy responder: accepts with the schema's default values, or declines when
+    a required field has no default.
+    """
+    schema = request.schema or {}
+    if schema.get("type") != "object":
+        if "default" in schema:
+            return schema["default"]
+        return {"action": DECLINE}
+    properties = schema.get("properties") or {}
+    content = {name: field["default"] for name, field in properties.items() if "default" in field}
+    if any(name not in content for name in schema.get("required") or []):
+        return {"action": DECLINE}
+    return content
+
+
+async def console_responder(request):
+    """Asks on the terminal without blocking the event loop (input() runs in a worker thread)"""
+    answer = await asyncio.get_running_loop().run_in_executor(None, input, f"{request.prompt or request.schema} ")
+    try:
+        parsed = json.loads(answer)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, dict):
+        return parsed
+    properties = (request.schema or {}).get("properties") or {}
+    if len(properties) == 1:
+        return {next(iter(properties)): answer}
+    return answer
+
+
 class ElicitationClient:
     """
     Client for handling elicitation (structured input requests) via FastMCP.
+
+    Requests are parked in a pending queue and answered asynchronously, so sessions keep
+    running while one waits on a person:
+
+    - ask()/submit(): Queue a request and await (or get a future for) its result.
+    - responder: Optional callable(request) -> answer (sync or async), e.g. a UI hook,
+      defaults_responder or console_responder. Returning None leaves the request pending
+      for respond().
+    - respond()/decline()/cancel(): Answer a pending request, e.g. from a UI.
+    - handle(): elicitation_handler for the FastMCP client, so server elicitations use the same queue.
+
+    Results are {"action": "accept" | "decline" | "cancel", "content": ...}. A request that
+    is not answered within its timeout resolves with action `timeout_action`.
     """
-    def __init__(self, fastmcp_client):
+    def __init__(self, fastmcp_client, responder=None, timeout=300.0, timeout_action=CANCEL):
+        """
+        Args:
+            fastmcp_client: Underlying FastMCP client
+            responder (callable): Answers requests as they are queued (None = wait for respond())
+            timeout (float): Default seconds before an unanswered request resolves (None = never)
+            timeout_action (str): Action reported for timed-out requests ("cancel" or "decline")
+        """
         self._client = fastmcp_client
+        self.responder = responder
+        self.timeout = timeout
+        self.timeout_action = timeout_action
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self.stats = {"requests": 0, "answered": 0, "timed_out": 0}
 
     def request(self, schema, prompt=None):
         """
         Request structured input from the user or client.
+
+        From a running event loop this does not block: it queues the request and returns
+        a future (await it, or use ask()).
         """
         # If FastMCP supports elicitation, use it; else, prompt
         if hasattr(self._client, "elicit"):
             return self._client.elicit(schema=schema, prompt=prompt)
-        return input(prompt or str(schema))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return input(prompt or str(schema))
+        return self.submit(schema, prompt=prompt)
+
+    def submit(self, schema, prompt=None, timeout=None):
+        """Queue a request and return an asyncio future for its result (call from the event loop)"""
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout if timeout is None else timeout
+        request = PendingElicitation(next(self._ids), schema, prompt, timeout, loop.create_future())
+        self._pending[request.id] = request
+        self.stats["requests"] += 1
+        request.future.add_done_callback(lambda _: self._finished(request))
+        if timeout is not None:
+            request._timer = loop.call_later(timeout, self._expire, request.id)
+        if self.responder is not None:
+            request._task = asyncio.ensure_future(self._respond_with(self.responder, request))
+        return request.future
+
+    async def ask(self, schema, prompt=None, timeout=None):
+        """Queue a request and wait for its result"""
+        return await self.submit(schema, prompt=prompt, timeout=timeout)
+
+    async def _respond_with(self, responder, request):
+        try:
+            answer = responder(request)
+            if inspect.isawaitable(answer):
+                answer = await answer
+        except Exception as e:
+            if not request.future.done():
+                request.future.set_exception(e)
+            return
+        if answer is not None:
+            self.stats["answered"] += self._resolve(request.id, _result(answer))
+
+    def _finished(self, request):
+        self._pending.pop(request.id, None)
+        if request._timer is not None:
+            request._timer.cancel()
+        if request._task is not None and not request._task.done():
+            # Answered elsewhere or timed out: stop waiting on the responder
+            request._task.cancel()
+
+    def _expire(self, request_id):
+        if self._resolve(request_id, {"action": self.timeout_action, "content": None}):
+            self.stats["timed_out"] += 1
+
+    def _resolve(self, request_id, result):
+        request = self._pending.get(request_id)
+        if request is None or request.future.done():
+            return False
+        request.future.set_result(result)
+        return True
+
+    def pending(self):
+        """Requests still waiting for an answer, oldest first"""
+        return [request.to_dict() for request in self._pending.values()]
+
+    def respond(self, request_id, content=None, action=ACCEPT):
+        """Answer a pending request. Returns False if it is no longer pending."""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action}. Expected one of {', '.join(ACTIONS)}")
+        answered = self._resolve(request_id, {"action": action, "content": content})
+        self.stats["answered"] += answered
+        return answered
+
+    def decline(self, request_id):
+        return self.respond(request_id, action=DECLINE)
+
+    def cancel(self, request_id):
+        return self.respond(request_id, action=CANCEL)
+
+    async def handle(self, message, response_type, params, context):
+        """FastMCP elicitation_handler: routes server elicitations through the pending queue"""
+        from fastmcp.client.elicitation import ElicitResult
+        result = await self.ask(getattr(params, "requestedSchema", None), prompt=message)
+        return ElicitResult(action=result["action"], content=result["content"])
@@ -1,5 +1,13 @@
 import asyncio
+import contextlib
 import json
+import re
+
+from client.app.capability_encoder import CapabilityEncoder
+
+# "${step_id}" or "${step_id.field.0}" inside batch step args is replaced by that step's output;
+# "$${" is an escaped, literal "${" and names that are not step ids are left as they are
+_REFERENCE = re.compile(r"\$\$\{|\$\{([^}.]+)((?:\.[^}.]+)*)\}")
 
 def format_for_llm(data):
     """
@@ -7,6 +15,104 @@ def format_for_llm(data):
     """
     return json.dumps(data, separators=(",", ":"))
 
+
+def _step_id(message, index):
+    return str(message.get("id", index)) if isinstance(message, dict) else str(index)
+
+
+def _references(value):
+    """Names referenced as ${name} anywhere in a step's args"""
+    if isinstance(value, str):
+        return {match.group(1) for match in _REFERENCE.finditer(value) if match.group(1) is not None}
+    if isinstance(value, dict):
+        return set().union(*(_references(v) for v in value.values())) if value else set()
+    if isinstance(value, (list, tuple)):
+        return set().union(*(_references(v) for v in value)) if value else set()
+    return set()
+
+
+def _lookup(results, step_id, path):
+    value = results[step_id]
+    for key in filter(None, path.split(".")):
+        if isinstance(value, (list, tuple)):
+            value = value[int(key)]
+        elif isinstance(value, dict):
+            value = value[key]
+        else:
+            value = getattr(value, key)
+    return value
+
+
+def _substitute(match, results):
+    if match.group(1) is None:
+        return "${"
+    if match.group(1) not in results:
+        return match.group(0)
+    return str(_lookup(results, match.group(1), match.group(2)))
+
+
+def _resolve(value, results):
+    """Substitute step outputs for ${...} references to steps in `results`"""
+    if isinstance(value, str):
+        match = _REFERENCE.fullmatch(value)
+        if match and match.group(1) in results:
+            # A bare reference keeps the output's type
+            return _lookup(results, match.group(1), match.group(2))
+        return _REFERENCE.sub(lambda m: _substitute(m, results), value)
+    if isinstance(value, dict):
+        return {k: _resolve(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve(v, results) for v in value]
+    return value
+
+
+def plan_batch(messages):
+    """
+    Build the dependency graph of a batch.
+
+    Steps are identified by their "id" (default: their position). A step depends on
+    every step its args reference as "${id}" / "${id.field}" and on any ids listed
+    in "depends_on". "${name}" where name is not a step id stays literal text, and
+    "$${" is written for a literal "${".
+
+    Returns:
+        list: (step_id, message, set of dependency ids) in input order
+    Raises:
+        ValueError: On duplicate ids, unknown "depends_on" ids or dependency cycles
+    """
+    parsed, ids = [], set()
+    for index, message in enumerate(messages):
+        if isinstance(message, str):
+            message = json.loads(message)
+        step_id = _step_id(message, index)
+        if step_id in ids:
+            raise ValueError(f"Duplicate step id: {step_id}")
+        ids.add(step_id)
+        parsed.append((step_id, message))
+
+    steps = []
+    for step_id, message in parsed:
+        depends_on = {str(d) for d in message.get("depends_on", [])}
+        unknown = depends_on - ids
+        if unknown:
+            raise ValueError(f"Step {step_id} depends on unknown step(s): {', '.join(sorted(unknown))}")
+        steps.append((step_id, message, (_references(message.get("args", {})) & ids) | depends_on))
+
+    # Kahn's algorithm: anything left over is part of a cycle
+    remaining = {step_id: set(deps) for step_id, _, deps in steps}
+    ready = [step_id for step_id, deps in remaining.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del remaining[done]
+        for step_id, deps in remaining.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(step_id)
+    if remaining:
+        raise ValueError(f"Dependency cycle between steps: {', '.join(sorted(remaining))}")
+    return steps
+
 class LLMRouter:
     """
     SDK/API-style stub for LLMRouter. Users can extend or override methods for custom routing.
@@ -14,8 +120,14 @@ class LLMRouter:
     - Provide a unified interface for LLM-based workflows (e.g., tool selection, prompt chaining, response parsing).
     - Integrate with MCPClient and other client.app modules for seamless orchestration.
     """
-    def __init__(self, client):
+    def __init__(self, client, capability_budget=None):
+        """
+        Args:
+            client: MCPClient (or any object with tools/prompts/resources/discovery sections)
+            capability_budget (int): Default token budget for get_llm_capabilities (None = unlimited)
+        """
         self.client = client
+        self.encoder = CapabilityEncoder(budget=capability_budget)
 
     async def route(self, message):
         """
@@ -35,40 +147,132 @@ class LLMRouter:
             return await self.client.resources.get(message["resource"])
         raise ValueError("Unknown message type")
 
-    async def route_batch(self, messages, parallel=False):
+    async def _route_step(self, message, results):
+        message = {key: value for key, value in message.items() if key not in ("id", "depends_on")}
+        if "args" in message:
+            message["args"] = _resolve(message["args"], results)
+        return await self.route(message)
+
+    async def route_batch(self, messages, parallel=False, concurrency=8):
         """
         Accepts a list of messages and executes them sequentially (default) or in parallel.
         Useful for chaining tool calls, aggregating results, or feeding outputs into system prompts.
+
+        Steps can reference earlier outputs in their args as "${id}" or "${id.field}"
+        (ids default to the step's position; "$${" is a literal "${"); see plan_batch.
         Args:
             messages (list): List of message dicts.
-            parallel (bool): If True, execute in parallel (experimental/advanced).
+            parallel (bool): If True, run independent steps concurrently (see stream_batch).
+            concurrency (int): Maximum number of steps running at once in parallel mode.
         Returns:
-            list: Results from each message.
+            list: Results from each message, in input order.
         """
         if not messages:
             return []
+        steps = plan_batch(messages)
+        results = {}
         if parallel:
-            # Experimental: naive parallel execution (no concurrency control)
-            return await asyncio.gather(*(self.route(msg) for msg in messages))
-        else:
-            # Sequential execution (default, safest for most models)
-            results = []
-            for msg in messages:
-                results.append(await self.route(msg))
-            return results
+            # aclosing: on an error the stream's finally cancels the running steps right away
+            async with contextlib.aclosing(self.stream_batch(messages, concurrency=concurrency)) as outcomes:
+                async for outcome in outcomes:
+                    if outcome["status"] == "error":
+                        raise outcome["error"]
+                    results[outcome["id"]] = outcome["result"]
+            return [results[step_id] for step_id, _, _ in steps]
+        # Sequential execution (default, safest for most models)
+        for step_id, message, deps in steps:
+            if deps - results.keys():
+                raise ValueError(f"Step {step_id} references a later step; use parallel=True to reorder")
+            results[step_id] = await self._route_step(message, results)
+        return [results[step_id] for step_id, _, _ in steps]
+
+    async def stream_batch(self, messages, concurrency=8):
+        """
+        Execute a batch as a dependency graph and yield outcomes as steps complete.
 
-    async def get_llm_capabilities(self):
+        Independent steps run concurrently (at most `concurrency` at a time); a step
+        starts as soon as the steps it references have finished, so the batch takes
+        roughly its critical-path time. When a step fails, every step depending on
+        it (directly or transitively) is cancelled.
+
+        Yields:
+            dict: {"id", "index", "status": "ok" | "error" | "cancelled", "result" | "error"}
+        """
+        steps = plan_batch(messages)
+        index = {step_id: i for i, (step_id, _, _) in enumerate(steps)}
+        waiting = {step_id: set(deps) for step_id, _, deps in steps}
+        dependents = {step_id: [] for step_id, _, _ in steps}
+        for step_id, _, deps in steps:
+            for dep in deps:
+                dependents[dep].append(step_id)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        results = {}
+        running = {}
+
+        async def run(step_id, message):
+            async with semaphore:
+                return await self._route_step(message, results)
+
+        def start_ready():
+            for step_id, message, _ in steps:
+                if step_id in waiting and not waiting[step_id]:
+                    del waiting[step_id]
+                    running[asyncio.ensure_future(run(step_id, message))] = step_id
+
+        def cancel_dependents(failed):
+            cancelled, stack = [], list(dependents[failed])
+            while stack:
+                step_id = stack.pop()
+                if waiting.pop(step_id, None) is not None:
+                    cancelled.append(step_id)
+                    stack.extend(dependents[step_id])
+            return sorted(cancelled, key=index.get)
+
+        start_ready()
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: index[running[t]]):
+                    step_id = running.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        results[step_id] = task.result()
+                        yield {"id": step_id, "index": index[step_id], "status": "ok", "result": results[step_id]}
+                        for dependent in dependents[step_id]:
+                            if dependent in waiting:
+                                waiting[dependent].discard(step_id)
+                    else:
+                        yield {"id": step_id, "index": index[step_id], "status": "error", "error": error}
+                        for cancelled in cancel_dependents(step_id):
+                            yield {"id": cancelled, "index": index[cancelled], "status": "cancelled",
+                                   "error": f"dependency {step_id} failed"}
+                start_ready()
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def get_llm_capabilities(self, query=None, budget=None):
         """
         Returns a compact JSON string of available tools, prompts, and resources for LLM planning.
+
+        Args:
+            query (str): Current task; capabilities are ranked by lexical relevance to it
+            budget (int): Approximate token budget; the least relevant capabilities are
+                reduced to their names, then left out (counted under "omitted")
         """
-        tools = await self.client.discovery.list_tools()
-        prompts = await self.client.discovery.list_prompts()
-        resources = await self.client.discovery.list_resources()
-        caps = {
-            "tools": tools,
-            "prompts": prompts,
-            "resources": resources,
-        }
-        return format_for_llm(caps)
+        cache = getattr(self.client, "capabilities", None)
+        if cache is not None:
+            # One concurrent fetch at most, and none while the cache is fresh
+            caps = await cache.get()
+            version = caps["version"]
+        else:
+            tools, prompts, resources = await asyncio.gather(
+                self.client.discovery.list_tools(),
+                self.client.discovery.list_prompts(),
+                self.client.discovery.list_resources(),
+            )
+            caps = {"tools": tools, "prompts": prompts, "resources": resources}
+            version = None
+        return self.encoder.encode(caps, query=query, budget=budget, version=version)
 
     # (Removed duplicate route method for JSON string; unified above)
@@ -1,15 +1,330 @@
+import asyncio
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+class LogShipper:
+    """
+    Buffered, batched log delivery off the caller's path.
+
+    - submit(): Appends to a bounded in-memory ring (the oldest record is dropped when full); never blocks on I/O.
+    - A background task ships batches of up to `batch_size` records, or whatever is buffered every `interval` seconds.
+    - sample_rates: Fraction of records kept per level, e.g. {"debug": 0.1}; sampling is deterministic (every Nth).
+    - spill_path: While the sink fails, batches are appended to this JSONL file and replayed, oldest first, once it recovers.
+      Replay progress is kept as a byte offset in `<spill_path>.offset`, so nothing is rewritten while the sink is down.
+
+    The sink is called with a list of records ({"timestamp", "level", "message", ...}); it may be sync
+    (run in a worker thread) or async. start() uses the running event loop, or a background thread
+    with its own loop when called from sync code (the sink must then not be tied to another loop);
+    stop that one with close_sync(). Records submitted after close are spilled, or dropped without a spill_path.
+    """
+    def __init__(self, sink, capacity=10000, batch_size=100, interval=1.0, sample_rates=None, spill_path=None):
+        self.sink = sink
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.interval = interval
+        self.sample_rates = dict(sample_rates or {})
+        self.spill_path = spill_path
+        self._ring = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._credit = {}
+        self._loop = None
+        self._thread = None
+        self._task = None
+        self._wake = None
+        self._signalled = False
+        self._closing = False
+        self._closed = False
+        self._drain_lock = None
+        self.counts = {"submitted": 0, "shipped": 0, "batches": 0, "dropped": 0, "sampled_out": 0,
+                       "spilled": 0, "failures": 0}
+
+    def _keep(self, level):
+        rate = self.sample_rates.get(level, 1.0)
+        if rate >= 1.0:
+            return True
+        credit = self._credit.get(level, 0.0) + rate
+        keep = credit >= 1.0
+        self._credit[level] = credit - 1.0 if keep else credit
+        return keep
+
+    def submit(self, message, level="info", **fields):
+        """Queue a record for shipping. Returns False if it was sampled out."""
+        with self._lock:
+            self.counts["submitted"] += 1
+            if not self._keep(level):
+                self.counts["sampled_out"] += 1
+                return False
+            record = {"timestamp": time.time(), "level": level, "message": message, **fields}
+            if self._closed:
+                # Nothing ships any more; keep it on disk for the next run if we can
+                self._spill([record])
+                return False
+            if len(self._ring) == self.capacity:
+                self.counts["dropped"] += 1
+            self._ring.append(record)
+            wake = len(self._ring) >= self.batch_size and not self._signalled
+            if wake:
+                self._signalled = True
+        if wake and self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                # The shipper's loop closed meanwhile; close() drains or spills what is left
+                pass
+        return True
+
+    def _take(self, count):
+        with self._lock:
+            batch = [self._ring.popleft() for _ in range(min(count, len(self._ring)))]
+            self._signalled = False
+            return batch
+
+    def start(self):
+        """Start the background shipping task"""
+        if self._task is not None:
+            return self
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=loop.run_forever, name="log-shipper", daemon=True)
+            self._thread.start()
+        self._loop = loop
+        if self._thread is None:
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        else:
+            asyncio.run_coroutine_threadsafe(self._start_in_loop(), loop).result()
+        return self
+
+    async def _start_in_loop(self):
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self._drain()
+
+    async def _deliver(self, batch):
+        if inspect.iscoroutinefunction(self.sink):
+            await self.sink(batch)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(None, self.sink, batch)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _send(self, batch):
+        try:
+            await self._deliver(batch)
+        except Exception:
+            self.counts["failures"] += 1
+            return False
+        self.counts["shipped"] += len(batch)
+        self.counts["batches"] += 1
+        return True
+
+    def _spill(self, batch):
+        if not self.spill_path:
+            self.counts["dropped"] += len(batch)
+            return
+        with open(self.spill_path, "a") as f:
+            f.write("".join(json.dumps(record, default=str) + "\n" for record in batch))
+        self.counts["spilled"] += len(batch)
+
+    def _spilled(self):
+        return bool(self.spill_path) and os.path.exists(self.spill_path) and \
+            os.path.getsize(self.spill_path) > self._replayed()
+
+    def _replayed(self):
+        """Bytes of the spill file already shipped"""
+        try:
+            with open(f"{self.spill_path}.offset") as f:
+                return int(f.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    async def _replay(self):
+        """Ship spilled records, oldest first. Returns False if the sink is still failing."""
+        offset_path = f"{self.spill_path}.offset"
+        with open(self.spill_path, "rb") as f:
+            f.seek(self._replayed())
+            while True:
+                batch = []
+                while len(batch) < self.batch_size:
+                    line = f.readline()
+                    if not line:
+                        break
+                    if line.strip():
+                        batch.append(json.loads(line))
+                if not batch:
+                    break
+                if not await self._send(batch):
+                    # The rest is replayed from the saved offset once the sink recovers
+                    return False
+                with open(offset_path, "w") as offset:
+                    offset.write(str(f.tell()))
+        # Offset first: a crash in between replays records again rather than skipping new ones
+        if os.path.exists(offset_path):
+            os.remove(offset_path)
+        os.remove(self.spill_path)
+        return True
+
+    async def _drain(self):
+        if self._drain_lock is None:
+            self._drain_lock = asyncio.Lock()
+        async with self._drain_lock:
+            await self._drain_locked()
+
+    async def _drain_locked(self):
+        if self._spilled() and not await self._replay():
+            # Still unreachable: move the buffer to disk behind the older records
+            while batch := self._take(self.batch_size):
+                self._spill(batch)
+            return
+        while batch := self._take(self.batch_size):
+            if not await self._send(batch):
+                self._spill(batch)
+                while batch := self._take(self.batch_size):
+                    self._spill(batch)
+                return
+
+    async def flush(self):
+        """Ship everything buffered now (from the shipper's loop or any other)"""
+        if self._thread is not None and asyncio.get_running_loop() is not self._loop:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._drain(), self._loop))
+        else:
+            await self._drain()
+
+    async def close(self):
+        """Stop the background task after a final flush"""
+        self._closing = True
+        if self._task is not None:
+            if self._thread is not None:
+                self._loop.call_soon_threadsafe(self._wake.set)
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._stop(), self._loop))
+                self._stop_thread()
+            else:
+                await self._stop()
+            self._task = None
+        else:
+            await self._drain()
+        self._finish_close()
+
+    def close_sync(self):
+        """close() for sync code, e.g. a shipper started without an event loop"""
+        if self._task is not None and self._thread is None:
+            raise RuntimeError("This shipper runs on an event loop; await close() instead")
+        self._closing = True
+        if self._task is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+            asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+            self._stop_thread()
+            self._task = None
+        else:
+            asyncio.run(self._drain())
+        self._finish_close()
+
+    def _stop_thread(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def _finish_close(self):
+        with self._lock:
+            self._closed = True
+            leftover = [self._ring.popleft() for _ in range(len(self._ring))]
+        # Records that raced with the final flush
+        if leftover:
+            self._spill(leftover)
+
+    async def _stop(self):
+        self._wake.set()
+        await self._task
+        await self._drain()
+
+    def stats(self):
+        with self._lock:
+            return {**self.counts, "queued": len(self._ring), "spill_pending": self._spilled()}
+
+
 class LoggingClient:
     """
     Client for logging events via FastMCP or locally.
+
+    With buffering enabled (enable_buffering()), log() only appends to an in-memory ring and
+    returns; records are shipped in batches by a LogShipper in the background.
     """
     def __init__(self, fastmcp_client):
         self._client = fastmcp_client
+        self.shipper = None
 
     def log(self, message, level="info"):
         """
         Log a message to the server or locally.
         """
+        if self.shipper is not None:
+            self.shipper.submit(message, level=level)
+            return None
         # If FastMCP supports logging, use it; else, print
         if hasattr(self._client, "log"):
             return self._client.log(message=message, level=level)
         print(f"[{level.upper()}] {message}")
+
+    async def _ship(self, batch):
+        """
+        Default sink: one call for the whole batch when the client supports it.
+        Synchronous client calls and stdout writes run in a worker thread, never on the event loop.
+        """
+        log_batch = getattr(self._client, "log_batch", None)
+        log = getattr(self._client, "log", None)
+        if log_batch is not None and inspect.iscoroutinefunction(log_batch):
+            await log_batch(batch)
+            return
+        if log_batch is None and log is not None and inspect.iscoroutinefunction(log):
+            for record in batch:
+                await log(message=record["message"], level=record["level"])
+            return
+        for result in await asyncio.get_running_loop().run_in_executor(None, self._write, batch):
+            await result
+
+    def _write(self, batch):
+        """Blocking part of _ship; returns whatever the client handed back to await"""
+        if hasattr(self._client, "log_batch"):
+            results = [self._client.log_batch(batch)]
+        elif hasattr(self._client, "log"):
+            results = [self._client.log(message=record["message"], level=record["level"]) for record in batch]
+        else:
+            sys.stdout.write("".join(f"[{record['level'].upper()}] {record['message']}\n" for record in batch))
+            sys.stdout.flush()
+            results = []
+        return [result for result in results if inspect.isawaitable(result)]
+
+    def enable_buffering(self, sink=None, **options):
+        """
+        Ship log() records in the background through a LogShipper (see LogShipper for options).
+        Returns the started shipper.
+        """
+        self.shipper = LogShipper(sink or self._ship, **options).start()
+        return self.shipper
+
+    async def close(self):
+        """Flush and stop buffered shipping"""
+        if self.shipper is not None:
+            shipper, self.shipper = self.shipper, None
+            await shipper.close()
+
+    def close_sync(self):
+        """Flush and stop buffered shipping from sync code"""
+        if self.shipper is not None:
+            shipper, self.shipper = self.shipper, None
+            shipper.close_sync()
@@ -0,0 +1,224 @@
+import atexit
+import contextvars
+import functools
+import json
+import threading
+import time
+import weakref
+from collections import deque
+
+# Requests kept per histogram for percentiles
+WINDOW = 1024
+
+# Client methods timed by InstrumentedClient
+OPERATIONS = ("call_tool", "read_resource", "get_prompt", "list_tools", "list_resources", "list_prompts",
+              "list_resource_templates")
+
+PHASES = ("queue_wait", "round_trip", "decode", "total")
+
+# The request being timed in the current task, stamped by the transport hooks
+_current = contextvars.ContextVar("mcp_request", default=None)
+
+# Open exporters, closed at interpreter exit (weak, so discarded exporters are not kept alive)
+_exporters = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all():
+    for exporter in list(_exporters):
+        exporter.close()
+
+
+class Histogram:
+    """Rolling latency histogram over the last `window` samples (seconds in, milliseconds out)"""
+    def __init__(self, window=WINDOW):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self._samples.append(value)
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def summary(self):
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {"count": 0}
+
+        def ms(value):
+            return round(value * 1000, 3)
+
+        def pct(q):
+            return ms(ordered[min(len(ordered) - 1, int(q * len(ordered)))])
+
+        return {"count": self.count, "mean_ms": ms(self.sum / self.count), "p50_ms": pct(0.5),
+                "p95_ms": pct(0.95), "p99_ms": pct(0.99), "max_ms": ms(self.max)}
+
+
+class _Series:
+    def __init__(self, window):
+        self.requests = 0
+        self.errors = 0
+        self.phases = {phase: Histogram(window) for phase in PHASES}
+
+    def add(self, record):
+        self.requests += 1
+        self.errors += not record["ok"]
+        for phase in PHASES:
+            self.phases[phase].add(record[phase])
+
+    def summary(self):
+        return {"requests": self.requests, "errors": self.errors,
+                **{phase: self.phases[phase].summary() for phase in PHASES}}
+
+
+class ClientMetrics:
+    """
+    Per-request timings, split into queue wait (time in client-side layers before the request
+    was sent), round trip (transport + server) and decode (parsing the response), with rolling
+    histograms per operation and per server.
+
+    - record(): Called by InstrumentedClient once per request.
+    - add_hook(fn): fn(record) is called for every request, e.g. a JsonlExporter.
+    - snapshot(): Current histograms, as returned by MCPClient.metrics().
+    """
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._operations = {}
+        self._servers = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+
+    def record(self, record):
+        with self._lock:
+            for table, key in ((self._operations, record["operation"]), (self._servers, record["server"])):
+                series = table.get(key)
+                if series is None:
+                    series = table[key] = _Series(self.window)
+                series.add(record)
+        for hook in self._hooks:
+            hook(record)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "operations": {name: series.summary() for name, series in self._operations.items()},
+                "servers": {name: series.summary() for name, series in self._servers.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+            self._servers.clear()
+
+
+class JsonlExporter:
+    """Metrics hook that appends one JSON line per request to a file"""
+    def __init__(self, path, flush_every=100):
+        self.path = path
+        self.flush_every = flush_every
+        self._file = open(path, "a")
+        self._unflushed = 0
+        self._lock = threading.Lock()
+        _exporters.add(self)
+
+    def __call__(self, record):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._file.flush()
+                self._unflushed = 0
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def instrument_transport(client, server):
+    """
+    Wrap the raw *_mcp methods of a FastMCP client instance so requests timed by an
+    InstrumentedClient learn when they were sent and answered, and by which server.
+    Clients without raw methods are left alone (their decode time is reported as 0).
+    """
+    for operation in OPERATIONS:
+        raw = getattr(client, f"{operation}_mcp", None)
+        if raw is None or getattr(raw, "_instrumented", False):
+            continue
+
+        def wrap(raw, operation):
+            @functools.wraps(raw)
+            async def timed(*args, **kwargs):
+                request = _current.get()
+                if request is None or request["operation"] != operation:
+                    return await raw(*args, **kwargs)
+                request["sent"] = time.perf_counter()
+                request["server"] = server
+                try:
+                    return await raw(*args, **kwargs)
+                finally:
+                    request["received"] = time.perf_counter()
+            timed._instrumented = True
+            return timed
+
+        setattr(client, f"{operation}_mcp", wrap(raw, operation))
+    return client
+
+
+class InstrumentedClient:
+    """
+    Middleware around a FastMCP client (or ServerPool) that times every request into ClientMetrics.
+    Everything else is passed through to the wrapped client.
+    """
+    def __init__(self, client, metrics, server="default"):
+        self._wrapped = client
+        self._metrics = metrics
+        self._server = server
+
+    def __getattr__(self, name):
+        attr = getattr(self._wrapped, name)
+        if name not in OPERATIONS:
+            return attr
+        return functools.partial(self._timed, name, attr)
+
+    async def _timed(self, operation, method, *args, **kwargs):
+        request = {"operation": operation, "sent": None, "received": None, "server": None}
+        token = _current.set(request)
+        start = time.perf_counter()
+        ok = True
+        try:
+            return await method(*args, **kwargs)
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            end = time.perf_counter()
+            _current.reset(token)
+            sent = request["sent"] if request["sent"] is not None else start
+            received = request["received"] if request["received"] is not None else end
+            self._metrics.record({
+                "timestamp": time.time(),
+                "operation": operation,
+                "target": str(args[0]) if args else None,
+                "server": request["server"] or self._server,
+                "ok": ok,
+                "queue_wait": sent - start,
+                "round_trip": received - sent,
+                "decode": end - received,
+                "total": end - start,
+            })
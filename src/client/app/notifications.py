@@ -1,29 +1,111 @@
-import heapq
+from collections import deque
+from itertools import islice
+
+
 class NotificationsClient:
     """
     Client for managing notifications with priority queues.
+
+    Notifications are kept in one FIFO per priority level, so adding, popping and
+    clearing a level are O(1) and reading the next notifications never sorts the
+    queue. Capacities are optional: `capacity` bounds each level (its oldest
+    entries are evicted) and `max_size` bounds the whole queue (the oldest entries
+    of the lowest non-empty priority are evicted first).
     """
     PRIORITY_MAP = {"low": 3, "medium": 2, "high": 1, "critical": 0}
 
-    def __init__(self, fastmcp_client):
+    def __init__(self, fastmcp_client, max_size=None, capacity=None):
+        """
+        Args:
+            fastmcp_client: The underlying fastmcp client
+            max_size: Maximum number of queued notifications across all priorities
+            capacity: Maximum per priority, e.g. {"low": 1000, "critical": None}
+        """
         self._client = fastmcp_client
-        self._queue = []  # (priority, count, message)
-        self._counter = 0
+        self._levels = [deque() for _ in range(max(self.PRIORITY_MAP.values()) + 1)]
+        self._size = 0
+        self.max_size = max_size
+        self._capacity = [None] * len(self._levels)
+        for priority, limit in (capacity or {}).items():
+            self._capacity[self._priority(priority)] = limit
+        self._names = {value: name for name, value in self.PRIORITY_MAP.items()}
+        self.dropped = {priority: 0 for priority in self.PRIORITY_MAP}
+
+    def _priority(self, priority):
+        return self.PRIORITY_MAP.get(priority, 3)
+
+    def _evict(self, prio):
+        self._levels[prio].popleft()
+        self._size -= 1
+        self.dropped[self._names[prio]] += 1
 
     def add_notification(self, message, priority="low"):
-        prio = self.PRIORITY_MAP.get(priority, 3)
-        heapq.heappush(self._queue, (prio, self._counter, message))
-        self._counter += 1
+        prio = self._priority(priority)
+        level = self._levels[prio]
+        limit = self._capacity[prio]
+        if limit is not None and len(level) >= limit:
+            if limit <= 0:
+                self.dropped[self._names[prio]] += 1
+                return
+            self._evict(prio)
+        elif self.max_size is not None and self._size >= self.max_size:
+            lowest = next((p for p in range(len(self._levels) - 1, -1, -1) if self._levels[p]), None)
+            if lowest is None or lowest < prio:
+                # Nothing to evict (max_size <= 0) or everything queued outranks the new
+                # notification: drop it instead
+                self.dropped[self._names[prio]] += 1
+                return
+            self._evict(lowest)
+        level.append(message)
+        self._size += 1
+
+    def __len__(self):
+        return self._size
+
+    def peek(self):
+        """Highest-priority (oldest first) notification without removing it, or None"""
+        for level in self._levels:
+            if level:
+                return level[0]
+        return None
+
+    def pop(self):
+        """Remove and return the highest-priority notification, or None if the queue is empty"""
+        for level in self._levels:
+            if level:
+                self._size -= 1
+                return level.popleft()
+        return None
+
+    def drain(self, max_count=None):
+        """Remove and return up to max_count notifications in priority order (all if None)"""
+        drained = []
+        for level in self._levels:
+            while level and (max_count is None or len(drained) < max_count):
+                drained.append(level.popleft())
+            if max_count is not None and len(drained) >= max_count:
+                break
+        self._size -= len(drained)
+        return drained
 
     def get_notifications(self, max_count=None):
-        notifications = sorted(self._queue)
-        if max_count:
-            notifications = notifications[:max_count]
-        return [msg for _, _, msg in notifications]
+        """Queued notifications in priority order without removing them"""
+        notifications = []
+        for level in self._levels:
+            if max_count:
+                notifications.extend(islice(level, max_count - len(notifications)))
+                if len(notifications) >= max_count:
+                    break
+            else:
+                notifications.extend(level)
+        return notifications
 
     def clear_notifications(self, priority=None):
         if priority is None:
-            self._queue = []
+            for level in self._levels:
+                level.clear()
+            self._size = 0
         else:
-            prio = self.PRIORITY_MAP.get(priority, 3)
-            self._queue = [n for n in self._queue if n[0] != prio]
+            level = self._levels[self._priority(priority)]
+            self._size -= len(level)
+            level.clear()
@@ -0,0 +1,264 @@
+import asyncio
+import itertools
+import time
+
+LEAST_IN_FLIGHT = "least_in_flight"
+LATENCY = "latency"
+STRATEGIES = (LEAST_IN_FLIGHT, LATENCY)
+
+# Config keys used by the pool itself and stripped before the entry is handed to FastMCP
+POOL_KEYS = ("group", "replicas")
+
+
+def _item_name(item):
+    return getattr(item, "name", item)
+
+
+def _item_uri(item):
+    return str(getattr(item, "uri", item))
+
+
+class _Member:
+    """One persistent session to one server (or one replica of it)"""
+    def __init__(self, name, server, group, config):
+        self.name = name
+        self.server = server
+        self.group = group
+        self.config = config
+        self.client = None
+        self.healthy = False
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.latency = None  # exponentially weighted moving average, seconds
+        self.reconnect_task = None
+
+    def record(self, elapsed):
+        self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+
+
+class ServerPool:
+    """
+    Persistent sessions to every server in an mcpServers config, with routing.
+
+    - Tool calls are routed by tool name to the server group that provides the tool;
+      resource reads and prompt gets are routed the same way by URI and prompt name.
+    - Servers sharing a "group" key, or an entry with "replicas": N, are replicas;
+      calls are spread across healthy replicas by least in-flight requests or by latency.
+    - A session that fails is evicted and reconnected in the background with backoff.
+
+    The pool exposes call_tool/list_tools/read_resource/list_resources/get_prompt/list_prompts,
+    so it can stand in for a single FastMCP client (see MCPClient.connect_servers).
+
+    Example:
+        async with ServerPool(config, client_factory=FastMCPClient) as pool:
+            result = await pool.call_tool("echo", {"message": "hi"})
+    """
+    def __init__(self, config, client_factory, strategy=LEAST_IN_FLIGHT, reconnect_delay=0.5,
+                 max_reconnect_delay=30.0):
+        """
+        Args:
+            config (dict): Config with an "mcpServers" map
+            client_factory (callable): Builds a client from a single-server {"mcpServers": {...}} config
+            strategy (str): "least_in_flight" or "latency"
+            reconnect_delay (float): First delay before reconnecting a failed session (doubles up to max)
+            max_reconnect_delay (float): Upper bound for the reconnect delay
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}. Expected one of {', '.join(STRATEGIES)}")
+        self.strategy = strategy
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._factory = client_factory
+        self._members = []
+        for name, entry in config.get("mcpServers", {}).items():
+            server_config = {key: value for key, value in entry.items() if key not in POOL_KEYS}
+            group = entry.get("group", name)
+            replicas = int(entry.get("replicas", 1))
+            for replica in range(replicas):
+                member_name = name if replicas == 1 else f"{name}#{replica}"
+                self._members.append(_Member(member_name, name, group, server_config))
+        if not self._members:
+            raise ValueError("Config contains no servers")
+        self._routes = {"tools": {}, "resources": {}, "prompts": {}}
+        self._round_robin = itertools.count()
+        self._closed = False
+
+    @property
+    def groups(self):
+        return sorted({member.group for member in self._members})
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def start(self):
+        """Connect to every server concurrently and build the routing tables"""
+        await asyncio.gather(*(self._connect(member) for member in self._members), return_exceptions=True)
+        for member in self._members:
+            if not member.healthy:
+                self._schedule_reconnect(member)
+        await self.refresh_routes()
+
+    async def _connect(self, member):
+        client = self._factory({"mcpServers": {member.server: member.config}})
+        await client.__aenter__()
+        member.client = client
+        member.healthy = True
+
+    async def _disconnect(self, member):
+        client, member.client = member.client, None
+        member.healthy = False
+        if client is not None:
+            try:
+                await client.__aexit__(None, None, None)
+            except Exception:
+                pass
+
+    def _schedule_reconnect(self, member):
+        if self._closed or (member.reconnect_task is not None and not member.reconnect_task.done()):
+            return
+        member.reconnect_task = asyncio.ensure_future(self._reconnect(member))
+
+    async def _reconnect(self, member):
+        delay = self.reconnect_delay
+        while not self._closed and not member.healthy:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect(member)
+            except Exception:
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+            member.reconnects += 1
+            await self.refresh_routes(member.group)
+
+    async def _evict(self, member):
+        await self._disconnect(member)
+        self._schedule_reconnect(member)
+
+    async def refresh_routes(self, group=None):
+        """Rebuild the name -> group routing tables (for one group or all of them)"""
+        for name in ([group] if group else self.groups):
+            member = self._pick(name, required=False)
+            if member is None:
+                continue
+            for kind, key in (("tools", _item_name), ("resources", _item_uri), ("prompts", _item_name)):
+                try:
+                    items = await getattr(member.client, f"list_{kind}")()
+                except Exception:
+                    continue
+                routes = self._routes[kind]
+                for stale in [item for item, owner in routes.items() if owner == name]:
+                    del routes[stale]
+                for item in items:
+                    routes.setdefault(key(item), name)
+
+    def _pick(self, group, required=True):
+        """Choose the healthy replica of a group according to the strategy"""
+        candidates = [member for member in self._members if member.group == group and member.healthy]
+        if not candidates:
+            if required:
+                raise ConnectionError(f"No healthy server available for {group}")
+            return None
+        turn = next(self._round_robin)
+        # Rotating the candidates first breaks ties fairly
+        candidates = candidates[turn % len(candidates):] + candidates[:turn % len(candidates)]
+        if self.strategy == LATENCY:
+            return min(candidates, key=lambda m: (m.latency or 0.0, m.in_flight))
+        return min(candidates, key=lambda m: (m.in_flight, m.latency or 0.0))
+
+    def route(self, kind, name):
+        """Group that owns a tool name, resource URI or prompt name"""
+        group = self._routes[kind].get(name)
+        if group is None:
+            if len(self.groups) == 1:
+                return self.groups[0]
+            raise KeyError(f"No server provides {kind[:-1]} {name!r}")
+        return group
+
+    async def _owner(self, kind, name):
+        try:
+            return self.route(kind, name)
+        except KeyError:
+            # The server may have added it since the routes were built
+            await self.refresh_routes()
+            return self.route(kind, name)
+
+    @staticmethod
+    def _is_session_failure(error, member):
+        # Not OSError as a whole: TimeoutError subclasses it, and a slow call leaves the session usable
+        if isinstance(error, (ConnectionError, EOFError)):
+            return True
+        is_connected = getattr(member.client, "is_connected", None)
+        return callable(is_connected) and not is_connected()
+
+    async def _dispatch(self, group, method, *args):
+        member = self._pick(group)
+        member.in_flight += 1
+        member.calls += 1
+        start = time.perf_counter()
+        try:
+            result = await getattr(member.client, method)(*args)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            member.errors += 1
+            if self._is_session_failure(e, member):
+                await self._evict(member)
+            raise
+        finally:
+            member.in_flight -= 1
+        member.record(time.perf_counter() - start)
+        return result
+
+    async def call_tool(self, tool_name, arguments=None, server=None):
+        """Call a tool on the server group that provides it (or on `server` explicitly)"""
+        return await self._dispatch(server or await self._owner("tools", tool_name), "call_tool",
+                                    tool_name, arguments or {})
+
+    async def read_resource(self, uri, server=None):
+        return await self._dispatch(server or await self._owner("resources", str(uri)), "read_resource", uri)
+
+    async def get_prompt(self, name, arguments=None, server=None):
+        return await self._dispatch(server or await self._owner("prompts", name), "get_prompt", name, arguments or {})
+
+    async def _list_all(self, kind):
+        lists = await asyncio.gather(*(self._dispatch(group, f"list_{kind}") for group in self.groups
+                                       if self._pick(group, required=False) is not None))
+        return [item for items in lists for item in items]
+
+    async def list_tools(self):
+        return await self._list_all("tools")
+
+    async def list_resources(self):
+        return await self._list_all("resources")
+
+    async def list_prompts(self):
+        return await self._list_all("prompts")
+
+    def stats(self):
+        """Per-server health, load and latency"""
+        return {
+            member.name: {
+                "group": member.group,
+                "healthy": member.healthy,
+                "in_flight": member.in_flight,
+                "calls": member.calls,
+                "errors": member.errors,
+                "reconnects": member.reconnects,
+                "latency_ms": round(member.latency * 1000, 3) if member.latency is not None else None,
+            }
+            for member in self._members
+        }
+
+    async def close(self):
+        """Stop reconnecting and close every session"""
+        self._closed = True
+        for member in self._members:
+            if member.reconnect_task is not None:
+                member.reconnect_task.cancel()
+        await asyncio.gather(*(self._disconnect(member) for member in self._members))
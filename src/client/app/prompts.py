@@ -1,3 +1,7 @@
+import asyncio
+import json
+from collections import OrderedDict
+
 # Note: In typical LLM tool call cycles, when a tool is called, the LLM responds in JSON (as below),
 # and the client/server may then send another message (with updated context or validation) after the tool call.
 # This enables a multi-turn flow: user/LLM message → tool call → tool result → follow-up message.
@@ -17,17 +21,65 @@ LLM_BATCH_CHAIN_PROMPT = (
     "You are an agent capable of executing multiple tool, prompt, or resource calls in sequence or parallel. "
     "Respond with a JSON array of actions, e.g.: "
     "[{\"tool\": \"TOOL1\", \"args\": {...}}, {\"prompt\": \"PROMPT2\", \"args\": {...}}]. "
-    "You may chain results by referencing previous outputs."
+    "You may chain results by referencing previous outputs: give an action an \"id\" and use \"${id}\" "
+    "(or \"${id.field}\") inside a later action's args. Actions that do not reference each other run in parallel."
 )
 class PromptsClient:
     """
     Client for rendering server-side prompts via FastMCP.
+
+    Rendered prompts are memoized by prompt name, arguments and the server's capability
+    version, so re-rendering the same system prompt every turn costs no round trip; a
+    prompt list change on the server starts a new version. Concurrent identical renders
+    share one request. Cached results are shared, so treat them as read-only.
     """
-    def __init__(self, mcp_client):
+    def __init__(self, mcp_client, cache_size=256):
+        """
+        Args:
+            mcp_client: MCPClient (provides render_prompt and, optionally, capabilities)
+            cache_size (int): Rendered prompts kept (0 disables memoization)
+        """
         self._mcp_client = mcp_client
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self.stats = {"hits": 0, "misses": 0}
 
     async def render(self, prompt_name, **kwargs):
         """
         Render a prompt by name with arguments.
         """
-        return await self._mcp_client.render_prompt(prompt_name, kwargs)
+        return await self.get(prompt_name, kwargs)
+
+    async def get(self, prompt_name, arguments=None, use_cache=True):
+        """Render a prompt with an arguments dict; use_cache=False always asks the server"""
+        arguments = arguments or {}
+        if not use_cache or not self.cache_size:
+            return await self._mcp_client.render_prompt(prompt_name, arguments)
+        capabilities = getattr(self._mcp_client, "capabilities", None)
+        # get() is a cache hit while fresh, and refetches after a list-changed notification
+        version = (await capabilities.get())["version"] if capabilities is not None else None
+        key = (prompt_name, json.dumps(arguments, sort_keys=True, default=str), version)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._cache[key]
+        if key in self._in_flight:
+            self.stats["hits"] += 1
+            return await asyncio.shield(self._in_flight[key])
+        self.stats["misses"] += 1
+        render = asyncio.ensure_future(self._mcp_client.render_prompt(prompt_name, arguments))
+        self._in_flight[key] = render
+        try:
+            result = await asyncio.shield(render)
+        finally:
+            self._in_flight.pop(key, None)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def invalidate(self, prompt_name=None):
+        """Forget rendered prompts (all, or those of one prompt)"""
+        for key in [key for key in self._cache if prompt_name is None or key[0] == prompt_name]:
+            del self._cache[key]
@@ -1,9 +1,115 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+
+# Keys of a resource's _meta that identify its content version, in order of preference
+VERSION_KEYS = ("version", "etag", "sha256", "hash")
+
+
+def _content_chunks(content, chunk_size):
+    """Yield the bytes of one resource content item in chunks without building a second full copy"""
+    blob = getattr(content, "blob", None)
+    if blob is None and isinstance(content, dict):
+        blob = content.get("blob")
+    if blob is not None:
+        # Decode base64 a block at a time; 4 encoded characters make 3 bytes
+        step = max(4, chunk_size // 3 * 4)
+        for start in range(0, len(blob), step):
+            yield base64.b64decode(blob[start:start + step])
+        return
+    if isinstance(content, (bytes, bytearray)):
+        data = content
+    else:
+        text = getattr(content, "text", None)
+        if text is None and isinstance(content, dict):
+            text = content.get("text")
+        data = (text if text is not None else str(content)).encode("utf-8")
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def _version_from_meta(meta):
+    for key in VERSION_KEYS:
+        if meta and meta.get(key) is not None:
+            return str(meta[key])
+    return None
+
+
+class ResourceCache:
+    """
+    Local content cache for resources.
+
+    Contents are stored once per sha256 digest; an index maps each URI to the
+    server-provided version and digest it was last downloaded with.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._index_path = os.path.join(directory, "index.json")
+        try:
+            with open(self._index_path) as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, digest)
+
+    def lookup(self, uri, version):
+        """Path of the cached content for a URI at a version, or None"""
+        entry = self._index.get(uri)
+        if entry is None or version is None or entry.get("version") != version:
+            return None
+        path = self._blob_path(entry["sha256"])
+        return path if os.path.exists(path) else None
+
+    def entry(self, uri):
+        return self._index.get(uri)
+
+    def writer(self):
+        """Temporary file to stream new content into; pass it to commit() when done"""
+        return tempfile.NamedTemporaryFile(dir=self.directory, prefix=".incoming.", delete=False)
+
+    def commit(self, uri, version, tmp_path, digest, size):
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        self._index[uri] = {"version": version, "sha256": digest, "size": size}
+        tmp_index = self._index_path + ".tmp"
+        with open(tmp_index, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_index, self._index_path)
+        return path
+
+
 class ResourcesClient:
     """
     Client for accessing server-exposed resources via FastMCP.
+
+    stream() and download() deliver resource content in chunks. With a cache
+    directory, content is stored locally keyed by URI and the server-provided
+    version (the resource's _meta "version", "etag", "sha256" or "hash"), and a
+    resource whose version has not changed is served from disk instead of being
+    read from the server again. Only resources listed with such a version are
+    cached: templated URIs and resources listed without one are read from the
+    server every time.
+
+    With a capability cache, versions come from its cached resource list. That list
+    is refetched on resources/list_changed and resources/updated notifications, so
+    changes are seen at once when the server sends them; otherwise content can be
+    served stale for up to the capability TTL (`capabilities_ttl`).
     """
-    def __init__(self, fastmcp_client):
+    def __init__(self, fastmcp_client, cache_dir=None, capabilities=None):
         self._client = fastmcp_client
+        self._capabilities = capabilities
+        self.cache = ResourceCache(cache_dir) if cache_dir else None
+        self.stats = {"reads": 0, "cache_hits": 0, "bytes_read": 0}
 
     async def get(self, resource_name):
         """
@@ -16,3 +122,88 @@ class ResourcesClient:
         List available resources (with metadata).
         """
         return await self._client.list_resources()
+
+    async def version(self, uri):
+        """
+        Server-provided version of a resource, from the (cached) resource list, or None
+        (also when the server cannot list resources)
+        """
+        try:
+            if self._capabilities is not None:
+                resources = await self._capabilities.list("resources")
+            else:
+                resources = await self.list()
+        except Exception:
+            return None
+        for resource in resources:
+            if str(getattr(resource, "uri", resource)) == str(uri):
+                return _version_from_meta(getattr(resource, "meta", None))
+        return None
+
+    async def stream(self, uri, chunk_size=CHUNK_SIZE):
+        """
+        Async iterator over the bytes of a resource, chunk by chunk.
+        Served from the local cache when the server version is unchanged.
+        """
+        version = await self.version(uri) if self.cache is not None else None
+        cached = self.cache.lookup(str(uri), version) if self.cache is not None else None
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            with open(cached, "rb") as f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        return
+                    yield chunk
+
+        self.stats["reads"] += 1
+        contents = await self._client.read_resource(uri)
+        contents = list(contents) if isinstance(contents, (list, tuple)) else [contents]
+
+        # Without a listed version the next lookup could never match, so there is nothing to store
+        sink = self.cache.writer() if self.cache is not None and version is not None else None
+        digest, size = hashlib.sha256(), 0
+        try:
+            while contents:
+                # Drop each content item as soon as it is consumed
+                content = contents.pop(0)
+                for chunk in _content_chunks(content, chunk_size):
+                    size += len(chunk)
+                    self.stats["bytes_read"] += len(chunk)
+                    if sink is not None:
+                        sink.write(chunk)
+                        digest.update(chunk)
+                    yield chunk
+                del content
+        except BaseException:
+            if sink is not None:
+                sink.close()
+                os.remove(sink.name)
+            raise
+        if sink is not None:
+            sink.close()
+            self.cache.commit(str(uri), version, sink.name, digest.hexdigest(), size)
+
+    async def download(self, uri, path, chunk_size=CHUNK_SIZE):
+        """
+        Write a resource to a file chunk by chunk (atomically, via a temporary file).
+
+        Returns:
+            dict: {"path", "bytes", "sha256", "cached"}
+        """
+        hits = self.stats["cache_hits"]
+        digest, size = hashlib.sha256(), 0
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".download.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in self.stream(uri, chunk_size=chunk_size):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return {"path": path, "bytes": size, "sha256": digest.hexdigest(), "cached": self.stats["cache_hits"] > hits}
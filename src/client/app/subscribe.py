@@ -1,6 +1,18 @@
 
+import asyncio
+import inspect
 import threading
 import queue
+from collections import deque
+
+# What a full SubscriptionHandle queue does with the next message
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+_DONE = object()
+
 
 class SubscriptionClient:
 
@@ -46,6 +58,13 @@ class SubscriptionClient:
     - Allows, but does not enforce, local annotation (e.g., 'received_at') for each message.
     - Provides a callback mechanism for context providers to shape, annotate, or format messages as needed.
     - Does not force any particular context structure—supports opt-in, composable workflows.
+
+    All subscriptions are multiplexed as asyncio tasks over the client's session.
+    Async code uses subscribe_async() and iterates the returned handle; sync code
+    uses subscribe(), which runs the same tasks on one shared event loop thread,
+    so the number of threads does not grow with the number of topics. Only sources
+    that are blocking (non-async) generators get a daemon thread each, since a
+    next() that waits for the server would otherwise hold up every other topic.
     """
     def __init__(self, fastmcp_client):
         """
@@ -54,8 +73,85 @@ class SubscriptionClient:
         self._wrapper = fastmcp_client
         self._client = fastmcp_client._client
         self._subscriptions = {}
+        self._hub = None
+        self._hub_users = 0
+        self._hub_lock = threading.Lock()
+
+    async def _events(self, topic, payload=None):
+        """
+        Async iterator over the events of a topic, whatever kind of stream listen() returns.
+        Blocking generators are advanced on a thread of their own and closed when the subscription ends.
+        """
+        source = self.listen(topic, payload=payload)
+        if inspect.isawaitable(source):
+            source = await source
+        if hasattr(source, '__aiter__'):
+            try:
+                async for msg in source:
+                    yield msg
+            finally:
+                if hasattr(source, 'aclose'):
+                    await source.aclose()
+            return
+        reader = _BlockingSource(iter(source), asyncio.get_running_loop(), f"subscription-source-{topic}")
+        try:
+            while True:
+                msg = await reader.next()
+                if msg is _DONE:
+                    return
+                yield msg
+        finally:
+            reader.close()
+
+    async def _pump(self, topic, payload, callback, put):
+        async for msg in self._events(topic, payload=payload):
+            if callback:
+                result = callback(msg)
+                if inspect.isawaitable(result):
+                    await result
+            result = put(msg)
+            if inspect.isawaitable(result):
+                await result
 
-    def subscribe(self, topic, callback=None, payload=None):
+    async def subscribe_async(self, topic, callback=None, payload=None):
+        """
+        Subscribe to a topic from async code.
+
+        Returns an AsyncSubscriptionHandle; iterate it with `async for` and close() it when done.
+
+        Example usage:
+            handle = await client.subscriptions.subscribe_async('progress')
+            async for msg in handle:
+                ...
+        """
+        handle = AsyncSubscriptionHandle()
+        handle._task = asyncio.create_task(self._pump(topic, payload, callback, handle._queue.put_nowait))
+        handle._task.add_done_callback(handle._finished)
+        return handle
+
+    def _acquire_hub(self):
+        with self._hub_lock:
+            if self._hub is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="subscription-hub", daemon=True)
+                thread.start()
+                self._hub = (loop, thread)
+            self._hub_users += 1
+            return self._hub
+
+    def _release_hub(self):
+        with self._hub_lock:
+            self._hub_users -= 1
+            if self._hub_users or self._hub is None:
+                return
+            loop, thread = self._hub
+            self._hub = None
+        asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def subscribe(self, topic, callback=None, payload=None, max_queue_size=0, policy=BLOCK):
         """
         Subscribe to a topic (e.g., 'progress', 'logs') and listen for updates.
 
@@ -69,42 +165,254 @@ class SubscriptionClient:
                 msg['received_at'] = time.time()
                 # Optionally compute elapsed = msg['received_at'] - msg.get('timestamp', msg['received_at'])
             handle = client.subscribe('progress', callback=on_msg)
+
+        max_queue_size bounds the messages buffered for the handle (0 means unbounded).
+        When the buffer is full, policy decides what happens to the next message:
+        'block' pauses reading the stream until the consumer catches up (backpressure),
+        'drop_oldest' discards the oldest buffered message and 'drop_newest' discards
+        the new one. Dropped messages are counted in handle.dropped.
+        """
+        loop, thread = self._acquire_hub()
+        buffer = MessageBuffer(max_queue_size, policy, loop)
+        future = asyncio.run_coroutine_threadsafe(self._pump(topic, payload, callback, buffer.put), loop)
+        return SubscriptionHandle(buffer, future, thread, self._release_hub)
+
+
+class _BlockingSource:
+    """
+    Advances a blocking iterator on a daemon thread of its own, one item per next() call.
+
+    close() stops the thread and closes the iterator; a next() already waiting in the
+    iterator cannot be interrupted, so the iterator is closed as soon as it returns.
+    """
+    def __init__(self, iterator, loop, name):
+        self._iterator = iterator
+        self._loop = loop
+        self._requests = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def next(self):
+        """Future for the next item (_DONE when the iterator is exhausted)"""
+        future = self._loop.create_future()
+        self._requests.put(future)
+        return future
+
+    def close(self):
+        self._requests.put(None)
+
+    def _run(self):
+        try:
+            while True:
+                future = self._requests.get()
+                if future is None:
+                    return
+                try:
+                    item = next(self._iterator, _DONE)
+                except Exception as e:
+                    self._resolve(future, e, failed=True)
+                    return
+                self._resolve(future, item)
+                if item is _DONE:
+                    return
+        finally:
+            if hasattr(self._iterator, 'close'):
+                self._iterator.close()
+
+    def _resolve(self, future, value, failed=False):
+        def resolve():
+            if future.done():
+                return
+            if failed:
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+        try:
+            self._loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            # The subscription loop is already closed
+            pass
+
+
+async def _cancel_pending():
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class AsyncSubscriptionHandle:
+    """
+    Async iterator over the messages of one subscription.
+
+    - get(timeout=None): Wait for the next message (raises asyncio.TimeoutError).
+    - close(): Cancel the subscription.
+    """
+    def __init__(self):
+        self._queue = asyncio.Queue()
+        self._task = None
+        self.error = None
+
+    def _finished(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            self.error = task.exception()
+        self._queue.put_nowait(_DONE)
+
+    async def get(self, timeout=None):
         """
-        q = queue.Queue()
-        stop_event = threading.Event()
-        def listener():
-            for msg in self.listen(topic, payload=payload):
-                if stop_event.is_set():
-                    break
-                q.put(msg)
-                if callback:
-                    callback(msg)
-        thread = threading.Thread(target=listener, daemon=True)
-        thread.start()
-        return SubscriptionHandle(q, stop_event, thread)
+        Wait for the next message.
+
+        Raises:
+            StopAsyncIteration: When the subscription has ended
+        """
+        msg = await asyncio.wait_for(self._queue.get(), timeout)
+        if msg is _DONE:
+            # Keep the marker so later calls also see the end of the stream
+            self._queue.put_nowait(_DONE)
+            raise StopAsyncIteration
+        return msg
+
+    async def close(self):
+        """Cancel the subscription and wait for it to stop"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+
+class MessageBuffer:
+    """
+    Bounded, thread-safe message buffer between the subscription loop thread (producer) and sync consumers.
+
+    Mirrors the queue.Queue get() interface and adds get_many() for batched polling.
+    """
+    def __init__(self, maxsize=0, policy=BLOCK, loop=None):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}. Expected one of {', '.join(OVERFLOW_POLICIES)}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.received = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._loop = loop
+        # Set by the consumer when a producer blocked on a full buffer may continue
+        self._space = None
+
+    def qsize(self):
+        return len(self._items)
+
+    def _full(self):
+        return self.maxsize > 0 and len(self._items) >= self.maxsize
+
+    async def put(self, msg):
+        """Add a message, applying the overflow policy (runs on the subscription loop)"""
+        while True:
+            with self._cond:
+                if not self._full():
+                    self._items.append(msg)
+                    self.received += 1
+                    self._cond.notify()
+                    return
+                if self.policy == DROP_NEWEST:
+                    self.received += 1
+                    self.dropped += 1
+                    return
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self._items.append(msg)
+                    self.received += 1
+                    self.dropped += 1
+                    return
+                self._space = asyncio.Event()
+                space = self._space
+            await space.wait()
+
+    def _took(self):
+        # Called with the condition held after items were removed
+        if self._space is not None:
+            space, self._space = self._space, None
+            self._loop.call_soon_threadsafe(space.set)
+
+    def get(self, block=True, timeout=None):
+        """Remove and return the next message, raising queue.Empty like queue.Queue.get"""
+        with self._cond:
+            if block and not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            if not self._items:
+                raise queue.Empty
+            msg = self._items.popleft()
+            self._took()
+            return msg
+
+    def get_many(self, max_items=100, timeout=None):
+        """
+        Wait up to timeout seconds for at least one message, then return up to max_items
+        buffered messages without waiting further. Returns [] if nothing arrived in time.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                return []
+            count = min(max_items, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            self._took()
+            return batch
+
 
 class SubscriptionHandle:
     """
-    Handle for managing a subscription thread and polling for messages.
+    Handle for a subscription running on the shared event loop thread, for polling messages from sync code.
 
     - get(): Poll for the next message (blocking or non-blocking).
-    - stop(): Stop the subscription thread.
+    - get_many(): Poll for a batch of messages.
+    - stop(): Stop the subscription.
     """
-    def __init__(self, queue, stop_event, thread):
+    def __init__(self, queue, future, thread, release=None):
         """
-        Initialize the SubscriptionHandle with a message queue, stop event, and thread.
+        Initialize the SubscriptionHandle with a message queue, the subscription's future and the loop thread.
         """
         self._queue = queue
-        self._stop_event = stop_event
+        self._future = future
         self._thread = thread
+        self._release = release
     def get(self, block=True, timeout=None):
         """
         Retrieve the next message from the queue.
         """
         return self._queue.get(block=block, timeout=timeout)
+    def get_many(self, max_items=100, timeout=None):
+        """
+        Retrieve up to max_items messages at once, waiting up to timeout for the first one.
+        """
+        return self._queue.get_many(max_items=max_items, timeout=timeout)
+    @property
+    def dropped(self):
+        """Messages discarded because the queue was full"""
+        return self._queue.dropped
+    def stats(self):
+        """Received, dropped and currently buffered message counts"""
+        return {
+            "received": self._queue.received,
+            "dropped": self._queue.dropped,
+            "queued": self._queue.qsize(),
+            "max_queue_size": self._queue.maxsize,
+            "policy": self._queue.policy,
+        }
     def stop(self):
         """
-        Stop the subscription thread and clean up resources.
+        Stop the subscription and close its source; the shared loop thread exits once no subscriptions remain.
         """
-        self._stop_event.set()
-        self._thread.join()
+        if self._release is None:
+            return
+        self._future.cancel()
+        release, self._release = self._release, None
+        release()
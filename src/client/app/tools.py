@@ -1,18 +1,234 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+# Latency samples kept per tool for the hedge delay
+LATENCY_WINDOW = 200
+
+
+def _normalize_call(call):
+    """Accept ("tool", {args}), ("tool",) or {"tool": ..., "args": {...}}"""
+    if isinstance(call, dict):
+        return call["tool"], call.get("args", {})
+    if isinstance(call, str):
+        return call, {}
+    name, *rest = call
+    return name, (rest[0] if rest else {}) or {}
+
+
+class RetryPolicy:
+    """
+    Retry failed calls with exponential backoff and jitter.
+
+    Args:
+        attempts (int): Total attempts, including the first one
+        base_delay (float): Backoff before the first retry, doubling each time up to max_delay
+        max_delay (float): Upper bound for the backoff
+        jitter (float): Fraction of each backoff that is randomized (0 = none, 1 = full jitter)
+        timeout (float): Per-attempt timeout in seconds; a timed-out attempt is retried (None = no timeout)
+        retry_on (tuple): Exception types that are retried
+    """
+    def __init__(self, attempts=3, base_delay=0.1, max_delay=2.0, jitter=0.5, timeout=None,
+                 retry_on=(ConnectionError, TimeoutError, OSError, asyncio.TimeoutError)):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.timeout = timeout
+        self.retry_on = retry_on
+
+    def backoff(self, retry):
+        delay = min(self.max_delay, self.base_delay * 2 ** retry)
+        return delay * (1 - self.jitter * random.random())
+
+
+class HedgePolicy:
+    """
+    Send a duplicate request when the first one is slower than usual and take whichever answers first.
+
+    Args:
+        percentile (float): The hedge is sent after this percentile of the tool's recent latency
+        min_samples (int): Successful calls needed before the percentile is trusted
+        delay (float): Hedge delay used until min_samples is reached (None = do not hedge yet)
+    """
+    def __init__(self, percentile=0.95, min_samples=20, delay=None):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.delay = delay
+
+
 class ToolsClient:
     """
     Client for executing server-registered tools via FastMCP.
+
+    Optional retry and hedge policies apply to idempotent tools only: tools listed in
+    `idempotent` or, with a capability cache, whose annotations carry idempotentHint or readOnlyHint. Through a
+    ServerPool a hedge lands on the least loaded replica, usually another session.
     """
-    def __init__(self, fastmcp_client):
+    def __init__(self, fastmcp_client, cache=None, retry=None, hedge=None, idempotent=()):
+        """
+        Args:
+            fastmcp_client: Client (or ServerPool) providing call_tool/list_tools
+            cache (CapabilityCache): Read-through cache for the tool list
+            retry (RetryPolicy): Retry policy for idempotent tools
+            hedge (HedgePolicy): Hedged requests for idempotent tools
+            idempotent (iterable): Tool names to treat as idempotent regardless of annotations
+        """
         self._client = fastmcp_client
+        self._cache = cache
+        self.retry = retry
+        self.hedge = hedge
+        self.idempotent = set(idempotent)
+        self._latency = {}
+        self.stats = {"retries": 0, "hedges_issued": 0, "hedges_won": 0}
 
     async def call(self, tool_name, **kwargs):
         """
         Call a tool by name with parameters.
         """
-        return await self._client.call_tool(tool_name, kwargs)
+        return await self._call(tool_name, kwargs)
+
+    async def is_idempotent(self, tool_name):
+        """Whether a tool may be retried or hedged"""
+        if tool_name in self.idempotent:
+            return True
+        if self._cache is None:
+            # Annotations are only consulted through the capability cache, never with an extra round trip
+            return False
+        try:
+            tools = await self._cache.list("tools")
+        except Exception:
+            # The server does not list tools: nothing marks this one as safe to repeat
+            return False
+        for tool in tools:
+            if getattr(tool, "name", None) == tool_name:
+                annotations = getattr(tool, "annotations", None)
+                return bool(getattr(annotations, "idempotentHint", None) or getattr(annotations, "readOnlyHint", None))
+        return False
+
+    def hedge_delay(self, tool_name):
+        """Seconds to wait before hedging a call to this tool, or None"""
+        samples = self._latency.get(tool_name)
+        if not samples or len(samples) < self.hedge.min_samples:
+            return self.hedge.delay
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(self.hedge.percentile * len(ordered)))]
+
+    async def _call(self, tool_name, args):
+        if (self.retry is None and self.hedge is None) or not await self.is_idempotent(tool_name):
+            return await self._client.call_tool(tool_name, args)
+        if self.retry is None:
+            return await self._hedged(tool_name, args)
+        for attempt in range(self.retry.attempts):
+            try:
+                return await self._hedged(tool_name, args)
+            except self.retry.retry_on:
+                if attempt + 1 >= self.retry.attempts:
+                    raise
+            self.stats["retries"] += 1
+            await asyncio.sleep(self.retry.backoff(attempt))
+
+    async def _attempt(self, tool_name, args):
+        started = time.perf_counter()
+        timeout = self.retry.timeout if self.retry is not None else None
+        result = await asyncio.wait_for(self._client.call_tool(tool_name, args), timeout)
+        self._latency.setdefault(tool_name, deque(maxlen=LATENCY_WINDOW)).append(time.perf_counter() - started)
+        return result
+
+    async def _hedged(self, tool_name, args):
+        delay = self.hedge_delay(tool_name) if self.hedge is not None else None
+        if delay is None:
+            return await self._attempt(tool_name, args)
+        primary = asyncio.ensure_future(self._attempt(tool_name, args))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+            self.stats["hedges_issued"] += 1
+            hedge = asyncio.ensure_future(self._attempt(tool_name, args))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    if winner is hedge:
+                        self.stats["hedges_won"] += 1
+                    return winner.result()
+            # Both failed: surface the original request's error
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def call_many(self, calls, concurrency=16):
+        """
+        Call many tools with up to `concurrency` requests in flight over the session.
+
+        Args:
+            calls (iterable): ("tool", {args}) tuples or {"tool": ..., "args": {...}} dicts
+            concurrency (int): Maximum number of requests in flight
+        Returns:
+            list: One outcome per call, in input order (see call_many_as_completed)
+        """
+        outcomes = []
+        async for outcome in self.call_many_as_completed(calls, concurrency=concurrency):
+            outcomes.append(outcome)
+        outcomes.sort(key=lambda outcome: outcome["index"])
+        return outcomes
+
+    async def call_many_as_completed(self, calls, concurrency=16):
+        """
+        Like call_many, but yields each outcome as soon as its call finishes.
+
+        Calls are started lazily as slots free up, so `calls` can be a large generator.
+        Each outcome is a dict: {"index", "tool", "ok", "result", "error", "started", "elapsed"},
+        where "started" is seconds since the batch began and "elapsed" the call's round trip.
+        Failed calls are reported with ok=False and the exception in "error"; they do not stop the batch.
+        """
+        pending = iter(enumerate(calls))
+        running = {}
+        batch_start = time.perf_counter()
+
+        async def run(index, tool_name, args):
+            started = time.perf_counter()
+            outcome = {"index": index, "tool": tool_name, "ok": True, "result": None, "error": None,
+                       "started": started - batch_start}
+            try:
+                outcome["result"] = await self._call(tool_name, args)
+            except Exception as e:
+                outcome.update(ok=False, error=e)
+            outcome["elapsed"] = time.perf_counter() - started
+            return outcome
+
+        def fill():
+            while len(running) < max(1, concurrency):
+                try:
+                    index, call = next(pending)
+                except StopIteration:
+                    return
+                task = asyncio.ensure_future(run(index, *_normalize_call(call)))
+                running[task] = index
+
+        fill()
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    del running[task]
+                fill()
+                for task in sorted(done, key=lambda t: t.result()["index"]):
+                    yield task.result()
+        finally:
+            for task in running:
+                task.cancel()
 
     async def list(self):
         """
         List available tools (with metadata).
         """
+        if self._cache is not None:
+            return await self._cache.list("tools")
         return await self._client.list_tools()
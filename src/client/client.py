@@ -10,6 +10,8 @@ from client.app.notifications import NotificationsClient
 from client.app.logging import LoggingClient
 from client.app.elicitation import ElicitationClient
 from client.app.discovery import DiscoveryClient
+from client.app.capabilities import CapabilityCache
+from client.app.metrics import ClientMetrics, InstrumentedClient, JsonlExporter, instrument_transport
 
 
 class MCPClient:
@@ -18,34 +20,109 @@ class MCPClient:
     Provides modular access to tools, resources, prompts, notifications, logging, progress, elicitation, and discovery.
     Wraps the FastMCP client and can be extended for custom logic.
     """
-    def __init__(self, config_or_path=None):
+    def __init__(self, config_or_path=None, capabilities_ttl=300.0, capabilities_path=None, resource_cache_dir=None,
+                 metrics_path=None):
         """
         Args:
             config_or_path (dict or str): Dict config or path to mcp.json config file.
+            capabilities_ttl (float): Seconds before cached tool/resource/prompt lists are refetched.
+            capabilities_path (str): JSON file to warm-start the capability cache from (see capabilities.save()).
+            resource_cache_dir (str): Directory for the local resource content cache (see resources.stream()).
+            metrics_path (str): JSONL file that receives one timing record per request (see metrics()).
         """
         config = self._load_config(config_or_path)
-        self._client = FastMCPClient(config)
-        self.tools = ToolsClient(self._client)
-        self.resources = ResourcesClient(self._client)
+        self._config = config
+        self.servers = None
+        self.capabilities = CapabilityCache(None, ttl=capabilities_ttl, path=capabilities_path)
+        self.instrumentation = ClientMetrics()
+        self._exporter = self.instrumentation.add_hook(JsonlExporter(metrics_path)) if metrics_path else None
+        servers = list(config.get("mcpServers", {}))
+        server_name = servers[0] if len(servers) == 1 else "default"
+        self.elicitation = ElicitationClient(None)
+        self._client = instrument_transport(
+            FastMCPClient(config, message_handler=self.capabilities.handle_message,
+                          elicitation_handler=self.elicitation.handle), server_name)
+        self.elicitation._client = self._client
+        self._transport = InstrumentedClient(self._client, self.instrumentation, server=server_name)
+        self.capabilities._client = self._transport
+        if capabilities_path:
+            self.capabilities.load()
+        self.tools = ToolsClient(self._transport, cache=self.capabilities)
+        self.resources = ResourcesClient(self._transport, cache_dir=resource_cache_dir,
+                                         capabilities=self.capabilities)
         self.prompts = PromptsClient(self)
         self.notifications = NotificationsClient(self._client)
         self.logging = LoggingClient(self._client)
-        self.elicitation = ElicitationClient(self._client)
-        self.discovery = DiscoveryClient(self._client)
+        self.discovery = DiscoveryClient(self._transport, cache=self.capabilities)
         from client.app.subscribe import SubscriptionClient
         self.subscriptions = SubscriptionClient(self)
 
+    async def connect_servers(self, strategy="least_in_flight", **options):
+        """
+        Open persistent sessions to every server in the config and route calls through them.
+
+        Tool calls, resource reads and discovery are then routed by name to the server that
+        provides them and spread across replicas (entries sharing a "group" key, or with
+        "replicas": N) by the given strategy ("least_in_flight" or "latency").
+        Returns the ServerPool, also available as client.servers.
+        """
+        from client.app.pool import ServerPool
+        pool = ServerPool(
+            self._config,
+            client_factory=lambda config: instrument_transport(
+                FastMCPClient(config, message_handler=self.capabilities.handle_message,
+                              elicitation_handler=self.elicitation.handle),
+                next(iter(config["mcpServers"]))),
+            strategy=strategy,
+            **options,
+        )
+        await pool.start()
+        self.servers = pool
+        routed = InstrumentedClient(pool, self.instrumentation, server="pool")
+        for section in (self.tools, self.resources, self.discovery, self.capabilities):
+            section._client = routed
+        self.capabilities.invalidate()
+        return pool
+
+    async def close_servers(self):
+        """Close the sessions opened by connect_servers and go back to the single client"""
+        if self.servers is None:
+            return
+        await self.servers.close()
+        self.servers = None
+        for section in (self.tools, self.resources, self.discovery, self.capabilities):
+            section._client = self._transport
+        self.capabilities.invalidate()
+
+    def metrics(self):
+        """
+        Request timings so far: {"operations": {...}, "servers": {...}}, each entry with request
+        and error counts and p50/p95/p99 histograms of queue_wait, round_trip, decode and total.
+        """
+        return self.instrumentation.snapshot()
+
     async def render_prompt(self, prompt_name, kwargs):
         """
-        Render a prompt by calling the prompt as a tool (if supported by the server).
+        Render a prompt with the native prompts/get request, or by calling the prompt
+        as a tool when the server does not list it as a prompt.
         Args:
             prompt_name (str): The name of the prompt to render.
             kwargs (dict): Arguments for the prompt.
         Returns:
             Any: The rendered prompt result.
         """
+        # The single session, or the server pool after connect_servers()
+        transport = self.tools._client
+        if hasattr(transport, "get_prompt"):
+            try:
+                prompts = await self.capabilities.list("prompts")
+            except Exception:
+                # The server does not list prompts
+                prompts = []
+            if any(getattr(prompt, "name", prompt) == prompt_name for prompt in prompts):
+                return await transport.get_prompt(prompt_name, kwargs)
         # Many FastMCP servers expose prompts as tools with the same name
-        return await self._client.call_tool(prompt_name, kwargs)
+        return await transport.call_tool(prompt_name, kwargs)
 
     @staticmethod
     def _load_config(config_or_path, server_name=None):
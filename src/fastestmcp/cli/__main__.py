@@ -28,6 +28,10 @@ Examples:
 Client Examples:
   fastestmcp client --name myclient --apis 3 --integrations 2 --transport http --structure structured
   fastestmcp client --template api-client --name myapi --structure mono
+
+Benchmark Examples:
+  fastestmcp bench server.py --sessions 8 --requests 5000 --seed 1
+  fastestmcp bench http://localhost:8000/mcp --call 'tool:echo:{"message": "hi"}' --format json
         """
     )
 
@@ -62,6 +66,18 @@ Client Examples:
     client_parser.add_argument('--type', choices=['fastmcp', 'mcp'], default='fastmcp', help='MCP client type (default: fastmcp)')
     client_parser.add_argument('--output', default='.', help='Output directory (default: current directory)')
 
+    # Benchmark command
+    bench_parser = subparsers.add_parser('bench', help='Benchmark an MCP server under load')
+    bench_parser.add_argument('target', help='Server to benchmark: http(s) URL, server .py script, mcp.json config or stdio command')
+    bench_parser.add_argument('--sessions', type=int, default=4, help='Number of concurrent client sessions (default: 4)')
+    bench_parser.add_argument('--requests', type=int, default=1000, help='Total measured requests across sessions (default: 1000)')
+    bench_parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per session before the run (default: 10)')
+    bench_parser.add_argument('--call', action='append', default=[], help="Call to include, repeatable: tool:NAME[:JSON], resource:URI or prompt:NAME[:JSON] (default: discover calls that need no arguments)")
+    bench_parser.add_argument('--mix', default='tools=1,resources=1,prompts=1', help='Relative weights of call kinds (default: tools=1,resources=1,prompts=1)')
+    bench_parser.add_argument('--seed', type=int, default=0, help='Seed for the call sequence; same seed, same workload (default: 0)')
+    bench_parser.add_argument('--format', choices=['text', 'json'], default='text', help='Report format (default: text)')
+    bench_parser.add_argument('--output', help='Also write the JSON report to this file')
+
     args = parser.parse_args()
 
     if not args.command:
@@ -136,6 +152,24 @@ Client Examples:
                 print(f"✅ {message}")
                 print(structure)
 
+        elif args.command == 'bench':
+            import asyncio
+            import json
+            from .bench import format_report, parse_call, run_bench
+            report = asyncio.run(run_bench(
+                args.target,
+                sessions=args.sessions,
+                requests=args.requests,
+                calls=[parse_call(spec) for spec in args.call] or None,
+                mix=args.mix,
+                seed=args.seed,
+                warmup=args.warmup,
+            ))
+            if args.output:
+                with open(args.output, 'w') as f:
+                    json.dump(report, f, indent=2)
+            print(json.dumps(report, indent=2) if args.format == 'json' else format_report(report))
+
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
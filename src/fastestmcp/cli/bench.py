@@ -0,0 +1,219 @@
+"""
+Load benchmark for MCP servers (fastestmcp bench)
+
+Drives a seeded mix of tool, resource and prompt calls from N concurrent
+client sessions and reports throughput, latency percentiles and errors.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import random
+import shlex
+import time
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+KINDS = ("tool", "resource", "prompt")
+
+Call = Tuple[str, str, Dict[str, Any]]
+
+
+def resolve_target(target: Any) -> Any:
+    """
+    Turn a bench target into something fastmcp.Client accepts:
+    an http(s) URL, a server .py script (launched over stdio), an mcp.json config
+    file, or any other string as a stdio command line.
+    """
+    if not isinstance(target, str):
+        return target
+    if target.startswith(("http://", "https://")) or target.endswith(".py"):
+        return target
+    if target.endswith(".json"):
+        with open(target) as f:
+            return json.load(f)
+    command, *args = shlex.split(target)
+    return {"mcpServers": {"bench": {"command": command, "args": args}}}
+
+
+def parse_call(spec: str) -> Call:
+    """Parse 'tool:NAME[:JSON]', 'resource:URI' or 'prompt:NAME[:JSON]'"""
+    kind, _, rest = spec.partition(":")
+    if kind not in KINDS or not rest:
+        raise ValueError(f"Invalid call spec: {spec!r}. Expected tool:NAME[:JSON], resource:URI or prompt:NAME[:JSON]")
+    if kind == "resource":
+        return kind, rest, {}
+    name, _, args = rest.partition(":")
+    return kind, name, json.loads(args) if args else {}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse 'tools=70,resources=20,prompts=10' into weights per kind"""
+    weights = {}
+    for part in filter(None, (p.strip() for p in mix.split(","))):
+        kind, _, weight = part.partition("=")
+        kind = kind.rstrip("s")
+        if kind not in KINDS:
+            raise ValueError(f"Invalid mix entry: {part!r}. Expected tools=, resources= or prompts=")
+        weights[kind] = float(weight or 1)
+    return weights
+
+
+def _required(schema: Any) -> List[str]:
+    return list((schema or {}).get("required", []))
+
+
+async def _listed(method: Callable[[], Any]) -> List[Any]:
+    try:
+        return await method()
+    except Exception:
+        # The server does not implement this list method (e.g. no prompts/list)
+        return []
+
+
+async def discover_calls(client: Any) -> List[Call]:
+    """
+    Calls that need no arguments: tools without required parameters, static resources and prompts without
+    required arguments. Kinds the server cannot list are skipped.
+    """
+    calls = []
+    for tool in await _listed(client.list_tools):
+        if not _required(tool.inputSchema):
+            calls.append(("tool", tool.name, {}))
+    for resource in await _listed(client.list_resources):
+        calls.append(("resource", str(resource.uri), {}))
+    for prompt in await _listed(client.list_prompts):
+        if not any(argument.required for argument in prompt.arguments or []):
+            calls.append(("prompt", prompt.name, {}))
+    return calls
+
+
+def plan_session(calls: List[Call], weights: Dict[str, float], count: int, rng: random.Random) -> List[Call]:
+    """The sequence of calls one session makes, drawn from the mix with a seeded generator"""
+    by_kind = {kind: [call for call in calls if call[0] == kind] for kind in KINDS}
+    kinds = [kind for kind in KINDS if by_kind[kind] and weights.get(kind, 0) > 0]
+    if not kinds:
+        raise ValueError("Nothing to benchmark: no calls match the mix (use --call to specify calls)")
+    kind_weights = [weights[kind] for kind in kinds]
+    return [rng.choice(by_kind[rng.choices(kinds, kind_weights)[0]]) for _ in range(count)]
+
+
+async def _invoke(client: Any, call: Call) -> Any:
+    kind, name, args = call
+    if kind == "tool":
+        return await client.call_tool(name, args)
+    if kind == "resource":
+        return await client.read_resource(name)
+    return await client.get_prompt(name, args)
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pct(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {"count": len(ordered), "mean": round(sum(ordered) / len(ordered) * 1000, 3), "p50": pct(0.5),
+            "p95": pct(0.95), "p99": pct(0.99), "max": round(ordered[-1] * 1000, 3)}
+
+
+async def run_bench(target: Any, sessions: int = 4, requests: int = 1000, calls: Optional[List[Call]] = None,
+                    mix: str = "tools=1,resources=1,prompts=1", seed: int = 0, warmup: int = 10,
+                    client_factory: Optional[Callable[[Any], Any]] = None) -> Dict[str, Any]:
+    """
+    Run a benchmark and return the report as a dict.
+
+    `requests` measured calls are split across `sessions` concurrent client sessions, each
+    issuing its calls back to back after `warmup` unmeasured calls. The call sequence of every
+    session is derived from `seed`, so runs with the same arguments issue identical workloads.
+    """
+    if client_factory is None:
+        from fastmcp import Client
+        client_factory = Client
+    weights = parse_mix(mix)
+    resolved = resolve_target(target)
+
+    async with AsyncExitStack() as stack:
+        clients = [client_factory(resolved) for _ in range(sessions)]
+        await asyncio.gather(*(stack.enter_async_context(client) for client in clients))
+        calls = calls or await discover_calls(clients[0])
+
+        plans = []
+        for index in range(sessions):
+            count = requests // sessions + (index < requests % sessions)
+            rng = random.Random(f"{seed}:{index}")
+            plans.append((plan_session(calls, weights, warmup, rng), plan_session(calls, weights, count, rng)))
+
+        async def drive(client, plan, samples, errors):
+            for call in plan:
+                started = time.perf_counter()
+                try:
+                    await _invoke(client, call)
+                except Exception as e:
+                    errors.append((call, type(e).__name__))
+                    continue
+                if samples is not None:
+                    samples.append((call, time.perf_counter() - started))
+
+        await asyncio.gather(*(drive(client, warm, None, []) for client, (warm, _) in zip(clients, plans)))
+        samples, errors = [], []
+        started = time.perf_counter()
+        await asyncio.gather(*(drive(client, plan, samples, errors) for client, (_, plan) in zip(clients, plans)))
+        elapsed = time.perf_counter() - started
+
+    operations = {}
+    for call, latency in samples:
+        operations.setdefault(f"{call[0]}:{call[1]}", {"latencies": [], "errors": 0})["latencies"].append(latency)
+    for call, _ in errors:
+        operations.setdefault(f"{call[0]}:{call[1]}", {"latencies": [], "errors": 0})["errors"] += 1
+    error_types = {}
+    for _, name in errors:
+        error_types[name] = error_types.get(name, 0) + 1
+    workload = json.dumps([plan for _, plan in plans], sort_keys=True)
+
+    return {
+        "target": target if isinstance(target, str) else type(target).__name__,
+        "seed": seed,
+        "sessions": sessions,
+        "mix": weights,
+        "workload_sha1": hashlib.sha1(workload.encode("utf-8")).hexdigest(),
+        "requests": len(samples) + len(errors),
+        "errors": len(errors),
+        "error_types": error_types,
+        "duration_s": round(elapsed, 4),
+        "throughput_rps": round((len(samples) + len(errors)) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": _percentiles([latency for _, latency in samples]),
+        "operations": {
+            name: {"errors": entry["errors"], **_percentiles(entry["latencies"])}
+            for name, entry in sorted(operations.items())
+        },
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human-readable summary of a bench report"""
+    latency = report["latency_ms"]
+    lines = [
+        f"Target:      {report['target']}",
+        f"Sessions:    {report['sessions']}   seed: {report['seed']}   workload: {report['workload_sha1'][:12]}",
+        f"Requests:    {report['requests']} in {report['duration_s']:.3f}s ({report['throughput_rps']:.1f} req/s)",
+        f"Errors:      {report['errors']}" + (f" {report['error_types']}" if report["errors"] else ""),
+    ]
+    if latency.get("count"):
+        lines.append(f"Latency ms:  p50 {latency['p50']:.3f}  p95 {latency['p95']:.3f}  "
+                     f"p99 {latency['p99']:.3f}  max {latency['max']:.3f}")
+    lines.append("")
+    lines.append(f"{'operation':<40} {'count':>7} {'errors':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, entry in report["operations"].items():
+        if entry.get("count"):
+            lines.append(f"{name[:40]:<40} {entry['count']:>7} {entry['errors']:>6} "
+                         f"{entry['p50']:>9.3f} {entry['p95']:>9.3f} {entry['p99']:>9.3f}")
+        else:
+            lines.append(f"{name[:40]:<40} {0:>7} {entry['errors']:>6} {'-':>9} {'-':>9} {'-':>9}")
+    return "\n".join(lines)
@@ -19,55 +19,62 @@ Generated by FastestMCP CLI
 
 import sys
 import os
+import time
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 from mcp.server.fastmcp import FastMCP
 
 # Add components to path
 sys.path.insert(0, os.path.dirname(__file__))
 
+# Component modules enabled for this server
+COMPONENT_MODULES = [
+    name for name, count in (
+        ("tools", {tools}),
+        ("resources", {resources}),
+        ("prompts", {prompts}),
+        ("notifications", {notifications}),
+        ("subscriptions", {subscriptions}),
+    ) if count > 0
+]
+
+# Components are independent, so they are imported concurrently by default.
+# Set FASTESTMCP_SERIAL_IMPORTS=1 to import them one after another, and
+# FASTESTMCP_IMPORT_TIMINGS=1 to print per-component import times on startup.
+PARALLEL_IMPORTS = os.environ.get("FASTESTMCP_SERIAL_IMPORTS") != "1"
+
+def _import_component(name):
+    """Import a single component module and measure how long it took"""
+    started = time.perf_counter()
+    try:
+        module = importlib.import_module(f"components.{{name}}")
+    except ImportError:
+        module = None
+    return name, module, time.perf_counter() - started
+
 # Dynamic imports from components
 def load_components():
     """Load all component modules dynamically"""
     components = {{}}
+    import_times = {{}}
 
-    # Load tools
-    if {tools} > 0:
-        try:
-            from components import tools
-            components['tools'] = tools
-        except ImportError:
-            pass
-
-    # Load resources
-    if {resources} > 0:
-        try:
-            from components import resources
-            components['resources'] = resources
-        except ImportError:
-            pass
-
-    # Load prompts
-    if {prompts} > 0:
-        try:
-            from components import prompts
-            components['prompts'] = prompts
-        except ImportError:
-            pass
-
-    # Load notifications
-    if {notifications} > 0:
-        try:
-            from components import notifications
-            components['notifications'] = notifications
-        except ImportError:
-            pass
-
-    # Load subscriptions
-    if {subscriptions} > 0:
-        try:
-            from components import subscriptions
-            components['subscriptions'] = subscriptions
-        except ImportError:
-            pass
+    if PARALLEL_IMPORTS and len(COMPONENT_MODULES) > 1:
+        with ThreadPoolExecutor(max_workers=len(COMPONENT_MODULES)) as pool:
+            results = list(pool.map(_import_component, COMPONENT_MODULES))
+    else:
+        results = [_import_component(name) for name in COMPONENT_MODULES]
+
+    for name, module, elapsed in results:
+        import_times[name] = elapsed
+        if module is not None:
+            components[name] = module
+
+    if import_times and os.environ.get("FASTESTMCP_IMPORT_TIMINGS") == "1":
+        slowest = max(import_times, key=import_times.get)
+        for name, elapsed in import_times.items():
+            print(f"Imported {{name}} in {{elapsed:.3f}}s", file=sys.stderr)
+        print(f"Critical path: {{slowest}} ({{import_times[slowest]:.3f}}s), "
+              f"serial total: {{sum(import_times.values()):.3f}}s", file=sys.stderr)
 
     return components
 
@@ -5,11 +5,15 @@ FastestMCP Components - Reusable component templates for MCP servers and clients
 __version__ = "0.1.0"
 
 # Import and re-export the main component functions
-from .component_loader import ComponentLoader, use_component, register_component
+from .component_loader import ComponentLoader, use_component, use_components, register_component
+from .component_workers import ComponentWorkerPool, WorkerCrashedError
 
 __all__ = [
     "ComponentLoader",
     "use_component", 
+    "use_components",
     "register_component",
+    "ComponentWorkerPool",
+    "WorkerCrashedError",
     "__version__"
 ]
\ No newline at end of file
@@ -0,0 +1,472 @@
+"""
+Subscription Broker - In-process asyncio pub/sub for MCP subscriptions
+Tools publish events to topics and every subscriber of the topic receives them as they happen
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+
+from .subscription_filters import SubscriptionFilter, compile_filter
+from .subscription_log import SubscriptionLog
+
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+DISCONNECT = "disconnect"
+SPILL = "spill"
+
+SLOW_CONSUMER_POLICIES = (DROP_OLDEST, DROP_NEWEST, DISCONNECT, SPILL)
+
+# Number of events read from the durable log at a time by a catching-up subscriber
+LOG_PAGE_SIZE = 256
+
+
+class Subscriber:
+    """
+    A single subscription to a broker topic.
+
+    Iterate it with `async for` to receive events. Events are buffered in a bounded
+    queue; when the queue is full the subscriber's slow-consumer policy decides
+    whether the oldest event is dropped, the new event is dropped, the
+    subscriber is disconnected, or (with a durable log) the queue is discarded
+    and the subscriber catches up by reading the log page by page.
+    """
+
+    __slots__ = ("topic", "max_queue_size", "policy", "filter", "closed", "last_sequence", "replayed", "missed",
+                 "dropped", "_broker", "_state", "_queue", "_waiter", "_backlog", "_log_cursor", "_log_until")
+
+    def __init__(self, broker: "SubscriptionBroker", topic: str, max_queue_size: int, policy: str,
+                 filter: Optional[SubscriptionFilter] = None, state: Optional["_Topic"] = None):
+        self.topic = topic
+        self.max_queue_size = max_queue_size
+        self.policy = policy
+        self.filter = filter
+        self.closed = False
+        # Sequence number of the event most recently returned by get()
+        self.last_sequence = 0
+        # Events replayed from the topic history on subscribe, and events that were
+        # no longer in the history (non-zero means the client needs a full resync)
+        self.replayed = 0
+        self.missed = 0
+        self.dropped = 0
+        self._broker = broker
+        self._state = state
+        self._queue: deque = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        # Events still to be read from the durable log: the page currently loaded,
+        # the last sequence loaded so far and the sequence at which the queue takes over
+        self._backlog: deque = deque()
+        self._log_cursor: Optional[int] = None
+        self._log_until = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue) + len(self._backlog)
+
+    def _read_from_log(self, after: int, until: int) -> None:
+        """Serve events after `after` up to `until` from the durable log before the queue"""
+        if self._log_cursor is None:
+            # Events already loaded into the backlog must not be read from the log again
+            self._log_cursor = max(after, self._backlog[-1][0]) if self._backlog else after
+        self._log_until = max(self._log_until, until)
+
+    def _deliver(self, sequence: int, event: Dict[str, Any]) -> bool:
+        """Queue an event for this subscriber, returns False if it was dropped"""
+        if self.closed:
+            return False
+        if len(self._queue) >= self.max_queue_size:
+            if self.policy == SPILL:
+                # Everything queued is also in the log: forget it and read it back later
+                self._read_from_log(self.last_sequence, sequence)
+                self._queue.clear()
+                self._wake()
+                return True
+            self.dropped += 1
+            if self._state is not None:
+                self._state.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return False
+            if self.policy == DISCONNECT:
+                self.close()
+                return False
+            self._queue.popleft()
+        self._queue.append((sequence, event))
+        self._wake()
+        return True
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _load_page(self) -> None:
+        """Load the next page of events from the durable log into the backlog"""
+        log = self._broker.log
+        while not self._backlog and self._log_cursor is not None:
+            if log is None or self._log_cursor >= self._log_until:
+                self._log_cursor = None
+                break
+            page = log.read(self.topic, after=self._log_cursor, limit=LOG_PAGE_SIZE, until=self._log_until)
+            if not page:
+                # The rest of the range was removed by retention
+                self.missed += self._log_until - self._log_cursor
+                self._log_cursor = None
+                break
+            # A gap before the page means retention deleted events that were never read
+            self.missed += page[0][0] - self._log_cursor - 1
+            self._log_cursor = page[-1][0]
+            if self.filter is not None:
+                page = [(sequence, event) for sequence, event in page if self.filter.matches(event)]
+            self._backlog.extend(page)
+
+    def _pop(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        if self._log_cursor is not None and not self._backlog:
+            self._load_page()
+        if self._backlog:
+            return self._backlog.popleft()
+        if self._queue:
+            return self._queue.popleft()
+        return None
+
+    def get_nowait(self) -> Optional[Dict[str, Any]]:
+        """Return the next queued event, or None if the queue is empty"""
+        entry = self._pop()
+        if entry is None:
+            return None
+        self.last_sequence, event = entry
+        return event
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Wait for the next event.
+
+        Raises:
+            StopAsyncIteration: If the subscriber was closed and its queue is drained
+        """
+        while True:
+            entry = self._pop()
+            if entry is not None:
+                self.last_sequence, event = entry
+                return event
+            if self.closed:
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    def close(self) -> None:
+        """Stop receiving events; already queued events can still be consumed"""
+        if self.closed:
+            return
+        self.closed = True
+        self._broker._remove(self)
+        self._wake()
+
+    def __aiter__(self) -> "Subscriber":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        return await self.get()
+
+
+class _Topic:
+    """Subscribers, sequence counter and replay history of one topic"""
+
+    __slots__ = ("subscribers", "unindexed", "index", "sequence", "history",
+                 "published", "delivered", "dropped", "last_activity")
+
+    def __init__(self, replay_capacity: int):
+        self.subscribers: Set[Subscriber] = set()
+        # Subscribers without an equality clause are checked on every publish;
+        # the rest are bucketed by field and value so only matching buckets are visited
+        self.unindexed: Set[Subscriber] = set()
+        self.index: Dict[str, Tuple[Any, Dict[Any, Set[Subscriber]]]] = {}
+        self.sequence = 0
+        self.history: deque = deque(maxlen=replay_capacity)
+        # Plain counters: every mutation happens on the event loop thread, so no locks are needed
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.last_activity: Optional[float] = None
+
+    def add(self, subscriber: Subscriber) -> None:
+        self.subscribers.add(subscriber)
+        key = subscriber.filter.index_key if subscriber.filter else None
+        if key is None:
+            self.unindexed.add(subscriber)
+            return
+        field, value = key
+        getter, buckets = self.index.setdefault(field, (subscriber.filter.index_getter, {}))
+        buckets.setdefault(value, set()).add(subscriber)
+
+    def discard(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+        key = subscriber.filter.index_key if subscriber.filter else None
+        if key is None:
+            self.unindexed.discard(subscriber)
+            return
+        field, value = key
+        getter, buckets = self.index[field]
+        bucket = buckets[value]
+        bucket.discard(subscriber)
+        if not bucket:
+            del buckets[value]
+            if not buckets:
+                del self.index[field]
+
+    def candidates(self, event: Dict[str, Any]) -> List[Subscriber]:
+        """Subscribers that may match an event: the unindexed ones plus matching buckets"""
+        candidates = list(self.unindexed)
+        for getter, buckets in self.index.values():
+            value = getter(event)
+            try:
+                bucket = buckets.get(value)
+            except TypeError:
+                continue
+            if bucket:
+                candidates.extend(bucket)
+        return candidates
+
+
+class SubscriptionBroker:
+    """
+    In-process asyncio pub/sub broker.
+
+    Publishing is synchronous and never blocks: the event is appended to each
+    subscriber's bounded queue and any waiting consumer is woken up. Idle
+    subscribers cost one small object and an empty deque; nothing polls.
+
+    Subscribers can pass a filter expression (see subscription_filters); it is
+    compiled once, and subscribers are indexed by their first equality clause so
+    publishing only visits subscribers that can match.
+
+    Every published event gets a per-topic sequence number, and each topic keeps
+    the most recent `replay_capacity` events in a ring buffer so a reconnecting
+    subscriber can resume after the last sequence number it saw. With a durable
+    `log` (see subscription_log) every event is also appended to disk: sequence
+    numbers continue across restarts, resumes older than the ring buffer are
+    served from the log, and the "spill" policy lets slow consumers fall back to
+    reading the log instead of dropping events.
+
+    Example:
+        broker = SubscriptionBroker(max_queue_size=100, policy="drop_oldest")
+        subscriber = broker.subscribe("orders")
+        broker.publish("orders", {"id": 1})
+        async for event in subscriber:
+            ...
+    """
+
+    def __init__(self, max_queue_size: int = 100, policy: str = DROP_OLDEST, replay_capacity: int = 1000,
+                 log: Optional[SubscriptionLog] = None):
+        """
+        Args:
+            max_queue_size: Default per-subscriber queue capacity
+            policy: Default slow-consumer policy ("drop_oldest", "drop_newest", "disconnect" or "spill")
+            replay_capacity: Number of recent events kept per topic for resuming subscribers (0 disables replay)
+            log: Durable on-disk log every published event is appended to
+        """
+        self.log = log
+        self._validate(max_queue_size, policy)
+        if replay_capacity < 0:
+            raise ValueError("replay_capacity must not be negative")
+        self.max_queue_size = max_queue_size
+        self.policy = policy
+        self.replay_capacity = replay_capacity
+        self._topics: Dict[str, _Topic] = {}
+
+    def _topic(self, topic: str) -> _Topic:
+        state = self._topics.get(topic)
+        if state is None:
+            state = self._topics[topic] = _Topic(self.replay_capacity)
+            if self.log is not None:
+                state.sequence = self.log.last_sequence(topic)
+        return state
+
+    def attach_log(self, log: SubscriptionLog) -> None:
+        """Start appending published events to a durable log"""
+        self.log = log
+        for name, state in self._topics.items():
+            state.sequence = max(state.sequence, log.last_sequence(name))
+
+    def _validate(self, max_queue_size: int, policy: str) -> None:
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be at least 1")
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow-consumer policy: {policy}. "
+                             f"Expected one of {', '.join(SLOW_CONSUMER_POLICIES)}")
+        if policy == SPILL and self.log is None:
+            raise ValueError("The spill policy requires a broker with a durable log")
+
+    def subscribe(self, topic: str, max_queue_size: Optional[int] = None,
+                  policy: Optional[str] = None, resume_after: Optional[int] = None,
+                  filter_expr: Union[str, SubscriptionFilter, None] = None) -> Subscriber:
+        """
+        Subscribe to a topic.
+
+        Args:
+            topic: Topic name
+            max_queue_size: Queue capacity for this subscriber (defaults to the broker's)
+            policy: Slow-consumer policy for this subscriber (defaults to the broker's)
+            resume_after: Last sequence number the client received; buffered events
+                after it are replayed before live events
+            filter_expr: Filter expression (or compiled filter) events must match
+
+        Returns:
+            Subscriber that can be iterated with `async for`
+        """
+        max_queue_size = self.max_queue_size if max_queue_size is None else max_queue_size
+        policy = policy or self.policy
+        self._validate(max_queue_size, policy)
+        if isinstance(filter_expr, str) or filter_expr is None:
+            filter_expr = compile_filter(filter_expr)
+        state = self._topic(topic)
+        subscriber = Subscriber(self, topic, max_queue_size, policy, filter_expr, state)
+
+        if resume_after is not None and self.log is not None and resume_after < state.sequence and \
+                (not state.history or resume_after + 1 < state.history[0][0]):
+            # Older than the ring buffer: page the gap in from the durable log as it is consumed
+            subscriber.last_sequence = resume_after
+            first = self.log.first_sequence(topic)
+            oldest = first if first is not None else state.sequence + 1
+            subscriber.missed = max(0, oldest - resume_after - 1)
+            subscriber.replayed = state.sequence - resume_after - subscriber.missed
+            subscriber._read_from_log(resume_after + subscriber.missed, state.sequence)
+        elif resume_after is not None:
+            subscriber.last_sequence = resume_after
+            backlog = self.replay(topic, resume_after)
+            if filter_expr is not None:
+                backlog = [(sequence, event) for sequence, event in backlog if filter_expr.matches(event)]
+            # Replayed events bypass the queue limit so a resume never loses buffered history
+            subscriber._queue.extend(backlog)
+            subscriber.replayed = len(backlog)
+            oldest = state.history[0][0] if state.history else state.sequence + 1
+            subscriber.missed = max(0, oldest - resume_after - 1)
+
+        state.add(subscriber)
+        state.last_activity = time.time()
+        return subscriber
+
+    def replay(self, topic: str, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """Buffered (sequence, event) pairs of a topic with a sequence number greater than `after`"""
+        state = self._topics.get(topic)
+        if self.log is not None and (state is None or not state.history or after + 1 < state.history[0][0]):
+            return self.log.read(topic, after=after)
+        if state is None or not state.history:
+            return []
+        oldest = state.history[0][0]
+        if after < oldest:
+            return list(state.history)
+        # Sequence numbers are contiguous, so the offset into the ring buffer is direct
+        skip = after - oldest + 1
+        return [state.history[i] for i in range(skip, len(state.history))]
+
+    def last_sequence(self, topic: str) -> int:
+        """Sequence number of the most recent event published to a topic"""
+        state = self._topics.get(topic)
+        return state.sequence if state else 0
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a subscriber from its topic"""
+        subscriber.close()
+
+    def _remove(self, subscriber: Subscriber) -> None:
+        state = self._topics.get(subscriber.topic)
+        if state is None:
+            return
+        state.discard(subscriber)
+        state.last_activity = time.time()
+        # Topics are kept once something was published to them, for replay and statistics
+        if not state.subscribers and not state.sequence:
+            del self._topics[subscriber.topic]
+
+    def publish(self, topic: str, event: Dict[str, Any]) -> int:
+        """
+        Publish an event to every subscriber of a topic.
+
+        Must be called from the thread running the event loop (tools registered
+        with FastMCP run there); use publish_threadsafe from other threads.
+
+        Returns:
+            Number of subscribers the event was queued for
+        """
+        state = self._topic(topic)
+        state.sequence += 1
+        state.published += 1
+        state.last_activity = time.time()
+        sequence = state.sequence
+        if self.log is not None:
+            self.log.append(topic, sequence, event)
+        if self.replay_capacity:
+            state.history.append((sequence, event))
+        if not state.subscribers:
+            return 0
+
+        delivered = 0
+        # candidates() returns a new list, so the disconnect policy can remove subscribers safely
+        for subscriber in state.candidates(event):
+            subscriber_filter = subscriber.filter
+            if subscriber_filter is not None and subscriber_filter.residual is not None \
+                    and not subscriber_filter.residual(event):
+                continue
+            if subscriber._deliver(sequence, event):
+                delivered += 1
+        state.delivered += delivered
+        return delivered
+
+    def publish_threadsafe(self, loop: asyncio.AbstractEventLoop, topic: str, event: Dict[str, Any]) -> None:
+        """Publish from a thread other than the one running the event loop"""
+        loop.call_soon_threadsafe(self.publish, topic, event)
+
+    def topics(self) -> List[str]:
+        """Topics that currently have subscribers or replay history"""
+        return list(self._topics)
+
+    def subscriber_count(self, topic: str) -> int:
+        state = self._topics.get(topic)
+        return len(state.subscribers) if state else 0
+
+    def stats(self, topic: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Snapshot of the counters of one topic, or of every topic keyed by name.
+
+        Reading the snapshot only copies counters (plus a pass over the topic's
+        subscribers for queue depths), so overview tools can call it freely.
+        """
+        if topic is None:
+            return {name: self.stats(name) for name in list(self._topics)}
+
+        state = self._topics.get(topic)
+        if state is None:
+            return {
+                "published": 0, "delivered": 0, "dropped": 0, "subscribers": 0,
+                "queue_depth": 0, "max_queue_depth": 0, "buffered": 0,
+                "last_sequence": 0, "last_activity": None,
+            }
+        depths = [subscriber.queue_depth for subscriber in state.subscribers]
+        return {
+            "published": state.published,
+            "delivered": state.delivered,
+            "dropped": state.dropped,
+            "subscribers": len(state.subscribers),
+            "queue_depth": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "buffered": len(state.history),
+            "last_sequence": state.sequence,
+            "last_activity": state.last_activity,
+        }
+
+    def close_topic(self, topic: str) -> None:
+        """Disconnect every subscriber of a topic"""
+        state = self._topics.get(topic)
+        if state is None:
+            return
+        for subscriber in tuple(state.subscribers):
+            subscriber.close()
+
+
+# Shared broker used by the subscription templates and server integrations
+default_broker = SubscriptionBroker()
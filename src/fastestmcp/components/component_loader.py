@@ -5,7 +5,10 @@ Similar to React components, allows importing and using reusable MCP components
 
 import importlib
 import inspect
-from typing import Dict, Any, List, Callable, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional, Iterable, Tuple
 from pathlib import Path
 
 
@@ -18,6 +21,9 @@ class ComponentLoader:
     def __init__(self, components_base_path: str = "fastestmcp.components"):
         self.components_base_path = components_base_path
         self.loaded_components: Dict[str, Any] = {}
+        self.import_times: Dict[str, float] = {}
+        self.worker_pools: Dict[str, Any] = {}
+        self._lock = threading.Lock()
 
     def load_component(self, component_type: str, component_name: str) -> Any:
         """
@@ -38,13 +44,87 @@ class ComponentLoader:
 
         try:
             if module_path not in self.loaded_components:
-                self.loaded_components[module_path] = importlib.import_module(module_path)
+                started = time.perf_counter()
+                module = importlib.import_module(module_path)
+                with self._lock:
+                    self.loaded_components.setdefault(module_path, module)
+                    self.import_times.setdefault(module_path, time.perf_counter() - started)
 
             return self.loaded_components[module_path]
 
         except ImportError as e:
             raise ImportError(f"Could not load component {component_type}.{component_name}: {e}")
 
+    def load_components(self, components: Iterable[Tuple[str, str]], parallel: bool = True,
+                        max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Load several independent components, optionally importing them concurrently.
+
+        Imports run on a thread pool so components that pull in heavy dependencies
+        overlap their load times instead of adding them together. Each component's
+        import time is recorded, and the slowest one is reported as the critical path
+        (the lower bound on startup time when every import runs in parallel).
+
+        Args:
+            components: Iterable of (component_type, component_name) pairs
+            parallel: Import on a thread pool (True) or one after another (False)
+            max_workers: Thread pool size, defaults to one thread per component
+
+        Returns:
+            Dictionary with loaded modules, per-component import times, failures,
+            the critical path and the wall-clock time spent
+
+        Example:
+            report = loader.load_components([("tools", "tool_template"),
+                                             ("resources", "resource_template")])
+            print(report["critical_path"])
+        """
+        components = list(dict.fromkeys(components))
+        loaded: Dict[str, Any] = {}
+        import_times: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+
+        def load(component: Tuple[str, str]) -> Tuple[str, Any, float, Optional[str]]:
+            key = f"{component[0]}.{component[1]}"
+            started = time.perf_counter()
+            try:
+                module = self.load_component(*component)
+                return key, module, time.perf_counter() - started, None
+            except ImportError as e:
+                return key, None, time.perf_counter() - started, str(e)
+
+        started = time.perf_counter()
+        if parallel and len(components) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers or len(components),
+                                    thread_name_prefix="component-import") as pool:
+                results = list(pool.map(load, components))
+        else:
+            results = [load(component) for component in components]
+        wall_time = time.perf_counter() - started
+
+        for key, module, elapsed, error in results:
+            import_times[key] = elapsed
+            if error is None:
+                loaded[key] = module
+            else:
+                errors[key] = error
+
+        critical_path = None
+        if import_times:
+            slowest = max(import_times, key=import_times.get)
+            critical_path = {"component": slowest, "seconds": import_times[slowest]}
+
+        return {
+            "success": not errors,
+            "parallel": parallel,
+            "components": loaded,
+            "errors": errors,
+            "import_times": import_times,
+            "critical_path": critical_path,
+            "serial_time": sum(import_times.values()),
+            "wall_time": wall_time,
+        }
+
     def get_component_functions(self, component_type: str, component_name: str,
                                function_prefix: Optional[str] = None) -> List[Callable]:
         """
@@ -103,7 +183,8 @@ class ComponentLoader:
         return None
 
     def create_component_instance(self, component_type: str, component_name: str,
-                                server_app: Any, count: int = 1, **kwargs) -> Dict[str, Any]:
+                                server_app: Any, count: int = 1, isolation: str = "inline",
+                                worker_options: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Create and register a component instance with a server.
 
@@ -112,6 +193,9 @@ class ComponentLoader:
             component_name: Name of the component
             server_app: The MCP server application instance
             count: Number of instances to create
+            isolation: "inline" runs the component inside the server process, "process"
+                hosts its tools in a pool of worker processes (see ComponentWorkerPool)
+            worker_options: Options for the worker pool (workers, memory_limit_mb, timeout, ...)
             **kwargs: Additional arguments for the register function
 
         Returns:
@@ -119,6 +203,8 @@ class ComponentLoader:
 
         Example:
             result = loader.create_component_instance("tools", "tool_template", server, count=2)
+            result = loader.create_component_instance("tools", "tool_template", server,
+                                                      isolation="process", worker_options={"workers": 4})
         """
         register_func = self.get_register_function(component_type, component_name)
 
@@ -128,7 +214,17 @@ class ComponentLoader:
                 "error": f"No register function found for {component_type}.{component_name}"
             }
 
+        if isolation not in ("inline", "process"):
+            return {
+                "success": False,
+                "error": f"Unknown isolation mode: {isolation}"
+            }
+
         try:
+            if isolation == "process":
+                return self._create_process_instance(component_type, component_name, register_func,
+                                                     server_app, count, worker_options or {}, **kwargs)
+
             # Call the register function with server and count
             register_func(server_app, count=count, **kwargs)
 
@@ -146,6 +242,44 @@ class ComponentLoader:
                 "error": f"Failed to register component: {str(e)}"
             }
 
+    def _create_process_instance(self, component_type: str, component_name: str, register_func: Callable,
+                                 server_app: Any, count: int, worker_options: Dict[str, Any],
+                                 **kwargs) -> Dict[str, Any]:
+        """Register a component whose tools run in a pool of worker processes"""
+        from .component_workers import ComponentWorkerPool, _ToolRecorder
+
+        module_path = f"{self.components_base_path}.{component_type}.{component_name}"
+
+        # Non-tool registrations go straight to the server; tools are captured
+        # so their proxies can reuse the original names and signatures
+        recorder = _ToolRecorder(server_app)
+        register_func(recorder, count=count, **kwargs)
+
+        pool = ComponentWorkerPool(module_path, register_func.__name__, count=count,
+                                   **worker_options, **kwargs)
+        registered = pool.register_proxies(server_app, recorder.tools)
+
+        previous = self.worker_pools.pop(module_path, None)
+        if previous is not None:
+            previous.shutdown()
+        self.worker_pools[module_path] = pool
+
+        return {
+            "success": True,
+            "component_type": component_type,
+            "component_name": component_name,
+            "count": count,
+            "isolation": "process",
+            "workers": len(pool.stats()["workers"]),
+            "registered_functions": len(registered)
+        }
+
+    def shutdown_workers(self) -> None:
+        """Stop every worker pool started by process-isolated components"""
+        for pool in self.worker_pools.values():
+            pool.shutdown()
+        self.worker_pools.clear()
+
     def list_available_components(self, component_type: Optional[str] = None) -> Dict[str, List[str]]:
         """
         List all available components by type.
@@ -247,6 +381,27 @@ def use_component(component_type: str, component_name: str) -> Any:
     return component_loader.load_component(component_type, component_name)
 
 
+def use_components(components: Iterable[Tuple[str, str]], parallel: bool = True,
+                   max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    React-like hook to load several components at once.
+    Convenience function that uses the global component loader.
+
+    Args:
+        components: Iterable of (component_type, component_name) pairs
+        parallel: Import components concurrently on a thread pool
+        max_workers: Thread pool size
+
+    Returns:
+        Load report with modules, import times and the critical path
+
+    Example:
+        report = use_components([("tools", "tool_template"), ("prompts", "prompt_template")])
+        tool_component = report["components"]["tools.tool_template"]
+    """
+    return component_loader.load_components(components, parallel=parallel, max_workers=max_workers)
+
+
 def register_component(component_type: str, component_name: str, server_app: Any,
                       count: int = 1, **kwargs) -> Dict[str, Any]:
     """
@@ -0,0 +1,345 @@
+"""
+Component Workers - Host component tools in a pool of worker processes
+Runs CPU-bound or crash-prone tools outside the server process for multi-core scaling and fault isolation
+"""
+
+import asyncio
+import functools
+import importlib
+import inspect
+import multiprocessing
+import pickle
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised when a worker process dies while handling a call"""
+
+
+class _ToolRecorder:
+    """
+    Stand-in server passed to a component's register function.
+    Captures every function registered with add_tool and forwards all other
+    registrations (resources, prompts, ...) to the wrapped server, if any.
+    """
+
+    def __init__(self, server_app: Any = None):
+        self._server_app = server_app
+        self.tools: Dict[str, Callable] = {}
+
+    def add_tool(self, fn: Callable, *args, **kwargs) -> None:
+        self.tools[kwargs.get("name") or fn.__name__] = fn
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if self._server_app is None:
+            return lambda *args, **kwargs: None
+        return getattr(self._server_app, name)
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Resident set size of the current process in MB, if it can be determined"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        import resource
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except (OSError, ImportError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return None
+
+
+def _worker_main(conn, module_path: str, register_name: str, count: int,
+                 register_kwargs: Dict[str, Any], memory_limit_mb: Optional[int]) -> None:
+    """Worker process entry point: load the component and serve tool calls over the pipe"""
+    if memory_limit_mb:
+        try:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+        except (ImportError, ValueError, OSError, AttributeError):
+            pass
+
+    recorder = _ToolRecorder()
+    module = importlib.import_module(module_path)
+    getattr(module, register_name)(recorder, count=count, **register_kwargs)
+    conn.send(("ready", sorted(recorder.tools)))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message is None:
+            break
+
+        tool_name, args, kwargs = message
+        try:
+            result = recorder.tools[tool_name](*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = asyncio.run(_await(result))
+            reply = ("ok", result)
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+
+        rss = _current_rss_mb() if memory_limit_mb else None
+        recycle = rss is not None and rss > memory_limit_mb
+        conn.send(reply + (recycle,))
+        if recycle:
+            break
+
+    conn.close()
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+class _Worker:
+    """Parent-side handle for one worker process"""
+
+    def __init__(self, pool: "ComponentWorkerPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.calls = 0
+        self.restarts = 0
+        self.process = None
+        self.conn = None
+        self.start()
+
+    def start(self) -> None:
+        parent_conn, child_conn = self.pool._context.Pipe()
+        self.process = self.pool._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.pool.module_path, self.pool.register_name, self.pool.count,
+                  self.pool.register_kwargs, self.pool.memory_limit_mb),
+            name=f"component-worker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        try:
+            if not self.conn.poll(self.pool.startup_timeout):
+                raise TimeoutError("worker did not start in time")
+            status, tools = self.conn.recv()
+        except (EOFError, OSError, TimeoutError) as e:
+            self.kill()
+            raise WorkerCrashedError(f"Worker {self.index} for {self.pool.module_path} failed to start: {e}")
+        self.tools = tools
+
+    def restart(self) -> None:
+        self.kill()
+        self.restarts += 1
+        self.start()
+
+    def kill(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+        if self.process is not None:
+            self.process.join(timeout=5)
+        if self.conn is not None:
+            self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=5)
+        self.kill()
+
+
+class ComponentWorkerPool:
+    """
+    Pool of worker processes hosting the tools of a single component.
+
+    Each worker imports the component and registers its tools locally; the server
+    process only keeps lightweight proxies that send calls over a pipe. Calls are
+    dispatched to whichever worker is idle, crashed workers are restarted
+    automatically, and workers exceeding the memory limit are recycled.
+
+    Example:
+        pool = ComponentWorkerPool("fastestmcp.components.tools.tool_template", workers=4)
+        result = pool.call("tool_1", "data")
+        pool.shutdown()
+    """
+
+    def __init__(self, module_path: str, register_name: str = "register_tools", count: int = 1,
+                 workers: int = 2, memory_limit_mb: Optional[int] = None, timeout: Optional[float] = None,
+                 startup_timeout: float = 30.0, start_method: str = "spawn", **register_kwargs):
+        """
+        Args:
+            module_path: Import path of the component module
+            register_name: Name of the register function in the component module
+            count: Number of instances passed to the register function
+            workers: Number of worker processes
+            memory_limit_mb: Per-worker memory limit; workers above it are recycled after a call
+            timeout: Per-call timeout in seconds; a worker that exceeds it is restarted
+            startup_timeout: Seconds to wait for a worker to load the component
+            start_method: multiprocessing start method ("spawn", "fork" or "forkserver")
+            **register_kwargs: Additional arguments for the register function
+        """
+        if start_method != "fork":
+            # Spawned workers receive their arguments pickled; fail here rather than in every worker
+            try:
+                pickle.dumps(register_kwargs)
+            except Exception as e:
+                raise TypeError(f"register_kwargs for {module_path} must be picklable: {e}") from e
+        self.module_path = module_path
+        self.register_name = register_name
+        self.count = count
+        self.register_kwargs = register_kwargs
+        self.memory_limit_mb = memory_limit_mb
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: List[_Worker] = [_Worker(self, i) for i in range(max(1, workers))]
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._executor = ThreadPoolExecutor(max_workers=len(self._workers),
+                                            thread_name_prefix="component-dispatch")
+        self._lock = threading.Lock()
+        self._retired = 0
+        self._closed = False
+
+    @property
+    def tool_names(self) -> List[str]:
+        """Names of the tools hosted by the workers"""
+        return list(self._workers[0].tools)
+
+    def call(self, tool_name: str, *args, **kwargs) -> Any:
+        """
+        Call a tool on the next idle worker, blocking until it answers.
+
+        Raises:
+            WorkerCrashedError: If the worker died during the call (it is restarted), or
+                no live worker is left because restarts kept failing
+            TimeoutError: If the call exceeded the pool timeout (the worker is restarted)
+            RuntimeError: If the tool raised an exception inside the worker
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool has been shut down")
+
+        worker = self._idle.get()
+        if worker is None:
+            # Sentinel left by the last worker that could not be restarted
+            self._idle.put(None)
+            raise WorkerCrashedError(f"No live workers left for {self.module_path}")
+        try:
+            if not worker.process.is_alive():
+                # Died while idle (e.g. killed externally), replace it before dispatching
+                self._restart(worker)
+            worker.calls += 1
+            try:
+                worker.conn.send((tool_name, args, kwargs))
+                answered = worker.conn.poll(self.timeout)
+                if answered:
+                    status, payload, recycle = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                self._restart(worker)
+                raise WorkerCrashedError(f"Worker {worker.index} crashed while running {tool_name}: {e}")
+
+            if not answered:
+                self._restart(worker)
+                raise TimeoutError(f"Tool {tool_name} timed out after {self.timeout}s")
+
+            if recycle:
+                self._restart(worker)
+            if status == "error":
+                raise RuntimeError(f"Tool {tool_name} failed in worker: {payload}")
+            return payload
+        finally:
+            self._release(worker)
+
+    def _restart(self, worker: _Worker, attempts: int = 2) -> None:
+        """Restart a worker, retrying once; raises WorkerCrashedError if it still fails to start"""
+        for attempt in range(attempts):
+            try:
+                worker.restart()
+                return
+            except WorkerCrashedError:
+                if attempt == attempts - 1:
+                    raise
+
+    def _release(self, worker: _Worker) -> None:
+        """Return a worker to the idle queue, or retire it if its process is not running"""
+        if worker.process is not None and worker.process.is_alive():
+            self._idle.put(worker)
+            return
+        with self._lock:
+            self._retired += 1
+            exhausted = self._retired >= len(self._workers)
+        if exhausted:
+            # Wake callers blocked on the queue instead of leaving them waiting forever
+            self._idle.put(None)
+
+    async def call_async(self, tool_name: str, *args, **kwargs) -> Any:
+        """Call a tool without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(self.call, tool_name, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-worker call and restart counters"""
+        return {
+            "module_path": self.module_path,
+            "workers": [
+                {
+                    "index": worker.index,
+                    "pid": worker.process.pid,
+                    "alive": worker.process.is_alive(),
+                    "calls": worker.calls,
+                    "restarts": worker.restarts,
+                }
+                for worker in self._workers
+            ],
+            "idle_workers": self._idle.qsize() - (1 if self._retired >= len(self._workers) else 0),
+            "retired_workers": self._retired,
+        }
+
+    def shutdown(self) -> None:
+        """Stop all worker processes"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        for worker in self._workers:
+            worker.stop()
+
+    def register_proxies(self, server_app: Any, originals: Dict[str, Callable]) -> List[str]:
+        """
+        Register async proxies for the hosted tools with a server.
+
+        The proxies copy name, docstring and signature from the original functions so
+        the server publishes the same tool schemas as an in-process registration.
+        """
+        registered = []
+        for name in self.tool_names:
+            original = originals.get(name)
+            proxy = _make_proxy(self, name, original)
+            server_app.add_tool(proxy)
+            registered.append(name)
+        return registered
+
+
+def _make_proxy(pool: ComponentWorkerPool, tool_name: str, original: Optional[Callable]) -> Callable:
+    async def proxy(*args, **kwargs):
+        return await pool.call_async(tool_name, *args, **kwargs)
+
+    if original is not None:
+        proxy = functools.wraps(original)(proxy)
+    proxy.__name__ = tool_name
+    return proxy
@@ -0,0 +1,266 @@
+"""
+Notification Dispatcher - Batched, coalesced delivery of MCP notifications
+Groups bursts of notifications per channel into batches flushed by size or a max-delay window
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from typing import Dict, Any, List, Callable, Optional, Set
+
+
+# Fields that change on every notification and are ignored when detecting duplicates
+VOLATILE_FIELDS = ("timestamp", "server_time")
+
+logger = logging.getLogger(__name__)
+
+
+def print_batch(channel: str, batch: Dict[str, Any]) -> None:
+    """Default sink: log one line per delivered batch"""
+    print(f"📢 Broadcasting {batch['count']} notification(s) on {channel}")
+
+
+class _Channel:
+    __slots__ = ("pending", "last_key", "timer", "timer_loop", "subscribers", "submitted", "deduplicated",
+                 "batches", "delivered", "dropped", "overflow", "in_flight", "max_batch_size", "last_activity")
+
+    def __init__(self):
+        self.pending: List[Dict[str, Any]] = []
+        self.last_key: Optional[tuple] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.timer_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.subscribers: List[Callable[[str, Dict[str, Any]], Any]] = []
+        self.submitted = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.overflow = 0
+        self.in_flight = 0
+        self.max_batch_size = 0
+        self.last_activity: Optional[float] = None
+
+
+class NotificationDispatcher:
+    """
+    Coalesces notifications per channel into batches.
+
+    A batch is flushed as soon as it holds `max_batch_size` notifications or
+    `max_delay` seconds after its first notification, whichever comes first.
+    Identical consecutive payloads (ignoring timestamps) are collapsed into one
+    entry with a `repeat_count`, so an alert storm becomes a handful of messages.
+
+    Batches go to the sink and to every callback subscribed to the channel.
+    With `max_in_flight`, a channel whose async deliveries have not finished
+    sheds new batches instead of queueing them (counted as `overflow`); failed
+    and shed deliveries are counted as `dropped`.
+
+    Example:
+        dispatcher = NotificationDispatcher(sink=send_to_client, max_batch_size=100, max_delay=0.05)
+        dispatcher.submit("alerts", {"message": "disk full", "priority": "high"})
+    """
+
+    def __init__(self, sink: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+                 max_batch_size: int = 50, max_delay: float = 0.05, dedupe: bool = True,
+                 max_in_flight: Optional[int] = None):
+        """
+        Args:
+            sink: Called with (channel, batch) for every flushed batch; may be async
+            max_batch_size: Flush a channel once it holds this many notifications
+            max_delay: Maximum seconds a notification waits before its batch is flushed
+            dedupe: Collapse identical consecutive payloads
+            max_in_flight: Maximum unfinished async deliveries per channel (None = unbounded)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+        self.sink = sink or print_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.dedupe = dedupe
+        self.max_in_flight = max_in_flight
+        self._channels: Dict[str, _Channel] = {}
+        # Deliveries of async sinks still in flight (held so they are not garbage-collected)
+        self._tasks: Set[asyncio.Future] = set()
+
+    @staticmethod
+    def _payload_key(notification: Dict[str, Any]) -> tuple:
+        return tuple(sorted(
+            (k, repr(v)) for k, v in notification.items() if k not in VOLATILE_FIELDS
+        ))
+
+    def _channel(self, channel: str) -> _Channel:
+        state = self._channels.get(channel)
+        if state is None:
+            state = self._channels[channel] = _Channel()
+        return state
+
+    def subscribe(self, channel: str, callback: Callable[[str, Dict[str, Any]], Any]) -> Callable[[], None]:
+        """
+        Also deliver a channel's batches to `callback(channel, batch)` (may be async).
+
+        Returns:
+            A function that removes the subscription
+        """
+        state = self._channel(channel)
+        state.subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in state.subscribers:
+                state.subscribers.remove(callback)
+        return unsubscribe
+
+    def submit(self, channel: str, notification: Dict[str, Any]) -> None:
+        """
+        Queue a notification for delivery on a channel.
+
+        Outside a running event loop there is no delay timer, so batches are only
+        flushed when full or by an explicit flush().
+        """
+        state = self._channel(channel)
+        state.submitted += 1
+        state.last_activity = time.time()
+
+        if self.dedupe:
+            key = self._payload_key(notification)
+            if state.pending and key == state.last_key:
+                state.pending[-1]["repeat_count"] = state.pending[-1].get("repeat_count", 1) + 1
+                state.deduplicated += 1
+                return
+            state.last_key = key
+
+        state.pending.append(dict(notification))
+
+        if len(state.pending) >= self.max_batch_size:
+            self.flush(channel)
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if state.timer is not None and state.timer_loop is not loop:
+            # Armed on a loop that has since stopped or closed: it would never fire
+            state.timer.cancel()
+            state.timer = None
+        if state.timer is None:
+            state.timer = loop.call_later(self.max_delay, self.flush, channel)
+            state.timer_loop = loop
+
+    def flush(self, channel: Optional[str] = None) -> int:
+        """
+        Deliver pending notifications now.
+
+        Args:
+            channel: Channel to flush, or None for every channel
+
+        Returns:
+            Number of batches delivered
+        """
+        channels = [channel] if channel is not None else list(self._channels)
+        flushed = 0
+        for name in channels:
+            state = self._channels.get(name)
+            if state is None:
+                continue
+            if state.timer is not None:
+                state.timer.cancel()
+                state.timer = state.timer_loop = None
+            if not state.pending:
+                continue
+
+            notifications, state.pending = state.pending, []
+            state.last_key = None
+            state.batches += 1
+            state.delivered += len(notifications)
+            state.max_batch_size = max(state.max_batch_size, len(notifications))
+
+            batch = {
+                "type": "notification_batch",
+                "channel": name,
+                "count": len(notifications),
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
+                "notifications": notifications,
+            }
+            for sink in [self.sink, *state.subscribers]:
+                self._deliver(state, sink, name, batch)
+            flushed += 1
+        return flushed
+
+    def _deliver(self, state: _Channel, sink: Callable[[str, Dict[str, Any]], Any],
+                 name: str, batch: Dict[str, Any]) -> None:
+        try:
+            result = sink(name, batch)
+        except Exception:
+            logger.exception("Notification sink failed")
+            state.dropped += batch["count"]
+            return
+        if not inspect.isawaitable(result):
+            return
+        if self.max_in_flight is not None and state.in_flight >= self.max_in_flight:
+            # The consumer is not keeping up: shed the batch rather than queue without bound
+            if inspect.iscoroutine(result):
+                result.close()
+            state.overflow += 1
+            state.dropped += batch["count"]
+            return
+        task = asyncio.ensure_future(result)
+        state.in_flight += 1
+        self._tasks.add(task)
+        task.add_done_callback(functools.partial(self._delivered, state, batch["count"]))
+
+    def _delivered(self, state: _Channel, count: int, task: asyncio.Future) -> None:
+        self._tasks.discard(task)
+        state.in_flight -= 1
+        if task.cancelled():
+            state.dropped += count
+        elif task.exception() is not None:
+            state.dropped += count
+            logger.error("Notification sink failed", exc_info=task.exception())
+
+    def pending_count(self, channel: str) -> int:
+        state = self._channels.get(channel)
+        return len(state.pending) if state else 0
+
+    def stats(self, channel: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Batching statistics for one channel, or per channel plus totals.
+
+        `messages_saved` is how many individual messages batching avoided, `dropped`
+        counts notifications whose delivery failed or was shed, `overflow` the shed
+        batches and `in_flight` the async deliveries not finished yet.
+        """
+        def channel_stats(state: _Channel) -> Dict[str, Any]:
+            return {
+                "submitted": state.submitted,
+                "deduplicated": state.deduplicated,
+                "delivered": state.delivered,
+                "pending": len(state.pending),
+                "in_flight": state.in_flight,
+                "dropped": state.dropped,
+                "overflow": state.overflow,
+                "subscribers": len(state.subscribers),
+                "batches": state.batches,
+                "avg_batch_size": state.delivered / state.batches if state.batches else 0.0,
+                "max_batch_size": state.max_batch_size,
+                "messages_saved": max(0, state.submitted - len(state.pending) - state.batches),
+                "last_activity": state.last_activity,
+            }
+
+        if channel is not None:
+            state = self._channels.get(channel)
+            return channel_stats(state if state is not None else _Channel())
+
+        channels = {name: channel_stats(state) for name, state in self._channels.items()}
+        totals = {key: sum(stats[key] for stats in channels.values())
+                  for key in ("submitted", "deduplicated", "delivered", "pending", "in_flight", "dropped",
+                              "overflow", "subscribers", "batches", "messages_saved")}
+        totals["avg_batch_size"] = totals["delivered"] / totals["batches"] if totals["batches"] else 0.0
+        totals["max_batch_size"] = max((stats["max_batch_size"] for stats in channels.values()), default=0)
+        return {"channels": channels, "totals": totals}
+
+
+# Shared dispatcher used by the notification templates
+default_dispatcher = NotificationDispatcher()
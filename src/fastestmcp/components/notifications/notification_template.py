@@ -3,25 +3,37 @@ Notification Component Template - Dynamic notification generation for MCP server
 """
 
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from fastestmcp.components.notification_dispatcher import NotificationDispatcher, default_dispatcher
 
-def register_notifications(server_app, count: int = 1) -> None:
+# Registered notification indices and the dispatcher each one delivers through
+_registered_notifications: Dict[int, Optional[NotificationDispatcher]] = {}
+
+
+def _format_time(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(timestamp))
+
+
+def register_notifications(server_app, count: int = 1, dispatcher: Optional[NotificationDispatcher] = None) -> None:
     """Register all notification subscriptions with the server - dynamically generated"""
     for i in range(count):
         # Generate unique notification subscription dynamically
-        notification_func = create_notification_function(i + 1)
+        notification_func = create_notification_function(i + 1, dispatcher)
         server_app.add_subscription(notification_func)
+        _registered_notifications[i + 1] = dispatcher
 
         # Generate unique notification checking tool dynamically
-        check_func = create_check_function(i + 1)
+        check_func = create_check_function(i + 1, dispatcher)
         server_app.add_tool(check_func)
 
     # Register overview tool
     server_app.add_tool(get_all_notifications)
 
 
-def create_notification_function(index: int):
+def create_notification_function(index: int, dispatcher: Optional[NotificationDispatcher] = None):
     """Create a unique notification function dynamically"""
     async def notification_function(message: str = "Default notification", priority: str = "info") -> Dict[str, Any]:
         """
@@ -50,10 +62,10 @@ def create_notification_function(index: int):
             }
         }
 
-        # Log the notification for debugging
-        print(f"📢 Broadcasting notification {index}: {message} (priority: {priority})")
+        # Bursts are coalesced per channel and delivered in batches by the dispatcher
+        (dispatcher or default_dispatcher).submit(f"notification_{index}", notification_data)
 
-        # TODO: Add custom notification delivery logic here
+        # TODO: Add custom notification delivery logic here (or pass a dispatcher with your own sink)
 
         return notification_data
 
@@ -63,7 +75,7 @@ def create_notification_function(index: int):
     return notification_function
 
 
-def create_check_function(index: int):
+def create_check_function(index: int, dispatcher: Optional[NotificationDispatcher] = None):
     """Create a unique notification check function dynamically"""
     def check_function() -> Dict[str, Any]:
         """
@@ -77,12 +89,19 @@ def create_check_function(index: int):
 
         TODO: Implement real status checks or metrics collection.
         """
+        stats = (dispatcher or default_dispatcher).stats(f"notification_{index}")
         return {
             "notification_id": f"notification_{index}",
             "type": "notification_status",
             "status": "active",
             "last_check": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
-            "pending_notifications": 0,
+            "pending_notifications": stats["pending"],
+            "notifications_sent": stats["submitted"],
+            "notifications_delivered": stats["delivered"],
+            "notifications_dropped": stats["dropped"],
+            "subscribers": stats["subscribers"],
+            "batches_delivered": stats["batches"],
+            "last_activity": _format_time(stats["last_activity"]),
             "category": f"category_{index}",
             "description": f"Notification subscription {index} status"
         }
@@ -97,12 +116,22 @@ def get_all_notifications() -> Dict[str, Any]:
     """
     Get comprehensive status of all notification subscriptions.
     """
-    # This would need to be updated to dynamically generate based on count
-    # For now, return a generic overview
+    notifications = []
+    for index, dispatcher in sorted(_registered_notifications.items()):
+        stats = (dispatcher or default_dispatcher).stats(f"notification_{index}")
+        notifications.append({
+            "id": f"notification_{index}",
+            "status": "active",
+            "type": "notification",
+            "category": f"category_{index}",
+            **stats,
+            "last_activity": _format_time(stats["last_activity"]),
+        })
+
     return {
         "type": "notifications_overview",
-        "total_notifications": "dynamic",
-        "active_notifications": "dynamic",
+        "total_notifications": len(notifications),
+        "active_notifications": sum(1 for n in notifications if n["submitted"]),
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
-        "notifications": []
+        "notifications": notifications
     }
\ No newline at end of file
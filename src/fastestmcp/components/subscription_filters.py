@@ -0,0 +1,153 @@
+"""
+Subscription Filters - A small filter language for subscription events, compiled once per subscription
+
+Syntax (clauses are combined with "," or "and", all must match):
+    priority=high                 field equality
+    metadata.source^=sensor.      string prefix
+    value>=10, value<20           comparisons
+    value=10..20                  inclusive range
+    status!=closed                inequality
+
+Fields are dotted paths into the event dict. Values that look like numbers are
+compared as numbers; wrap a value in quotes to force a string.
+"""
+
+import operator
+import re
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+
+MATCH_ALL = ("", "all", "*")
+
+_CLAUSE = re.compile(r"^\s*([A-Za-z_][\w.]*)\s*(\^=|>=|<=|!=|==|=|>|<)\s*(.*?)\s*$")
+_SEPARATOR = re.compile(r"\s*,\s*|\s+and\s+", re.IGNORECASE)
+_COMPARISONS = {">=": operator.ge, "<=": operator.le, ">": operator.gt, "<": operator.lt, "!=": operator.ne}
+_MISSING = object()
+
+
+def _parse_value(raw: str) -> Any:
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in "\"'":
+        return raw[1:-1]
+    for cast in (int, float):
+        try:
+            return cast(raw)
+        except ValueError:
+            pass
+    return raw
+
+
+def _getter(path: str) -> Callable[[Dict[str, Any]], Any]:
+    """Build a fast lookup for a dotted field path"""
+    keys = path.split(".")
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda event: event.get(key, _MISSING) if isinstance(event, dict) else _MISSING
+
+    def get(event: Dict[str, Any]) -> Any:
+        for key in keys:
+            if not isinstance(event, dict):
+                return _MISSING
+            event = event.get(key, _MISSING)
+            if event is _MISSING:
+                return _MISSING
+        return event
+    return get
+
+
+def _compile_clause(field: str, op: str, raw: str) -> Callable[[Dict[str, Any]], bool]:
+    get = _getter(field)
+
+    if op == "^=":
+        prefix = str(_parse_value(raw))
+        return lambda event: isinstance(value := get(event), str) and value.startswith(prefix)
+
+    if op in ("=", "==") and ".." in raw and not raw.startswith(("'", '"')):
+        low, high = (_parse_value(part.strip()) for part in raw.split("..", 1))
+
+        def in_range(event: Dict[str, Any]) -> bool:
+            value = get(event)
+            try:
+                return value is not _MISSING and low <= value <= high
+            except TypeError:
+                return False
+        return in_range
+
+    expected = _parse_value(raw)
+    if op in ("=", "=="):
+        return lambda event: get(event) == expected
+
+    compare = _COMPARISONS[op]
+
+    def compare_clause(event: Dict[str, Any]) -> bool:
+        value = get(event)
+        try:
+            return value is not _MISSING and compare(value, expected)
+        except TypeError:
+            return False
+    return compare_clause
+
+
+class SubscriptionFilter:
+    """
+    A compiled filter expression.
+
+    `index_key` is the first plain equality clause as (field, value), which the broker
+    uses to index subscribers; `residual` checks the remaining clauses and is None
+    when the index lookup alone decides the match.
+    """
+
+    __slots__ = ("expression", "index_key", "index_getter", "residual", "_predicates")
+
+    def __init__(self, expression: str, clauses: List[Tuple[str, str, str]]):
+        self.expression = expression
+        self.index_key: Optional[Tuple[str, Any]] = None
+        self.index_getter: Optional[Callable[[Dict[str, Any]], Any]] = None
+        self._predicates = [_compile_clause(*clause) for clause in clauses]
+
+        residual = list(self._predicates)
+        for position, (field, op, raw) in enumerate(clauses):
+            if op in ("=", "==") and ".." not in raw:
+                value = _parse_value(raw)
+                try:
+                    hash(value)
+                except TypeError:
+                    continue
+                self.index_key = (field, value)
+                self.index_getter = _getter(field)
+                del residual[position]
+                break
+        self.residual = _all(residual) if residual else None
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return all(predicate(event) for predicate in self._predicates)
+
+    def __repr__(self) -> str:
+        return f"SubscriptionFilter({self.expression!r})"
+
+
+def _all(predicates: List[Callable[[Dict[str, Any]], bool]]) -> Callable[[Dict[str, Any]], bool]:
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda event: all(predicate(event) for predicate in predicates)
+
+
+def compile_filter(expression: Optional[str]) -> Optional[SubscriptionFilter]:
+    """
+    Compile a filter expression.
+
+    Returns:
+        The compiled filter, or None for expressions that match everything ("", "all", "*")
+
+    Raises:
+        ValueError: If a clause cannot be parsed
+    """
+    if expression is None or expression.strip().lower() in MATCH_ALL:
+        return None
+
+    clauses = []
+    for part in _SEPARATOR.split(expression.strip()):
+        match = _CLAUSE.match(part)
+        if match is None or not match.group(3):
+            raise ValueError(f"Invalid filter clause: {part!r}")
+        clauses.append(match.groups())
+    return SubscriptionFilter(expression, clauses)
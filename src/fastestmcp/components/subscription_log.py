@@ -0,0 +1,283 @@
+"""
+Subscription Log - Durable, append-only, segmented event log per topic on local disk
+Lets subscribers replay history after a server restart and lets slow consumers catch up without growing RAM
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+
+# Record layout: payload length, CRC32 of the payload, sequence number, JSON payload
+_HEADER = struct.Struct("<IIQ")
+_SEGMENT_SUFFIX = ".log"
+
+
+def _segment_name(base_sequence: int) -> str:
+    return f"{base_sequence:020d}{_SEGMENT_SUFFIX}"
+
+
+def _scan(buffer, start: int = 0):
+    """Yield (offset, sequence, payload_start, payload_end) for every intact record in a buffer"""
+    offset = start
+    size = len(buffer)
+    while offset + _HEADER.size <= size:
+        length, crc, sequence = _HEADER.unpack_from(buffer, offset)
+        payload_start = offset + _HEADER.size
+        payload_end = payload_start + length
+        if payload_end > size or zlib.crc32(buffer[payload_start:payload_end]) != crc:
+            return
+        yield offset, sequence, payload_start, payload_end
+        offset = payload_end
+
+
+class _Segment:
+    __slots__ = ("path", "base_sequence", "last_sequence", "size", "created")
+
+    def __init__(self, path: str, base_sequence: int):
+        self.path = path
+        self.base_sequence = base_sequence
+        self.last_sequence = base_sequence - 1
+        self.size = 0
+        self.created = time.time()
+
+
+class _TopicLog:
+    """Segments of one topic; the last segment is the one being appended to"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.segments: List[_Segment] = []
+        self.bases: List[int] = []
+        self.writer = None
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    def _recover(self) -> None:
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(_SEGMENT_SUFFIX))
+        for name in names:
+            path = os.path.join(self.directory, name)
+            segment = _Segment(path, int(name[:-len(_SEGMENT_SUFFIX)]))
+            segment.created = os.path.getmtime(path)
+            segment.size = os.path.getsize(path)
+            self.segments.append(segment)
+            self.bases.append(segment.base_sequence)
+
+        # A segment is rolled at the sequence of its first record, so a closed segment ends
+        # just before the next one starts; only the active segment is scanned, to find its
+        # last sequence number and to cut off a record torn by a crash mid-write
+        for segment, following in zip(self.segments, self.segments[1:]):
+            if segment.size:
+                segment.last_sequence = following.base_sequence - 1
+        if self.segments:
+            active = self.segments[-1]
+            with open(active.path, "rb") as f:
+                data = f.read()
+            end = 0
+            for offset, sequence, payload_start, payload_end in _scan(data):
+                active.last_sequence = sequence
+                end = payload_end
+            if end < len(data):
+                with open(active.path, "r+b") as f:
+                    f.truncate(end)
+            active.size = end
+
+    @property
+    def first_sequence(self) -> Optional[int]:
+        for segment in self.segments:
+            if segment.last_sequence >= segment.base_sequence:
+                return segment.base_sequence
+        return None
+
+    @property
+    def last_sequence(self) -> int:
+        return self.segments[-1].last_sequence if self.segments else 0
+
+    def roll(self, base_sequence: int) -> _Segment:
+        self.close()
+        segment = _Segment(os.path.join(self.directory, _segment_name(base_sequence)), base_sequence)
+        self.segments.append(segment)
+        self.bases.append(base_sequence)
+        self.writer = open(segment.path, "ab")
+        return segment
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class SubscriptionLog:
+    """
+    Append-only event log with one directory of segment files per topic.
+
+    Each event is stored as a length/CRC-prefixed JSON record tagged with its
+    sequence number. Segments roll over when they exceed `segment_max_bytes` or
+    are older than `segment_max_age` seconds, and whole closed segments are
+    deleted once a topic exceeds `retention_bytes` or a segment is older than
+    `retention_seconds`. Retention is applied when a segment rolls over, so a
+    topic that stops receiving events keeps its segments until compact() is
+    called. Reads memory-map the segment files, so paging through history does
+    not copy whole segments into memory.
+
+    Example:
+        log = SubscriptionLog("/var/lib/mcp/subscriptions", segment_max_bytes=16 * 1024 * 1024)
+        broker = SubscriptionBroker(log=log)
+    """
+
+    def __init__(self, directory: str, segment_max_bytes: int = 16 * 1024 * 1024,
+                 segment_max_age: Optional[float] = None, retention_bytes: Optional[int] = None,
+                 retention_seconds: Optional[float] = None, fsync: bool = False):
+        """
+        Args:
+            directory: Root directory; each topic gets a subdirectory
+            segment_max_bytes: Start a new segment once the active one reaches this size
+            segment_max_age: Start a new segment once the active one is this many seconds old
+            retention_bytes: Delete the oldest segments once a topic's log exceeds this size
+            retention_seconds: Delete segments whose newest record is older than this
+            fsync: fsync after every append (durable across power loss, much slower)
+        """
+        if segment_max_bytes < 1:
+            raise ValueError("segment_max_bytes must be at least 1")
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+        self.fsync = fsync
+        self._topics: Dict[str, _TopicLog] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _topic(self, topic: str) -> _TopicLog:
+        state = self._topics.get(topic)
+        if state is None:
+            state = self._topics[topic] = _TopicLog(os.path.join(self.directory, quote(topic, safe="")))
+        return state
+
+    def topics(self) -> List[str]:
+        """Topics that have a log directory"""
+        return sorted(unquote(name) for name in os.listdir(self.directory)
+                      if os.path.isdir(os.path.join(self.directory, name)))
+
+    def append(self, topic: str, sequence: int, event: Dict[str, Any]) -> None:
+        """
+        Append an event to a topic's log.
+
+        Sequence numbers must increase; the broker assigns them.
+        """
+        state = self._topic(topic)
+        if sequence <= state.last_sequence:
+            raise ValueError(f"Sequence {sequence} is not after the last logged sequence {state.last_sequence}")
+
+        segment = state.segments[-1] if state.segments else None
+        now = time.time()
+        if segment is None or segment.size >= self.segment_max_bytes or \
+                (self.segment_max_age is not None and now - segment.created >= self.segment_max_age):
+            segment = state.roll(sequence)
+            self._apply_retention(state, now)
+        elif state.writer is None:
+            state.writer = open(segment.path, "ab")
+
+        payload = json.dumps(event, default=str, separators=(",", ":")).encode("utf-8")
+        state.writer.write(_HEADER.pack(len(payload), zlib.crc32(payload), sequence) + payload)
+        state.writer.flush()
+        if self.fsync:
+            os.fsync(state.writer.fileno())
+        segment.size += _HEADER.size + len(payload)
+        segment.last_sequence = sequence
+
+    def _apply_retention(self, state: _TopicLog, now: float) -> None:
+        """Delete closed segments that fall outside the retention limits"""
+        total = sum(segment.size for segment in state.segments)
+        while len(state.segments) > 1:
+            oldest = state.segments[0]
+            expired = self.retention_seconds is not None and \
+                now - os.path.getmtime(oldest.path) > self.retention_seconds
+            oversized = self.retention_bytes is not None and total > self.retention_bytes
+            if not (expired or oversized):
+                break
+            os.remove(oldest.path)
+            total -= oldest.size
+            del state.segments[0]
+            del state.bases[0]
+
+    def compact(self, topic: Optional[str] = None) -> int:
+        """
+        Apply the retention limits now, to one topic or every topic.
+
+        Call this periodically to trim topics that no longer receive events. The
+        active segment is always kept, so a topic's last sequence number survives.
+
+        Returns:
+            Number of segments deleted
+        """
+        removed = 0
+        now = time.time()
+        for name in [topic] if topic is not None else self.topics():
+            state = self._topic(name)
+            before = len(state.segments)
+            self._apply_retention(state, now)
+            removed += before - len(state.segments)
+        return removed
+
+    def read(self, topic: str, after: int = 0, limit: Optional[int] = None,
+             until: Optional[int] = None) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Read logged (sequence, event) pairs with a sequence number greater than `after`.
+
+        Args:
+            topic: Topic name
+            after: Return events after this sequence number
+            limit: Maximum number of events to return
+            until: Stop at this sequence number (inclusive)
+        """
+        state = self._topic(topic)
+        if not state.segments:
+            return []
+
+        events: List[Tuple[int, Dict[str, Any]]] = []
+        start = max(0, bisect_right(state.bases, after + 1) - 1)
+        for segment in state.segments[start:]:
+            if segment.last_sequence <= after or segment.size == 0:
+                continue
+            if until is not None and segment.base_sequence > until:
+                break
+            with open(segment.path, "rb") as f, \
+                    mmap.mmap(f.fileno(), segment.size, access=mmap.ACCESS_READ) as view:
+                for offset, sequence, payload_start, payload_end in _scan(view):
+                    if sequence <= after:
+                        continue
+                    if until is not None and sequence > until:
+                        return events
+                    events.append((sequence, json.loads(view[payload_start:payload_end])))
+                    if limit is not None and len(events) >= limit:
+                        return events
+        return events
+
+    def first_sequence(self, topic: str) -> Optional[int]:
+        """Oldest sequence number still retained for a topic, or None if its log is empty"""
+        return self._topic(topic).first_sequence
+
+    def last_sequence(self, topic: str) -> int:
+        """Newest sequence number logged for a topic (0 if none)"""
+        return self._topic(topic).last_sequence
+
+    def stats(self, topic: str) -> Dict[str, Any]:
+        state = self._topic(topic)
+        return {
+            "segments": len(state.segments),
+            "bytes": sum(segment.size for segment in state.segments),
+            "first_sequence": state.first_sequence,
+            "last_sequence": state.last_sequence,
+        }
+
+    def close(self) -> None:
+        """Close the active segment files"""
+        for state in self._topics.values():
+            state.close()
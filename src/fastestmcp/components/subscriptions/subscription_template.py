@@ -2,60 +2,122 @@
 Subscription Component Template - Dynamic subscription generation for MCP servers
 """
 
-import asyncio
 import time
-from typing import Dict, Any, AsyncGenerator
+from typing import Dict, Any, AsyncGenerator, Optional
 
+from fastestmcp.components.broker import SubscriptionBroker, default_broker
+from fastestmcp.components.subscription_log import SubscriptionLog
 
-def register_subscriptions(server_app, count: int = 1) -> None:
-    """Register all subscription handlers with the server - dynamically generated"""
+# Registered subscription indices and the broker each one publishes through
+_registered_subscriptions: Dict[int, Optional[SubscriptionBroker]] = {}
+
+
+def _format_time(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(timestamp))
+
+
+def register_subscriptions(server_app, count: int = 1, broker: Optional[SubscriptionBroker] = None,
+                           log_dir: Optional[str] = None) -> None:
+    """
+    Register all subscription handlers with the server - dynamically generated
+
+    Pass log_dir to keep a durable on-disk log of every published event, so clients
+    can resume from their last event_id even after the server restarts. Without a
+    broker, these subscriptions then get their own logging broker, so the shared
+    default_broker is left untouched.
+    """
+    if log_dir is not None:
+        if broker is None:
+            broker = SubscriptionBroker(log=SubscriptionLog(log_dir))
+        else:
+            broker.attach_log(SubscriptionLog(log_dir))
     for i in range(count):
         # Generate unique subscription dynamically
-        subscription_func = create_subscription_function(i + 1)
+        subscription_func = create_subscription_function(i + 1, broker)
         server_app.add_subscription(subscription_func)
+        _registered_subscriptions[i + 1] = broker
 
         # Generate unique management tool dynamically
-        manage_func = create_manage_function(i + 1)
+        manage_func = create_manage_function(i + 1, broker)
         server_app.add_tool(manage_func)
 
+        # Generate unique publish tool dynamically
+        publish_func = create_publish_function(i + 1, broker)
+        server_app.add_tool(publish_func)
+
     # Register overview tool
     server_app.add_tool(get_subscription_overview)
 
 
-def create_subscription_function(index: int):
+def publish_subscription_event(index: int, data: Dict[str, Any], event_type: Optional[str] = None,
+                               broker: Optional[SubscriptionBroker] = None) -> int:
+    """
+    Publish an event to the subscribers of a subscription. Call this from any tool that produces events.
+
+    Returns:
+        Number of subscribers the event was delivered to
+    """
+    broker = broker or _registered_subscriptions.get(index) or default_broker
+    return broker.publish(f"subscription_{index}", {
+        "event_type": event_type or f"type_{index}",
+        "payload": data,
+        "metadata": {
+            "source": f"subscription_{index}",
+            "priority": "normal"
+        }
+    })
+
+
+def parse_event_sequence(event_id: Optional[str]) -> Optional[int]:
+    """Extract the topic sequence number from an event_id such as "event_1_42" """
+    if not event_id:
+        return None
+    try:
+        return int(str(event_id).rsplit("_", 1)[-1])
+    except ValueError:
+        return None
+
+
+def create_subscription_function(index: int, broker: Optional[SubscriptionBroker] = None):
     """Create a unique subscription function dynamically"""
-    async def subscription_function(filter_criteria: str = "all") -> AsyncGenerator[Dict[str, Any], None]:
+    async def subscription_function(filter_criteria: str = "all",
+                                    last_event_id: Optional[str] = None) -> AsyncGenerator[Dict[str, Any], None]:
         """Dynamically generated subscription function"""
-        event_count = 0
-
-        while True:  # In real implementation, this would be event-driven
-            event_count += 1
-
-            event_data = {
-                "type": "subscription_event",
-                "subscription_id": f"subscription_{index}",
-                "event_id": f"event_{index}_{event_count}",
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
-                "server_time": time.time(),
-                "filter_criteria": filter_criteria,
-                "data": {
-                    "event_type": f"type_{index}",
-                    "sequence_number": event_count,
-                    "metadata": {
-                        "source": f"subscription_{index}",
-                        "priority": "normal"
-                    }
+        # filter_criteria is compiled once (e.g. "event_type=alert, payload.level>=3"); "all" matches everything.
+        # Reconnecting clients pass the last event_id they saw and get the buffered events after it
+        subscriber = (broker or default_broker).subscribe(
+            f"subscription_{index}",
+            resume_after=parse_event_sequence(last_event_id),
+            filter_expr=filter_criteria,
+        )
+
+        try:
+            if subscriber.missed:
+                # Part of the gap is no longer buffered: the client must rebuild its state
+                yield {
+                    "type": "subscription_resync",
+                    "subscription_id": f"subscription_{index}",
+                    "missed_events": subscriber.missed,
+                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
                 }
-            }
 
-            # Log the event for debugging
-            print(f"📡 Subscription {index} event {event_count}: {filter_criteria}")
-
-            yield event_data
-
-            # In real implementation, this would wait for actual events
-            # For demo purposes, we'll simulate periodic events
-            await asyncio.sleep(30)  # Wait 30 seconds between events
+            # Events arrive as soon as they are published; nothing polls while idle
+            async for event in subscriber:
+                sequence = subscriber.last_sequence
+
+                yield {
+                    "type": "subscription_event",
+                    "subscription_id": f"subscription_{index}",
+                    "event_id": f"event_{index}_{sequence}",
+                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
+                    "server_time": time.time(),
+                    "filter_criteria": filter_criteria,
+                    "data": {**event, "sequence_number": sequence}
+                }
+        finally:
+            subscriber.close()
 
     # Set function metadata
     subscription_function.__name__ = f"subscription_{index}"
@@ -64,17 +126,41 @@ def create_subscription_function(index: int):
     return subscription_function
 
 
-def create_manage_function(index: int):
+def create_publish_function(index: int, broker: Optional[SubscriptionBroker] = None):
+    """Create a unique publish tool dynamically"""
+    def publish_function(data: Dict[str, Any], event_type: str = f"type_{index}") -> Dict[str, Any]:
+        """Dynamically generated publish function"""
+        delivered = publish_subscription_event(index, data, event_type, broker)
+        return {
+            "subscription_id": f"subscription_{index}",
+            "status": "published",
+            "delivered_to": delivered,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
+        }
+
+    # Set function metadata
+    publish_function.__name__ = f"publish_subscription_{index}"
+    publish_function.__doc__ = f"Publish an event to subscription {index} subscribers"
+
+    return publish_function
+
+
+def create_manage_function(index: int, broker: Optional[SubscriptionBroker] = None):
     """Create a unique subscription management function dynamically"""
     def manage_function(action: str = "status", filter_criteria: str = "all") -> Dict[str, Any]:
         """Dynamically generated subscription management function"""
         if action == "status":
+            stats = (broker or default_broker).stats(f"subscription_{index}")
             return {
                 "subscription_id": f"subscription_{index}",
                 "status": "active",
                 "current_filter": filter_criteria,
-                "events_sent": 0,
-                "last_activity": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
+                "events_sent": stats["delivered"],
+                "events_published": stats["published"],
+                "events_dropped": stats["dropped"],
+                "subscribers": stats["subscribers"],
+                "queue_depth": stats["queue_depth"],
+                "last_activity": _format_time(stats["last_activity"]),
                 "description": f"Subscription {index} management status"
             }
         elif action == "update_filter":
@@ -105,12 +191,22 @@ def get_subscription_overview() -> Dict[str, Any]:
     """
     Get comprehensive overview of all subscriptions.
     """
-    # This would need to be updated to dynamically generate based on count
-    # For now, return a generic overview
+    subscriptions = []
+    for index, broker in sorted(_registered_subscriptions.items()):
+        stats = (broker or default_broker).stats(f"subscription_{index}")
+        subscriptions.append({
+            "id": f"subscription_{index}",
+            "status": "active" if stats["subscribers"] else "idle",
+            "type": "event_stream",
+            "description": f"Subscription {index} for event streaming",
+            **stats,
+            "last_activity": _format_time(stats["last_activity"]),
+        })
+
     return {
         "type": "subscriptions_overview",
-        "total_subscriptions": "dynamic",
-        "active_subscriptions": "dynamic",
+        "total_subscriptions": len(subscriptions),
+        "active_subscriptions": sum(1 for s in subscriptions if s["status"] == "active"),
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
-        "subscriptions": []
+        "subscriptions": subscriptions
     }
\ No newline at end of file
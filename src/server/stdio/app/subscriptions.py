@@ -30,3 +30,18 @@ def register_subscriptions(server):
                 "data": payload or {},
                 "timestamp": current_utc_timestamp(),
             }
+
+    @server.tool(
+        name="publish_demo_event",
+        description="Publish an event to every open demo_subscription stream."
+    )
+    def publish_demo_event(event: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Publish an event to demo_subscription subscribers as soon as it happens.
+        """
+        delivered = server.publish("demo_subscription", {
+            "event": event,
+            "data": data or {},
+            "timestamp": current_utc_timestamp(),
+        })
+        return {"event": event, "delivered_to": delivered}
@@ -1,5 +1,9 @@
 # Entrypoint for FastMCP server
+import os
+
 from mcp.server.fastmcp.server import FastMCP as BaseFastMCP
+from fastestmcp.components.broker import SubscriptionBroker
+from fastestmcp.components.subscription_log import SubscriptionLog
 
 from app.tools import register_tools
 from app.resources import register_resources
@@ -14,10 +18,14 @@ from app.schema import register_schema
 
 
 class FastMCP(BaseFastMCP):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, subscription_log_dir=None, **kwargs):
         super().__init__(*args, **kwargs)
         self._subscriptions = {}
         self._auth_providers = {}
+        # Published events are also written to disk when a log directory is configured,
+        # so streams can be resumed by event_id across server restarts
+        log_dir = subscription_log_dir or os.environ.get("FASTESTMCP_SUBSCRIPTION_LOG_DIR")
+        self.broker = SubscriptionBroker(log=SubscriptionLog(log_dir) if log_dir else None)
 
     def subscription(self, name=None, description=None):
         def decorator(fn):
@@ -29,6 +37,42 @@ class FastMCP(BaseFastMCP):
             return fn
         return decorator
 
+    def publish(self, name, event):
+        """
+        Publish an event to every active stream of a registered subscription.
+        Returns the number of subscribers the event was delivered to.
+        """
+        return self.broker.publish(name, event)
+
+    async def stream(self, name, payload=None, last_event_id=None, filter_expr=None,
+                     max_queue_size=None, policy=None):
+        """
+        Stream a subscription: the events produced by its handler, followed by
+        every event published to it until the stream is closed.
+
+        Published events carry an integer "event_id". A reconnecting client passes
+        the last one it received as last_event_id to replay what it missed instead
+        of starting over from the handler. filter_expr (e.g. "data.level>=3")
+        restricts which published events are delivered.
+        """
+        subscriber = self.broker.subscribe(name, max_queue_size=max_queue_size, policy=policy,
+                                           resume_after=last_event_id, filter_expr=filter_expr)
+        try:
+            if last_event_id is None:
+                handler = self._subscriptions[name]["handler"]
+                initial = handler(payload)
+                if hasattr(initial, "__aiter__"):
+                    async for event in initial:
+                        yield event
+                elif initial is not None:
+                    yield initial
+            elif subscriber.missed:
+                yield {"event": "resync_required", "missed_events": subscriber.missed}
+            async for event in subscriber:
+                yield {**event, "event_id": subscriber.last_sequence}
+        finally:
+            subscriber.close()
+
     def auth_provider(self, name=None, description=None):
         def decorator(fn):
             reg_name = name or fn.__name__
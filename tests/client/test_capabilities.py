@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from client.app.capabilities import CapabilityCache
+
+
+class CountingServer:
+    def __init__(self):
+        self.calls = {"tools": 0, "resources": 0, "prompts": 0}
+        self.tools = ["tool1"]
+    async def _list(self, kind, items):
+        self.calls[kind] += 1
+        await asyncio.sleep(0.01)
+        return list(items)
+    async def list_tools(self):
+        return await self._list("tools", self.tools)
+    async def list_resources(self):
+        return await self._list("resources", ["res1"])
+    async def list_prompts(self):
+        return await self._list("prompts", ["prompt1"])
+
+
+class ToolListChangedNotification:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_fetches_concurrently_once_and_serves_from_cache():
+    server = CountingServer()
+    cache = CapabilityCache(server)
+    first, second = await asyncio.gather(cache.get(), cache.get())
+    assert first == second == {"tools": ["tool1"], "resources": ["res1"], "prompts": ["prompt1"], "version": 1}
+    await cache.list("tools")
+    assert server.calls == {"tools": 1, "resources": 1, "prompts": 1}
+    assert cache.stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_list_changed_notification_refetches_only_that_list():
+    server = CountingServer()
+    cache = CapabilityCache(server)
+    await cache.get()
+    server.tools = ["tool1", "tool2"]
+    await cache.handle_message(ToolListChangedNotification())
+    caps = await cache.get()
+    assert caps["tools"] == ["tool1", "tool2"] and caps["version"] == 2
+    assert server.calls == {"tools": 2, "resources": 1, "prompts": 1}
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_keeps_version_when_unchanged():
+    server = CountingServer()
+    cache = CapabilityCache(server, ttl=0)
+    await cache.get()
+    assert (await cache.get())["version"] == 1
+    assert server.calls["tools"] == 2
+
+
+@pytest.mark.asyncio
+async def test_save_and_load_warm_start(tmp_path):
+    path = str(tmp_path / "capabilities.json")
+    cache = CapabilityCache(CountingServer(), path=path)
+    await cache.get()
+    cache.save()
+
+    server = CountingServer()
+    warm = CapabilityCache(server, path=path)
+    assert warm.load()
+    assert (await warm.get())["tools"] == ["tool1"]
+    assert server.calls["tools"] == 0
+
+
+class NoPromptsServer(CountingServer):
+    def __init__(self):
+        super().__init__()
+        self.fail_tools = False
+    async def list_tools(self):
+        if self.fail_tools:
+            self.calls["tools"] += 1
+            raise ConnectionError("tools unavailable")
+        return await super().list_tools()
+    async def list_prompts(self):
+        self.calls["prompts"] += 1
+        raise NotImplementedError("prompts/list")
+
+
+@pytest.mark.asyncio
+async def test_failing_kind_does_not_break_the_others():
+    server = NoPromptsServer()
+    cache = CapabilityCache(server)
+    caps = await cache.get()
+    assert caps["tools"] == ["tool1"] and caps["prompts"] == []
+    assert await cache.list("resources") == ["res1"]
+    with pytest.raises(NotImplementedError):
+        await cache.list("prompts")
+    # The failure is cached until the TTL like a successful fetch
+    assert server.calls["prompts"] == 1
+    assert isinstance(cache.errors["prompts"], NotImplementedError)
+
+
+@pytest.mark.asyncio
+async def test_failed_refetch_keeps_invalidation_and_previous_list():
+    server = NoPromptsServer()
+    cache = CapabilityCache(server)
+    await cache.get()
+    server.fail_tools = True
+    server.tools = ["tool1", "tool2"]
+    cache.invalidate("tools")
+    assert await cache.list("tools") == ["tool1"]
+    server.fail_tools = False
+    assert await cache.list("tools") == ["tool1", "tool2"]
+    assert "tools" not in cache.errors
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_wait_for_the_kinds_they_need():
+    server = CountingServer()
+    cache = CapabilityCache(server)
+    tools, caps = await asyncio.gather(cache.list("tools"), cache.get())
+    assert tools == ["tool1"] and caps["prompts"] == ["prompt1"]
+    assert server.calls == {"tools": 1, "resources": 1, "prompts": 1}
@@ -0,0 +1,55 @@
+import json
+
+from client.app.capability_encoder import CapabilityEncoder, estimate_tokens
+
+PAGE = {"$ref": "#/$defs/Page"}
+DEFS = {"Page": {"title": "Page", "type": "object", "properties": {"offset": {"type": "integer"}, "limit": {"type": "integer"}}}}
+
+
+def tool(name, description, **properties):
+    return {"name": name, "description": description,
+            "inputSchema": {"type": "object", "properties": properties, "required": ["repo"], "$defs": DEFS}}
+
+
+CAPS = {
+    "tools": [
+        tool("list_issues", "List issues in a repository.\n\nLong details " + "blah " * 200,
+             repo={"type": "string", "title": "Repo"}, page=PAGE),
+        tool("list_pulls", "List pull requests in a repository.", repo={"type": "string"}, page=PAGE),
+        tool("get_weather", "Current weather for a city.", repo={"type": "string"}),
+    ],
+    "prompts": [{"name": "summarize", "description": "Summarize text", "arguments": [{"name": "text", "required": True}]}],
+    "resources": ["file"],
+}
+
+
+def test_encoding_dedupes_schema_fragments_and_truncates_descriptions():
+    encoded = json.loads(CapabilityEncoder(description_tokens=10).encode(CAPS))
+    issues, pulls, weather = encoded["tools"]
+    assert issues["params"] == {"repo": "string", "page?": "#1"} and pulls["params"]["page?"] == "#1"
+    assert encoded["defs"] == {"#1": {"type": "object", "properties": {"offset": {"type": "integer"},
+                                                                       "limit": {"type": "integer"}}}}
+    assert issues["description"] == "List issues in a repository."
+    assert encoded["prompts"] == [{"name": "summarize", "description": "Summarize text", "args": ["text"]}]
+    assert encoded["resources"] == ["file"]
+
+
+def test_query_ranking_and_budget():
+    encoder = CapabilityEncoder()
+    ranked = json.loads(encoder.encode(CAPS, query="weather in Paris"))
+    assert ranked["tools"][0]["name"] == "get_weather"
+    tight = encoder.encode(CAPS, query="pull requests", budget=60)
+    assert estimate_tokens(tight) <= 60
+    tight = json.loads(tight)
+    first = tight["tools"][0]
+    assert (first if isinstance(first, str) else first["name"]) == "list_pulls"
+    assert sum(len(tight[kind]) for kind in ("tools", "prompts", "resources")) + sum(tight.get("omitted", {}).values()) == 5
+
+
+def test_encodings_are_cached_by_version():
+    encoder = CapabilityEncoder()
+    first = encoder.encode(CAPS, query="issues", version=1)
+    assert encoder.encode(CAPS, query="Issues", version=1) is first
+    assert encoder.stats == {"hits": 1, "misses": 1}
+    encoder.encode({**CAPS, "tools": CAPS["tools"][:1]}, query="issues", version=2)
+    assert encoder.stats["misses"] == 2
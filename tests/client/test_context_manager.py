@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from client.app.context_manager import ContextManager, compile_plan
+
+STRUCTURE = """
+- user_id
+- input
+- metadata:
+    - source
+    - details:
+        - level
+- tags
+"""
+
+
+@pytest.fixture
+def manager(tmp_path):
+    path = tmp_path / "context_structure.yaml"
+    path.write_text(STRUCTURE)
+    return ContextManager(str(path))
+
+
+def _message(i):
+    return {"user_id": i, "input": "hi", "noise": True, "tags": None,
+            "metadata": {"source": "cli", "extra": 1, "details": {"level": i % 3, "x": 0}}}
+
+
+def test_plan_is_flat_paths_in_output_order(manager):
+    assert manager.plan == [
+        (("user_id",), "value"), (("input",), "value"), (("metadata",), "object"),
+        (("metadata", "source"), "value"), (("metadata", "details"), "object"),
+        (("metadata", "details", "level"), "value"), (("tags",), "value"),
+    ]
+    assert compile_plan([{"a": []}]) == [(("a",), "object")]
+
+
+def test_format_message_matches_reference_projection(manager):
+    messages = [_message(1), {"user_id": 2, "metadata": "not a dict"}, {}, {"metadata": {"details": {}}}]
+    for message in messages:
+        assert manager.format_message(message) == manager._assemble(manager.structure, message)
+    assert manager.format_message(_message(4)) == {
+        "user_id": 4, "input": "hi", "metadata": {"source": "cli", "details": {"level": 1}}, "tags": None,
+    }
+
+
+def test_format_messages_formats_a_batch(manager):
+    messages = [_message(i) for i in range(1000)]
+    formatted = manager.format_messages(messages)
+    assert formatted == [manager._assemble(manager.structure, message) for message in messages]
+
+
+def test_non_string_keys_and_empty_objects():
+    manager = ContextManager.__new__(ContextManager)
+    manager.compile([{"a": []}, {("t", 1): ["x"]}, "z"])
+    assert manager.format_message({"z": 0, "a": {"b": 2}, ("t", 1): {"x": 3, "y": 4}}) == {
+        "a": {}, ("t", 1): {"x": 3}, "z": 0,
+    }
+
+
+@pytest.mark.benchmark
+def test_format_messages_throughput(manager):
+    messages = [_message(i) for i in range(100_000)]
+    start = time.perf_counter()
+    formatted = manager.format_messages(messages)
+    rate = len(messages) / (time.perf_counter() - start)
+    assert formatted[7] == manager.format_message(messages[7])
+    assert rate > 100_000
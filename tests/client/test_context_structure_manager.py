@@ -1,4 +1,5 @@
 import os
+import time
 from client.app.context_structure_manager import ContextStructureManager
 
 yaml_path = os.path.join(os.path.dirname(__file__), '../../src/client/context_structure.yaml')
@@ -15,6 +16,7 @@ def test_parse_and_add_field(tmp_path):
     mgr.add_field('test_field')
     updated = mgr.get_full_structure()
     assert 'test_field' in updated
+    mgr.flush()
     # Check that the field is in the uncategorized section
     with open(test_yaml) as f:
         content = f.read()
@@ -30,3 +32,56 @@ def test_multiple_fields(tmp_path):
     mgr.add_field('field2')
     struct = mgr.get_full_structure()
     assert 'field1' in struct and 'field2' in struct
+
+def test_additions_are_batched_into_one_atomic_write(tmp_path):
+    test_yaml = tmp_path / "context_structure.yaml"
+    with open(yaml_path) as f:
+        original = f.read()
+    test_yaml.write_text(original)
+    mgr = ContextStructureManager(str(test_yaml), debounce=None)
+    for i in range(500):
+        mgr.add_field(f'field{i}')
+    assert mgr.writes == 0 and test_yaml.read_text() == original
+    assert mgr.flush() and not mgr.flush()
+    assert mgr.writes == 1
+    reloaded = ContextStructureManager(str(test_yaml))
+    assert reloaded.get_full_structure() == mgr.get_full_structure()
+    assert [p.name for p in tmp_path.iterdir()] == ["context_structure.yaml"]
+
+def test_debounced_flush(tmp_path):
+    test_yaml = tmp_path / "context_structure.yaml"
+    with open(yaml_path) as f:
+        test_yaml.write_text(f.read())
+    mgr = ContextStructureManager(str(test_yaml), debounce=0.05)
+    mgr.add_fields(['a', 'b'])
+    time.sleep(0.3)
+    assert mgr.writes == 1 and not mgr.dirty
+    assert '- b' in test_yaml.read_text()
+
+def test_external_edit_is_merged(tmp_path):
+    test_yaml = tmp_path / "context_structure.yaml"
+    test_yaml.write_text("# --- GENERATED START ---\n- user_id\n# --- GENERATED END ---\n")
+    mgr = ContextStructureManager(str(test_yaml), debounce=None)
+    mgr.add_field('mine')
+    time.sleep(0.01)
+    test_yaml.write_text("# --- GENERATED START ---\n- user_id\n- input\n# --- GENERATED END ---\n"
+                         "\n### uncategorized--chronological ###\n- theirs\n")
+    mgr.flush()
+    assert mgr.get_full_structure() == ['user_id', 'input', 'theirs', 'mine']
+    assert ContextStructureManager(str(test_yaml)).get_full_structure() == ['user_id', 'input', 'theirs', 'mine']
+
+def test_one_exit_hook_flushes_live_managers(tmp_path):
+    import gc
+    from client.app import context_structure_manager as module
+    test_yaml = tmp_path / "context_structure.yaml"
+    with open(yaml_path) as f:
+        test_yaml.write_text(f.read())
+    mgr = ContextStructureManager(str(test_yaml), debounce=None)
+    before = len(module._managers)
+    for _ in range(10):
+        ContextStructureManager(str(test_yaml), debounce=None)
+    gc.collect()
+    assert mgr in module._managers and len(module._managers) <= before
+    mgr.add_field('at_exit_field')
+    module._flush_all()
+    assert 'at_exit_field' in test_yaml.read_text()
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from fastmcp import Client, Context, FastMCP
+
+from client.app.elicitation import ElicitationClient, defaults_responder
+
+
+@pytest.mark.asyncio
+async def test_pending_requests_are_answered_out_of_order_and_time_out():
+    elicitation = ElicitationClient(None, timeout=0.05)
+    first = elicitation.submit({"type": "string"}, prompt="Name?")
+    second = elicitation.submit({"type": "string"}, prompt="City?", timeout=5)
+    assert [p["prompt"] for p in elicitation.pending()] == ["Name?", "City?"]
+    assert elicitation.respond(elicitation.pending()[1]["id"], "Paris")
+    assert await second == {"action": "accept", "content": "Paris"}
+    assert await first == {"action": "cancel", "content": None}
+    assert elicitation.pending() == [] and elicitation.stats == {"requests": 2, "answered": 1, "timed_out": 1}
+
+
+@pytest.mark.asyncio
+async def test_slow_responder_is_cancelled_when_the_request_times_out():
+    cancelled = asyncio.Event()
+
+    async def responder(request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    elicitation = ElicitationClient(None, responder=responder, timeout=0.05)
+    assert await elicitation.ask({"type": "string"}) == {"action": "cancel", "content": None}
+    await asyncio.wait_for(cancelled.wait(), 1)
+
+
+@pytest.mark.asyncio
+async def test_defaults_responder_policy():
+    elicitation = ElicitationClient(None, responder=defaults_responder)
+    schema = {"type": "object", "properties": {"units": {"type": "string", "default": "metric"}}}
+    assert await elicitation.ask(schema) == {"action": "accept", "content": {"units": "metric"}}
+    schema["required"] = ["city"]
+    assert (await elicitation.ask(schema))["action"] == "decline"
+
+
+@pytest.mark.asyncio
+async def test_server_elicitation_waits_without_blocking_other_sessions():
+    server = FastMCP("elicit")
+
+    @server.tool
+    async def book(ctx: Context) -> str:
+        result = await ctx.elicit("Which city?", response_type=str)
+        return f"{result.action}:{getattr(result, 'data', None)}"
+
+    @server.tool
+    def ping() -> str:
+        return "pong"
+
+    elicitation = ElicitationClient(None)
+    async with Client(server, elicitation_handler=elicitation.handle) as waiting, Client(server) as other:
+        booking = asyncio.ensure_future(waiting.call_tool("book", {}))
+        while not elicitation.pending():
+            await asyncio.sleep(0.01)
+        # Another session keeps working while the elicitation is parked
+        assert (await other.call_tool("ping", {})).data == "pong"
+        assert not booking.done()
+        elicitation.respond(elicitation.pending()[0]["id"], {"value": "Oslo"})
+        assert (await booking).data == "accept:Oslo"
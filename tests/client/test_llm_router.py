@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from client.app.llm_router import LLMRouter
 
@@ -104,3 +106,102 @@ async def test_route_json_string_invalid(router):
     msg = '{"unknown": "foo"}'
     with pytest.raises(ValueError):
         await router.route(msg)
+
+class TimedTools:
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.running = 0
+        self.peak = 0
+    async def call(self, name, **kwargs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        if name in self.fail:
+            raise RuntimeError(f"{name} failed")
+        return {"name": name, "args": kwargs}
+
+def _router_with(tools):
+    client = DummyClient()
+    client.tools = tools
+    return LLMRouter(client)
+
+@pytest.mark.asyncio
+async def test_route_batch_chains_references_sequentially(router):
+    msgs = [
+        {"id": "a", "tool": "foo", "args": {"x": 1}},
+        {"tool": "bar", "args": {"prev": "${a}", "label": "got ${a}"}},
+    ]
+    results = await router.route_batch(msgs)
+    assert results[1] == "tool:bar:{'prev': \"tool:foo:{'x': 1}\", 'label': \"got tool:foo:{'x': 1}\"}"
+
+@pytest.mark.asyncio
+async def test_stream_batch_runs_independent_steps_concurrently():
+    tools = TimedTools()
+    router = _router_with(tools)
+    msgs = [
+        {"id": "a", "tool": "a"},
+        {"id": "b", "tool": "b"},
+        {"id": "c", "tool": "c", "args": {"from_a": "${a.name}", "b_args": "${b.args}"}},
+    ]
+    outcomes = [o async for o in router.stream_batch(msgs, concurrency=4)]
+    assert [o["id"] for o in outcomes] == ["a", "b", "c"]
+    assert outcomes[2]["result"]["args"] == {"from_a": "a", "b_args": {}}
+    assert tools.peak == 2
+
+@pytest.mark.asyncio
+async def test_stream_batch_respects_concurrency_limit():
+    tools = TimedTools()
+    router = _router_with(tools)
+    results = await router.route_batch([{"tool": f"t{i}"} for i in range(6)], parallel=True, concurrency=2)
+    assert [r["name"] for r in results] == [f"t{i}" for i in range(6)]
+    assert tools.peak == 2
+
+@pytest.mark.asyncio
+async def test_stream_batch_cancels_dependents_on_failure():
+    router = _router_with(TimedTools(fail=("a",)))
+    msgs = [
+        {"id": "a", "tool": "a"},
+        {"id": "b", "tool": "b", "args": {"x": "${a}"}},
+        {"id": "c", "tool": "c", "depends_on": ["b"]},
+        {"id": "d", "tool": "d"},
+    ]
+    outcomes = {o["id"]: o["status"] async for o in router.stream_batch(msgs)}
+    assert outcomes == {"a": "error", "b": "cancelled", "c": "cancelled", "d": "ok"}
+    with pytest.raises(RuntimeError):
+        await router.route_batch(msgs, parallel=True)
+
+def test_plan_batch_rejects_cycles_and_unknown_dependencies():
+    from client.app.llm_router import plan_batch
+    with pytest.raises(ValueError):
+        plan_batch([{"id": "a", "tool": "x", "depends_on": ["b"]}, {"id": "b", "tool": "y", "args": {"v": "${a}"}}])
+    with pytest.raises(ValueError):
+        plan_batch([{"tool": "x", "depends_on": ["missing"]}])
+    assert plan_batch([{"tool": "x", "args": {"v": "${missing}"}}])[0][2] == set()
+
+@pytest.mark.asyncio
+async def test_route_batch_keeps_unknown_and_escaped_references(router):
+    msgs = [
+        {"id": "a", "tool": "foo"},
+        {"tool": "bar", "args": {"home": "${HOME}", "literal": "$${a}", "path": "${HOME}/${a}"}},
+    ]
+    results = await router.route_batch(msgs)
+    assert results[1] == "tool:bar:{'home': '${HOME}', 'literal': '${a}', 'path': '${HOME}/tool:foo:{}'}"
+
+@pytest.mark.asyncio
+async def test_route_batch_cancels_running_steps_on_error():
+    cancelled = []
+    class Tools:
+        async def call(self, name, **kwargs):
+            if name == "a":
+                raise RuntimeError("a failed")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+    router = _router_with(Tools())
+    with pytest.raises(RuntimeError):
+        await router.route_batch([{"id": "a", "tool": "a"}, {"id": "slow", "tool": "slow"}], parallel=True)
+    await asyncio.sleep(0)
+    assert cancelled == ["slow"]
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from client.app.logging import LoggingClient, LogShipper
+
+
+class Sink:
+    def __init__(self):
+        self.batches = []
+        self.down = False
+    async def __call__(self, batch):
+        if self.down:
+            raise ConnectionError("server unreachable")
+        self.batches.append([record["message"] for record in batch])
+
+
+@pytest.mark.asyncio
+async def test_log_returns_immediately_and_ships_in_batches():
+    calls = []
+
+    class SlowClient:
+        def log(self, message, level="info"):
+            time.sleep(0.01)
+            calls.append((level, message))
+
+    logging = LoggingClient(SlowClient())
+    logging.enable_buffering(batch_size=50, interval=0.05)
+    for i in range(200):
+        logging.log(f"m{i}", level="info")
+    await logging.close()
+    assert [message for _, message in calls] == [f"m{i}" for i in range(200)]
+
+
+@pytest.mark.asyncio
+async def test_shipping_a_slow_sync_client_does_not_block_the_loop():
+    class SlowClient:
+        def __init__(self):
+            self.logged = 0
+        def log(self, message, level="info"):
+            time.sleep(0.01)
+            self.logged += 1
+
+    client = SlowClient()
+    logging = LoggingClient(client)
+    logging.enable_buffering(batch_size=1000, interval=10)
+    for i in range(100):
+        logging.log(f"m{i}")
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    ticks = asyncio.create_task(ticker())
+    await logging.close()
+    ticks.cancel()
+    assert client.logged == 100
+    # Run on the loop, the 100 calls would stall it for about a second
+    assert gaps and max(gaps) < 0.25
+
+
+@pytest.mark.asyncio
+async def test_ring_bound_and_level_sampling():
+    sink = Sink()
+    shipper = LogShipper(sink, capacity=5, batch_size=100, interval=10, sample_rates={"debug": 0.25})
+    for i in range(8):
+        shipper.submit(f"d{i}", level="debug")
+    for i in range(6):
+        shipper.submit(f"e{i}", level="error")
+    await shipper.flush()
+    assert sink.batches == [["e1", "e2", "e3", "e4", "e5"]]
+    assert shipper.stats()["sampled_out"] == 6 and shipper.stats()["dropped"] == 3
+
+
+@pytest.mark.asyncio
+async def test_spill_while_unreachable_then_replay_in_order(tmp_path):
+    sink = Sink()
+    spill = tmp_path / "spill.jsonl"
+    shipper = LogShipper(sink, batch_size=2, interval=10, spill_path=str(spill)).start()
+    sink.down = True
+    for i in range(5):
+        shipper.submit(f"m{i}")
+    await shipper.flush()
+    assert [json.loads(line)["message"] for line in spill.read_text().splitlines()] == [f"m{i}" for i in range(5)]
+    sink.down = False
+    shipper.submit("m5")
+    await shipper.close()
+    assert [m for batch in sink.batches for m in batch] == [f"m{i}" for i in range(6)]
+    assert not spill.exists() and shipper.stats()["spilled"] == 5
+
+
+def test_shipper_from_sync_code_uses_background_thread():
+    shipped = []
+    shipper = LogShipper(shipped.extend, batch_size=10, interval=0.01).start()
+    for i in range(25):
+        shipper.submit(i)
+    asyncio.run(shipper.close())
+    assert [record["message"] for record in shipped] == list(range(25))
+
+
+@pytest.mark.asyncio
+async def test_replay_resumes_from_offset_without_rewriting(tmp_path):
+    sink = Sink()
+    spill = tmp_path / "spill.jsonl"
+    shipper = LogShipper(sink, batch_size=2, interval=10, spill_path=str(spill)).start()
+    sink.down = True
+    for i in range(4):
+        shipper.submit(f"m{i}")
+    await shipper.flush()
+    content = spill.read_bytes()
+
+    failures = 0
+    async def flaky(batch):
+        nonlocal failures
+        if sink.batches:
+            failures += 1
+            raise ConnectionError("down again")
+        await sink(batch)
+    sink.down = False
+    shipper.sink = flaky
+    await shipper.flush()
+    # The first batch shipped, the file was left as it was and the offset points past it
+    assert sink.batches == [["m0", "m1"]] and failures == 1
+    assert spill.read_bytes() == content
+    assert int((tmp_path / "spill.jsonl.offset").read_text()) == sum(map(len, content.splitlines(keepends=True)[:2]))
+    shipper.sink = sink
+    await shipper.close()
+    assert [m for batch in sink.batches for m in batch] == ["m0", "m1", "m2", "m3"]
+    assert not spill.exists() and not (tmp_path / "spill.jsonl.offset").exists()
+
+
+@pytest.mark.asyncio
+async def test_submit_after_close_is_spilled(tmp_path):
+    sink = Sink()
+    spill = tmp_path / "spill.jsonl"
+    shipper = LogShipper(sink, interval=10, spill_path=str(spill)).start()
+    await shipper.close()
+    assert shipper.submit("late") is False
+    assert [json.loads(line)["message"] for line in spill.read_text().splitlines()] == ["late"]
+
+
+def test_close_sync_stops_background_thread():
+    shipped = []
+    shipper = LogShipper(shipped.extend, batch_size=10, interval=10).start()
+    for i in range(25):
+        shipper.submit(i)
+    shipper.close_sync()
+    assert [record["message"] for record in shipped] == list(range(25))
+    assert not shipper._thread.is_alive()
+    shipper.submit("late")
+    assert shipper.stats()["dropped"] == 1
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+
+from client.app.metrics import ClientMetrics, InstrumentedClient, JsonlExporter, instrument_transport
+from client.client import MCPClient
+
+
+class RawClient:
+    """Mimics FastMCP: call_tool sends via call_tool_mcp, then decodes the response"""
+    async def call_tool_mcp(self, name, arguments):
+        await asyncio.sleep(0.03)
+        if name == "fail":
+            raise RuntimeError("boom")
+        return arguments
+    async def call_tool(self, name, arguments=None):
+        raw = await self.call_tool_mcp(name, arguments or {})
+        await asyncio.sleep(0.01)
+        return raw
+    async def list_tools(self):
+        return []
+
+
+@pytest.mark.asyncio
+async def test_request_phases_are_measured_per_operation_and_server(tmp_path):
+    metrics = ClientMetrics()
+    exporter = metrics.add_hook(JsonlExporter(str(tmp_path / "metrics.jsonl")))
+    client = InstrumentedClient(instrument_transport(RawClient(), "search"), metrics)
+    assert await client.call_tool("echo", {"n": 1}) == {"n": 1}
+    with pytest.raises(RuntimeError):
+        await client.call_tool("fail", {})
+    await client.list_tools()
+    exporter.close()
+
+    snapshot = metrics.snapshot()
+    calls = snapshot["operations"]["call_tool"]
+    assert (calls["requests"], calls["errors"]) == (2, 1)
+    assert calls["round_trip"]["p50_ms"] >= 25
+    assert calls["decode"]["max_ms"] >= 8 and calls["queue_wait"]["max_ms"] < 5
+    assert snapshot["servers"]["search"]["requests"] == 2
+    # list_tools has no raw hook on RawClient, so it is attributed to the default server
+    assert snapshot["servers"]["default"]["requests"] == 1
+
+    records = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text().splitlines()]
+    assert [(r["operation"], r["target"], r["ok"]) for r in records] == [
+        ("call_tool", "echo", True), ("call_tool", "fail", False), ("list_tools", None, True)]
+
+
+@pytest.mark.asyncio
+async def test_mcp_client_metrics(monkeypatch):
+    monkeypatch.setattr("client.client.FastMCPClient", lambda *args, **kwargs: RawClient())
+    client = MCPClient({"mcpServers": {"search": {"type": "dummy"}}})
+    await client.tools.call("echo", q="x")
+    assert client.metrics()["servers"]["search"]["requests"] == 1
+
+
+def test_one_exit_hook_closes_live_exporters(tmp_path):
+    import gc
+    from client.app import metrics as module
+    exporter = JsonlExporter(str(tmp_path / "metrics.jsonl"), flush_every=1000)
+    before = len(module._exporters)
+    for i in range(10):
+        JsonlExporter(str(tmp_path / f"discarded-{i}.jsonl")).close()
+    gc.collect()
+    assert exporter in module._exporters and len(module._exporters) <= before
+    exporter({"operation": "call_tool"})
+    module._close_all()
+    assert json.loads((tmp_path / "metrics.jsonl").read_text()) == {"operation": "call_tool"}
@@ -0,0 +1,66 @@
+import pytest
+
+from client.app.notifications import NotificationsClient
+
+
+def test_pop_peek_drain_in_priority_order():
+    notifications = NotificationsClient(None)
+    for message, priority in [("a", "low"), ("b", "critical"), ("c", "medium"), ("d", "critical")]:
+        notifications.add_notification(message, priority=priority)
+    assert notifications.peek() == "b"
+    assert notifications.get_notifications(max_count=3) == ["b", "d", "c"]
+    assert notifications.pop() == "b"
+    assert notifications.drain(max_count=2) == ["d", "c"]
+    assert len(notifications) == 1
+    assert notifications.drain() == ["a"]
+    assert notifications.pop() is None and notifications.peek() is None
+
+
+def test_capacity_evicts_lowest_priority_first():
+    notifications = NotificationsClient(None, max_size=3, capacity={"medium": 1})
+    notifications.add_notification("m1", priority="medium")
+    notifications.add_notification("m2", priority="medium")
+    assert notifications.get_notifications() == ["m2"]
+    notifications.add_notification("l1", priority="low")
+    notifications.add_notification("h1", priority="high")
+    notifications.add_notification("c1", priority="critical")
+    assert notifications.get_notifications() == ["c1", "h1", "m2"]
+    notifications.add_notification("l2", priority="low")
+    assert notifications.get_notifications() == ["c1", "h1", "m2"]
+    assert notifications.dropped == {"low": 2, "medium": 1, "high": 0, "critical": 0}
+
+
+def test_zero_max_size_drops_every_notification():
+    notifications = NotificationsClient(None, max_size=0)
+    notifications.add_notification("c1", priority="critical")
+    notifications.add_notification("l1")
+    assert len(notifications) == 0
+    assert notifications.dropped == {"low": 1, "medium": 0, "high": 0, "critical": 1}
+
+
+def test_clear_keeps_queue_usable():
+    notifications = NotificationsClient(None)
+    for i in range(10):
+        notifications.add_notification(i, priority=["low", "high"][i % 2])
+    notifications.clear_notifications("high")
+    notifications.add_notification("x", priority="critical")
+    assert notifications.pop() == "x"
+    assert notifications.drain() == [0, 2, 4, 6, 8]
+
+
+@pytest.mark.benchmark
+def test_benchmark_one_million_notifications():
+    notifications = NotificationsClient(None, max_size=1_000_000)
+    priorities = ["low", "medium", "high", "critical"]
+    for i in range(1_000_000):
+        notifications.add_notification(i, priority=priorities[i & 3])
+
+    for _ in range(10_000):
+        assert notifications.peek() == 3
+        notifications.get_notifications(max_count=10)
+
+    drained = []
+    while len(notifications):
+        drained.extend(notifications.drain(max_count=1000))
+    assert len(drained) == 1_000_000
+    assert drained[:3] == [3, 7, 11] and drained[-1] == 999_996
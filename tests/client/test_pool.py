@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from client.app.pool import ServerPool
+
+
+class FakeClient:
+    instances = []
+    def __init__(self, config):
+        (self.server, self.config), = config["mcpServers"].items()
+        self.connected = False
+        self.calls = 0
+        FakeClient.instances.append(self)
+    async def __aenter__(self):
+        if self.config.get("down"):
+            raise ConnectionError("refused")
+        self.connected = True
+        return self
+    async def __aexit__(self, *exc):
+        self.connected = False
+    def is_connected(self):
+        return self.connected
+    async def list_tools(self):
+        return self.config["tools"]
+    async def list_resources(self):
+        return []
+    async def list_prompts(self):
+        return []
+    async def call_tool(self, name, arguments):
+        self.calls += 1
+        if self.config.get("timeout"):
+            raise TimeoutError("no response in time")
+        if self.config.get("crash"):
+            self.connected = False
+            raise RuntimeError("session lost")
+        await asyncio.sleep(self.config.get("delay", 0.01))
+        return f"{self.server}:{name}"
+
+
+@pytest.fixture(autouse=True)
+def reset_instances():
+    FakeClient.instances = []
+
+
+@pytest.mark.asyncio
+async def test_routes_tool_calls_to_owning_server():
+    config = {"mcpServers": {"math": {"tools": ["add"]}, "text": {"tools": ["upper"]}}}
+    async with ServerPool(config, client_factory=FakeClient) as pool:
+        assert await pool.call_tool("add", {"a": 1}) == "math:add"
+        assert await pool.call_tool("upper") == "text:upper"
+        assert sorted(await pool.list_tools()) == ["add", "upper"]
+        with pytest.raises(KeyError):
+            await pool.call_tool("missing")
+
+
+@pytest.mark.asyncio
+async def test_least_in_flight_spreads_load_across_replicas():
+    config = {"mcpServers": {"worker": {"tools": ["work"], "replicas": 3}}}
+    async with ServerPool(config, client_factory=FakeClient) as pool:
+        await asyncio.gather(*(pool.call_tool("work") for _ in range(9)))
+        assert [stats["calls"] for stats in pool.stats().values()] == [3, 3, 3]
+
+
+@pytest.mark.asyncio
+async def test_latency_strategy_prefers_fast_replica():
+    config = {"mcpServers": {
+        "slow": {"tools": ["work"], "group": "worker", "delay": 0.05},
+        "fast": {"tools": ["work"], "group": "worker", "delay": 0.001},
+    }}
+    async with ServerPool(config, client_factory=FakeClient, strategy="latency") as pool:
+        for _ in range(10):
+            await pool.call_tool("work")
+        stats = pool.stats()
+        assert stats["fast"]["calls"] > stats["slow"]["calls"]
+
+
+@pytest.mark.asyncio
+async def test_failed_session_is_evicted_and_reconnected():
+    config = {"mcpServers": {"a": {"tools": ["work"], "group": "g", "crash": True},
+                             "b": {"tools": ["work"], "group": "g"},
+                             "down": {"tools": ["other"], "down": True}}}
+    async with ServerPool(config, client_factory=FakeClient, reconnect_delay=0.01) as pool:
+        assert not pool.stats()["down"]["healthy"]
+        results = []
+        for _ in range(2):
+            try:
+                results.append(await pool.call_tool("work"))
+            except RuntimeError:
+                pass
+        assert "b:work" in results
+        assert pool.stats()["a"]["errors"] == 1
+        await asyncio.sleep(0.05)
+        assert pool.stats()["a"]["healthy"] and pool.stats()["a"]["reconnects"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_out_call_keeps_its_session():
+    config = {"mcpServers": {"slow": {"tools": ["work"], "timeout": True}}}
+    async with ServerPool(config, client_factory=FakeClient, reconnect_delay=0.01) as pool:
+        for _ in range(3):
+            with pytest.raises(TimeoutError):
+                await pool.call_tool("work")
+        stats = pool.stats()["slow"]
+        assert stats["healthy"] and stats["reconnects"] == 0 and stats["errors"] == 3
+        assert len(FakeClient.instances) == 1
@@ -0,0 +1,55 @@
+import pytest
+from fastmcp import Client, FastMCP
+
+from client.client import MCPClient
+
+
+def make_server(renders):
+    server = FastMCP("prompts")
+
+    @server.prompt
+    def system(role: str) -> str:
+        renders.append(role)
+        return f"You are a {role}."
+
+    @server.tool
+    def legacy_prompt(topic: str) -> str:
+        return f"Write about {topic}."
+
+    return server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    renders = []
+    server = make_server(renders)
+    monkeypatch.setattr("client.client.FastMCPClient", lambda config, **kwargs: Client(server, **kwargs))
+    client = MCPClient({"mcpServers": {"prompts": {"type": "dummy"}}})
+    client.renders = renders
+    return client
+
+
+@pytest.mark.asyncio
+async def test_native_prompt_get_is_memoized(client):
+    async with client._client:
+        first = await client.prompts.render("system", role="planner")
+        again = await client.prompts.render("system", role="planner")
+        other = await client.prompts.render("system", role="critic")
+        assert first is again and first.messages[0].content.text == "You are a planner."
+        assert other.messages[0].content.text == "You are a critic."
+        assert client.renders == ["planner", "critic"]
+        assert client.prompts.stats == {"hits": 1, "misses": 2}
+        assert client.metrics()["operations"]["get_prompt"]["requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_new_capability_version_and_tool_fallback(client):
+    async with client._client:
+        await client.prompts.render("system", role="planner")
+        client.capabilities.invalidate()
+        client.capabilities.version += 1  # as if the server's prompt list had changed
+        await client.prompts.render("system", role="planner")
+        assert client.renders == ["planner", "planner"]
+        # Not listed as a prompt: rendered through the tool of the same name
+        result = await client.prompts.render("legacy_prompt", topic="MCP")
+        assert result.data == "Write about MCP."
@@ -0,0 +1,90 @@
+import base64
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+
+from client.app.resources import ResourcesClient
+
+
+class ResourceServer:
+    def __init__(self, data, version="1"):
+        self.data = data
+        self.version = version
+        self.reads = 0
+    async def list_resources(self):
+        return [SimpleNamespace(uri="repo://main.tar", meta={"version": self.version}),
+                SimpleNamespace(uri="notes://today", meta=None)]
+    async def read_resource(self, uri):
+        self.reads += 1
+        if uri == "notes://today":
+            return [SimpleNamespace(uri=uri, text="héllo " * 10, meta=None)]
+        return [SimpleNamespace(uri=uri, blob=base64.b64encode(self.data).decode(), meta=None)]
+
+
+@pytest.mark.asyncio
+async def test_stream_decodes_blobs_in_chunks():
+    data = bytes(range(256)) * 1000
+    resources = ResourcesClient(ResourceServer(data))
+    chunks = [chunk async for chunk in resources.stream("repo://main.tar", chunk_size=10_000)]
+    assert b"".join(chunks) == data
+    assert len(chunks) > 1 and max(len(c) for c in chunks) <= 10_000
+    text = b"".join([chunk async for chunk in resources.stream("notes://today", chunk_size=7)])
+    assert text.decode("utf-8") == "héllo " * 10
+
+
+@pytest.mark.asyncio
+async def test_download_is_served_from_cache_until_version_changes(tmp_path):
+    data = b"x" * 200_000
+    server = ResourceServer(data)
+    resources = ResourcesClient(server, cache_dir=str(tmp_path / "cache"))
+    first = await resources.download("repo://main.tar", str(tmp_path / "a.tar"))
+    second = await resources.download("repo://main.tar", str(tmp_path / "b.tar"))
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert server.reads == 1
+    assert (tmp_path / "b.tar").read_bytes() == data
+    assert second["sha256"] == hashlib.sha256(data).hexdigest()
+
+    # A fresh client reuses the on-disk cache
+    assert (await ResourcesClient(server, cache_dir=str(tmp_path / "cache")).download(
+        "repo://main.tar", str(tmp_path / "c.tar")))["cached"]
+
+    server.data, server.version = b"y" * 10, "2"
+    third = await resources.download("repo://main.tar", str(tmp_path / "a.tar"))
+    assert not third["cached"] and server.reads == 2
+    assert (tmp_path / "a.tar").read_bytes() == b"y" * 10
+
+
+class ResourceUpdatedNotification:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_resource_updated_notification_refreshes_cached_version(tmp_path):
+    from client.app.capabilities import CapabilityCache
+    server = ResourceServer(b"x" * 100)
+    capabilities = CapabilityCache(server)
+    resources = ResourcesClient(server, cache_dir=str(tmp_path / "cache"), capabilities=capabilities)
+    await resources.download("repo://main.tar", str(tmp_path / "a.tar"))
+    server.data, server.version = b"y" * 10, "2"
+    # Within the TTL the cached list still reports version 1
+    assert (await resources.download("repo://main.tar", str(tmp_path / "a.tar")))["cached"]
+    await capabilities.handle_message(ResourceUpdatedNotification())
+    assert not (await resources.download("repo://main.tar", str(tmp_path / "a.tar")))["cached"]
+    assert (tmp_path / "a.tar").read_bytes() == b"y" * 10
+
+
+@pytest.mark.asyncio
+async def test_unversioned_resources_are_not_cached_and_list_failures_are_tolerated(tmp_path):
+    server = ResourceServer(b"x" * 100)
+    resources = ResourcesClient(server, cache_dir=str(tmp_path / "cache"))
+    for _ in range(2):
+        assert not (await resources.download("notes://today", str(tmp_path / "n.txt")))["cached"]
+    assert resources.cache.entry("notes://today") is None
+
+    async def broken():
+        raise RuntimeError("Method not found")
+    server.list_resources = broken
+    assert await resources.version("repo://main.tar") is None
+    assert not (await resources.download("repo://main.tar", str(tmp_path / "a.tar")))["cached"]
+    assert (tmp_path / "a.tar").read_bytes() == b"x" * 100
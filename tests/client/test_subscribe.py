@@ -1,3 +1,9 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
 from client.app.subscribe import SubscriptionClient
 
 class DummyWrapper:
@@ -30,3 +36,123 @@ def test_subscribe_handle_stop():
     handle = sub.subscribe('any_topic')
     handle.stop()
     assert not handle._thread.is_alive()
+
+class AsyncWrapper:
+    def __init__(self):
+        self.started = 0
+    async def subscribe(self, topic, payload=None):
+        self.started += 1
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield {"topic": topic, "n": i}
+
+@pytest.mark.asyncio
+async def test_subscribe_async_multiplexes_topics_without_threads():
+    wrapper = AsyncWrapper()
+    sub = SubscriptionClient(type('Dummy', (), {"_client": wrapper})())
+    threads = threading.active_count()
+    handles = [await sub.subscribe_async(f"topic_{i}") for i in range(200)]
+    assert threading.active_count() == threads
+    received = [[msg async for msg in handle] for handle in handles]
+    assert all([m["n"] for m in msgs] == [0, 1, 2] for msgs in received)
+    assert received[7][0]["topic"] == "topic_7"
+    with pytest.raises(StopAsyncIteration):
+        await handles[0].get()
+
+@pytest.mark.asyncio
+async def test_subscribe_async_close_cancels_stream():
+    async def endless(topic, payload=None):
+        while True:
+            await asyncio.sleep(0.01)
+            yield {"topic": topic}
+    sub = SubscriptionClient(type('Dummy', (), {"_client": type('W', (), {"subscribe": staticmethod(endless)})()})())
+    handle = await sub.subscribe_async('ticks')
+    assert (await handle.get(timeout=1))["topic"] == "ticks"
+    await handle.close()
+    assert handle._task.cancelled()
+
+def test_sync_subscriptions_share_one_thread():
+    wrapper = AsyncWrapper()
+    sub = SubscriptionClient(type('Dummy', (), {"_client": wrapper})())
+    threads = threading.active_count()
+    handles = [sub.subscribe(f"topic_{i}") for i in range(50)]
+    assert threading.active_count() == threads + 1
+    assert [handles[3].get(timeout=1)["n"] for _ in range(3)] == [0, 1, 2]
+    for handle in handles:
+        handle.stop()
+    assert threading.active_count() == threads
+
+class BurstWrapper:
+    def __init__(self, count):
+        self.count = count
+        self.sent = 0
+    async def subscribe(self, topic, payload=None):
+        for i in range(self.count):
+            self.sent += 1
+            yield {"n": i}
+
+def _wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_get_many_returns_batches():
+    sub = SubscriptionClient(type('Dummy', (), {"_client": BurstWrapper(25)})())
+    handle = sub.subscribe('progress')
+    _wait_for(lambda: handle.stats()["received"] == 25)
+    assert [m["n"] for m in handle.get_many(max_items=10, timeout=1)] == list(range(10))
+    assert len(handle.get_many(max_items=100, timeout=1)) == 15
+    assert handle.get_many(timeout=0.05) == []
+    handle.stop()
+
+@pytest.mark.parametrize("policy, expected", [("drop_oldest", [7, 8, 9]), ("drop_newest", [0, 1, 2])])
+def test_drop_policies_bound_the_queue(policy, expected):
+    sub = SubscriptionClient(type('Dummy', (), {"_client": BurstWrapper(10)})())
+    handle = sub.subscribe('logs', max_queue_size=3, policy=policy)
+    _wait_for(lambda: handle.stats()["received"] == 10)
+    assert handle.dropped == 7
+    assert [m["n"] for m in handle.get_many(timeout=1)] == expected
+    handle.stop()
+
+def test_block_policy_applies_backpressure():
+    wrapper = BurstWrapper(10)
+    sub = SubscriptionClient(type('Dummy', (), {"_client": wrapper})())
+    handle = sub.subscribe('logs', max_queue_size=2, policy="block")
+    _wait_for(lambda: wrapper.sent >= 3)
+    time.sleep(0.05)
+    assert wrapper.sent == 3 and handle.stats()["queued"] == 2
+    received = []
+    while len(received) < 10:
+        received.extend(m["n"] for m in handle.get_many(max_items=4, timeout=1))
+    assert received == list(range(10)) and handle.dropped == 0
+    handle.stop()
+
+class IdleWrapper:
+    """Blocking generator sources: 'busy' yields continuously, every other topic waits for `release`"""
+    def __init__(self):
+        self.release = threading.Event()
+        self.closed = []
+    def subscribe(self, topic, payload=None):
+        try:
+            if topic == "busy":
+                for i in range(5):
+                    yield {"n": i}
+                return
+            self.release.wait()
+            yield {"topic": topic}
+        finally:
+            self.closed.append(topic)
+
+def test_idle_blocking_sources_do_not_starve_other_topics():
+    wrapper = IdleWrapper()
+    sub = SubscriptionClient(type('Dummy', (), {"_client": wrapper})())
+    idle = [sub.subscribe(f"idle_{i}") for i in range(8)]
+    busy = sub.subscribe("busy")
+    assert [busy.get(timeout=2)["n"] for _ in range(5)] == [0, 1, 2, 3, 4]
+    for handle in idle:
+        handle.stop()
+    busy.stop()
+    # Generators blocked in next() are closed as soon as they return
+    wrapper.release.set()
+    _wait_for(lambda: len(wrapper.closed) == 9)
+    assert sorted(wrapper.closed) == sorted(["busy"] + [f"idle_{i}" for i in range(8)])
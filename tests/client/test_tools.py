@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from client.app.tools import HedgePolicy, RetryPolicy, ToolsClient
+
+
+class PipelinedServer:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+    async def call_tool(self, name, args):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(args.get("delay", 0.02))
+        self.in_flight -= 1
+        if name == "fail":
+            raise RuntimeError("boom")
+        return args.get("n")
+
+
+@pytest.mark.asyncio
+async def test_call_many_pipelines_and_preserves_order():
+    server = PipelinedServer()
+    tools = ToolsClient(server)
+    start = time.perf_counter()
+    outcomes = await tools.call_many((("enrich", {"n": i}) for i in range(40)), concurrency=10)
+    elapsed = time.perf_counter() - start
+    assert [o["result"] for o in outcomes] == list(range(40))
+    assert server.peak == 10 and elapsed < 0.4
+    assert all(o["ok"] and o["elapsed"] > 0 for o in outcomes)
+
+
+@pytest.mark.asyncio
+async def test_call_many_as_completed_yields_fastest_first_and_reports_errors():
+    tools = ToolsClient(PipelinedServer())
+    calls = [{"tool": "slow", "args": {"n": 0, "delay": 0.1}}, ("fail", {"delay": 0.01}), ("fast", {"n": 2, "delay": 0.03})]
+    outcomes = [o async for o in tools.call_many_as_completed(calls, concurrency=3)]
+    assert [o["index"] for o in outcomes] == [1, 2, 0]
+    assert not outcomes[0]["ok"] and isinstance(outcomes[0]["error"], RuntimeError)
+
+
+class FlakyServer:
+    def __init__(self, failures=0, delays=None):
+        self.failures = failures
+        self.delays = list(delays or [])
+        self.calls = 0
+    async def call_tool(self, name, args):
+        self.calls += 1
+        await asyncio.sleep(self.delays.pop(0) if self.delays else 0.001)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("reset")
+        return self.calls
+
+
+@pytest.mark.asyncio
+async def test_retry_only_applies_to_idempotent_tools():
+    server = FlakyServer(failures=2)
+    tools = ToolsClient(server, retry=RetryPolicy(attempts=3, base_delay=0.001), idempotent={"lookup"})
+    assert await tools.call("lookup") == 3
+    assert tools.stats["retries"] == 2
+    server.failures = 1
+    with pytest.raises(ConnectionError):
+        await tools.call("charge_card")
+    assert server.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_hedge_after_p95_and_count_wins():
+    server = FlakyServer(delays=[0.01] * 20 + [0.5, 0.01])
+    tools = ToolsClient(server, hedge=HedgePolicy(min_samples=20), idempotent={"lookup"})
+    for _ in range(20):
+        await tools.call("lookup")
+    assert tools.stats["hedges_issued"] == 0 and tools.hedge_delay("lookup") >= 0.01
+    start = time.perf_counter()
+    assert await tools.call("lookup") == 22
+    assert time.perf_counter() - start < 0.2
+    assert tools.stats == {"retries": 0, "hedges_issued": 1, "hedges_won": 1}
+
+
+@pytest.mark.asyncio
+async def test_call_succeeds_when_the_tool_list_fails():
+    from client.app.capabilities import CapabilityCache
+
+    class NoListServer(FlakyServer):
+        async def list_tools(self):
+            raise RuntimeError("Method not found")
+
+    server = NoListServer(failures=1)
+    tools = ToolsClient(server, cache=CapabilityCache(server), retry=RetryPolicy(attempts=3, base_delay=0.001))
+    with pytest.raises(ConnectionError):
+        await tools.call("charge_card")
+    assert await tools.call("charge_card") == 2
+    assert not await tools.is_idempotent("charge_card") and tools.stats["retries"] == 0
@@ -0,0 +1,18 @@
+"""Tool component used by the worker pool tests"""
+
+import os
+import time
+
+
+def crash() -> str:
+    os._exit(1)
+
+
+def slow(seconds: float) -> str:
+    time.sleep(seconds)
+    return "done"
+
+
+def register_tools(server_app, count: int = 1) -> None:
+    server_app.add_tool(crash)
+    server_app.add_tool(slow)
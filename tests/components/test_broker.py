@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from fastestmcp.components.broker import SubscriptionBroker
+
+def test_publish_fans_out_to_all_subscribers():
+    async def run():
+        broker = SubscriptionBroker()
+        first, second = broker.subscribe("orders"), broker.subscribe("orders")
+        other = broker.subscribe("alerts")
+        assert broker.publish("orders", {"id": 1}) == 2
+        assert await first.get() == {"id": 1}
+        assert await second.get() == {"id": 1}
+        assert other.get_nowait() is None
+    asyncio.run(run())
+
+def test_waiting_subscriber_is_woken_by_publish():
+    async def run():
+        broker = SubscriptionBroker()
+        subscriber = broker.subscribe("orders")
+        waiter = asyncio.ensure_future(subscriber.get())
+        await asyncio.sleep(0)
+        broker.publish("orders", {"id": 7})
+        return await asyncio.wait_for(waiter, 1)
+    assert asyncio.run(run()) == {"id": 7}
+
+def test_slow_consumer_policies():
+    broker = SubscriptionBroker(max_queue_size=2)
+    oldest = broker.subscribe("t", policy="drop_oldest")
+    newest = broker.subscribe("t", policy="drop_newest")
+    disconnect = broker.subscribe("t", policy="disconnect")
+    for i in range(3):
+        broker.publish("t", {"n": i})
+    assert [oldest.get_nowait()["n"] for _ in range(2)] == [1, 2]
+    assert [newest.get_nowait()["n"] for _ in range(2)] == [0, 1]
+    assert disconnect.closed
+    assert broker.subscriber_count("t") == 2
+
+def test_closed_subscriber_stops_iteration():
+    async def run():
+        broker = SubscriptionBroker()
+        subscriber = broker.subscribe("t")
+        broker.publish("t", {"n": 1})
+        subscriber.close()
+        return [event async for event in subscriber]
+    assert asyncio.run(run()) == [{"n": 1}]
+
+def test_invalid_policy_rejected():
+    with pytest.raises(ValueError):
+        SubscriptionBroker(policy="block")
+
+def test_zero_subscriber_queue_size_rejected():
+    broker = SubscriptionBroker()
+    with pytest.raises(ValueError):
+        broker.subscribe("t", max_queue_size=0)
+
+def test_resume_replays_buffered_events():
+    broker = SubscriptionBroker(replay_capacity=10)
+    for i in range(5):
+        broker.publish("t", {"n": i})
+    subscriber = broker.subscribe("t", resume_after=3)
+    assert subscriber.replayed == 2 and subscriber.missed == 0
+    assert subscriber.get_nowait() == {"n": 3}
+    assert subscriber.last_sequence == 4
+    broker.publish("t", {"n": 5})
+    assert subscriber.get_nowait() == {"n": 4}
+    assert subscriber.get_nowait() == {"n": 5}
+    assert subscriber.last_sequence == 6
+
+def test_resume_reports_gap_beyond_ring_buffer():
+    broker = SubscriptionBroker(replay_capacity=3)
+    for i in range(10):
+        broker.publish("t", {"n": i})
+    subscriber = broker.subscribe("t", resume_after=2)
+    assert subscriber.replayed == 3
+    assert subscriber.missed == 5
+    assert [seq for seq, _ in broker.replay("t", 8)] == [9, 10]
+    assert broker.last_sequence("t") == 10
+
+def test_stats_snapshot_counts_published_delivered_dropped():
+    broker = SubscriptionBroker(max_queue_size=2)
+    subscriber = broker.subscribe("t")
+    broker.subscribe("t", filter_expr="kind=rare")
+    for i in range(3):
+        broker.publish("t", {"kind": "common", "n": i})
+    stats = broker.stats("t")
+    assert stats["published"] == 3 and stats["delivered"] == 3 and stats["dropped"] == 1
+    assert stats["subscribers"] == 2 and stats["queue_depth"] == 2 and stats["max_queue_depth"] == 2
+    assert stats["last_sequence"] == 3 and stats["last_activity"] is not None
+    assert subscriber.dropped == 1
+    assert broker.stats()["t"] == stats
+    assert broker.stats("unknown")["published"] == 0
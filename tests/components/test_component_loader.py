@@ -0,0 +1,29 @@
+from fastestmcp.components import ComponentLoader, use_components
+
+COMPONENTS = [
+    ("tools", "tool_template"),
+    ("resources", "resource_template"),
+    ("prompts", "prompt_template"),
+]
+
+def test_load_components_parallel_reports_import_times():
+    loader = ComponentLoader()
+    report = loader.load_components(COMPONENTS)
+    assert report["success"]
+    assert set(report["components"]) == {"tools.tool_template", "resources.resource_template", "prompts.prompt_template"}
+    assert set(report["import_times"]) == set(report["components"])
+    slowest = report["critical_path"]
+    assert slowest["seconds"] == max(report["import_times"].values())
+    assert report["serial_time"] >= slowest["seconds"]
+
+def test_load_components_serial_matches_parallel():
+    parallel = ComponentLoader().load_components(COMPONENTS)
+    serial = ComponentLoader().load_components(COMPONENTS, parallel=False)
+    assert serial["components"].keys() == parallel["components"].keys()
+    assert not serial["parallel"]
+
+def test_load_components_collects_errors():
+    report = use_components([("tools", "tool_template"), ("tools", "does_not_exist")])
+    assert not report["success"]
+    assert "tools.does_not_exist" in report["errors"]
+    assert "tools.tool_template" in report["components"]
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import signal
+
+import pytest
+
+from fastestmcp.components import ComponentLoader
+from fastestmcp.components.component_workers import ComponentWorkerPool, WorkerCrashedError
+
+TOOL_MODULE = "fastestmcp.components.tools.tool_template"
+
+class RecordingServer:
+    def __init__(self):
+        self.tools = {}
+    def add_tool(self, fn):
+        self.tools[fn.__name__] = fn
+
+@pytest.fixture
+def pool():
+    pool = ComponentWorkerPool(TOOL_MODULE, count=2, workers=2)
+    yield pool
+    pool.shutdown()
+
+def test_pool_hosts_component_tools(pool):
+    assert pool.tool_names == ["tool_1", "tool_2"]
+    assert pool.call("tool_1", "data").startswith("Tool 1 processed")
+
+def test_pool_restarts_crashed_worker(pool):
+    victim = pool._workers[0]
+    os.kill(victim.process.pid, signal.SIGKILL)
+    victim.process.join(timeout=5)
+    results = [pool.call("tool_2", "data") for _ in range(4)]
+    assert all(r.startswith("Tool 2 processed") for r in results)
+    assert victim.restarts == 1
+    assert all(w["alive"] for w in pool.stats()["workers"])
+
+def test_pool_reports_crash_during_call():
+    pool = ComponentWorkerPool("tests.components.crashing_tools", workers=1, timeout=0.5)
+    try:
+        with pytest.raises(WorkerCrashedError):
+            pool.call("crash")
+        with pytest.raises(TimeoutError):
+            pool.call("slow", 5)
+        assert pool.call("slow", 0) == "done"
+        assert pool.stats()["workers"][0]["restarts"] == 2
+    finally:
+        pool.shutdown()
+
+def test_pool_retires_worker_that_cannot_restart():
+    pool = ComponentWorkerPool(TOOL_MODULE, workers=1)
+    try:
+        victim = pool._workers[0]
+        pool.module_path = "tests.components.missing_module"
+        os.kill(victim.process.pid, signal.SIGKILL)
+        victim.process.join(timeout=5)
+        with pytest.raises(WorkerCrashedError, match="failed to start"):
+            pool.call("tool_1", "data")
+        assert victim.restarts == 2
+        # The dead worker is not handed out again; callers fail fast instead of blocking
+        with pytest.raises(WorkerCrashedError, match="No live workers"):
+            pool.call("tool_1", "data")
+        assert pool.stats()["retired_workers"] == 1
+    finally:
+        pool.shutdown()
+
+def test_pool_rejects_unpicklable_register_kwargs():
+    with pytest.raises(TypeError, match="picklable"):
+        ComponentWorkerPool(TOOL_MODULE, workers=1, callback=lambda: None)
+
+def test_create_component_instance_with_process_isolation():
+    loader = ComponentLoader()
+    server = RecordingServer()
+    result = loader.create_component_instance("tools", "tool_template", server, count=2,
+                                              isolation="process", worker_options={"workers": 1})
+    try:
+        assert result["success"] and result["isolation"] == "process"
+        assert set(server.tools) == {"tool_1", "tool_2"}
+        output = asyncio.run(server.tools["tool_2"](input_data="x"))
+        assert output.startswith("Tool 2 processed")
+    finally:
+        loader.shutdown_workers()
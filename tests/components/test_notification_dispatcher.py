@@ -0,0 +1,143 @@
+import asyncio
+
+from fastestmcp.components.notification_dispatcher import NotificationDispatcher
+from fastestmcp.components.notifications.notification_template import create_notification_function
+
+class Sink:
+    def __init__(self):
+        self.batches = []
+    def __call__(self, channel, batch):
+        self.batches.append((channel, batch))
+
+def test_flushes_by_size_per_channel():
+    sink = Sink()
+    dispatcher = NotificationDispatcher(sink=sink, max_batch_size=3)
+    for i in range(7):
+        dispatcher.submit("alerts", {"message": f"m{i}"})
+    dispatcher.submit("status", {"message": "ok"})
+    assert [batch["count"] for _, batch in sink.batches] == [3, 3]
+    assert dispatcher.pending_count("alerts") == 1
+    assert dispatcher.flush() == 2
+    assert sorted(channel for channel, _ in sink.batches[-2:]) == ["alerts", "status"]
+
+def test_dedupes_identical_consecutive_payloads():
+    sink = Sink()
+    dispatcher = NotificationDispatcher(sink=sink, max_batch_size=100)
+    for t in range(5):
+        dispatcher.submit("alerts", {"message": "disk full", "timestamp": t})
+    dispatcher.submit("alerts", {"message": "cpu hot"})
+    dispatcher.flush()
+    notifications = sink.batches[0][1]["notifications"]
+    assert [n["message"] for n in notifications] == ["disk full", "cpu hot"]
+    assert notifications[0]["repeat_count"] == 5
+    stats = dispatcher.stats("alerts")
+    assert stats["submitted"] == 6 and stats["deduplicated"] == 4 and stats["batches"] == 1
+    assert stats["messages_saved"] == 5
+
+def test_flushes_after_max_delay():
+    sink = Sink()
+    dispatcher = NotificationDispatcher(sink=sink, max_batch_size=100, max_delay=0.01)
+    async def run():
+        for i in range(10):
+            dispatcher.submit("alerts", {"message": f"m{i}"})
+        assert not sink.batches
+        await asyncio.sleep(0.05)
+    asyncio.run(run())
+    assert len(sink.batches) == 1 and sink.batches[0][1]["count"] == 10
+    assert dispatcher.stats()["totals"]["avg_batch_size"] == 10
+
+def test_notification_template_submits_to_dispatcher():
+    sink = Sink()
+    dispatcher = NotificationDispatcher(sink=sink, max_batch_size=2)
+    notify = create_notification_function(1, dispatcher)
+    asyncio.run(notify("first"))
+    result = asyncio.run(notify("second"))
+    assert result["message"] == "second"
+    assert sink.batches[0][0] == "notification_1"
+    assert sink.batches[0][1]["count"] == 2
+
+def test_notification_overview_reports_channel_counters():
+    from unittest.mock import Mock
+    from fastestmcp.components.notifications.notification_template import register_notifications, get_all_notifications
+
+    dispatcher = NotificationDispatcher(sink=Sink(), max_batch_size=10)
+    server = Mock()
+    register_notifications(server, count=1, dispatcher=dispatcher)
+    notify = server.add_subscription.call_args.args[0]
+    check = next(call.args[0] for call in server.add_tool.call_args_list
+                 if call.args[0].__name__ == "check_notification_1")
+
+    for message in ("a", "b", "c"):
+        asyncio.run(notify(message))
+    status = check()
+    assert status["pending_notifications"] == 3 and status["notifications_sent"] == 3
+
+    overview = get_all_notifications()
+    entry = next(n for n in overview["notifications"] if n["id"] == "notification_1")
+    assert entry["submitted"] == 3 and entry["pending"] == 3
+    assert isinstance(overview["total_notifications"], int)
+
+def test_async_sink_tasks_are_tracked_and_failures_logged(caplog):
+    delivered = []
+    async def sink(channel, batch):
+        await asyncio.sleep(0)
+        if batch["notifications"][0]["message"] == "boom":
+            raise RuntimeError("sink down")
+        delivered.append(batch["count"])
+    dispatcher = NotificationDispatcher(sink=sink, max_batch_size=1)
+    async def run():
+        dispatcher.submit("alerts", {"message": "ok"})
+        dispatcher.submit("alerts", {"message": "boom"})
+        assert len(dispatcher._tasks) == 2
+        await asyncio.sleep(0.01)
+    asyncio.run(run())
+    assert delivered == [1]
+    assert not dispatcher._tasks
+    assert "Notification sink failed" in caplog.text
+
+def test_timer_is_rearmed_on_a_new_loop():
+    sink = Sink()
+    dispatcher = NotificationDispatcher(sink=sink, max_batch_size=100, max_delay=0.01)
+    async def submit_and_leave():
+        dispatcher.submit("alerts", {"message": "first"})
+    asyncio.run(submit_and_leave())
+    async def run():
+        dispatcher.submit("alerts", {"message": "second"})
+        await asyncio.sleep(0.05)
+    asyncio.run(run())
+    assert [n["message"] for n in sink.batches[0][1]["notifications"]] == ["first", "second"]
+
+def test_subscribers_and_dropped_batches_are_counted():
+    sink = Sink()
+    extra = Sink()
+    def failing(channel, batch):
+        raise RuntimeError("consumer gone")
+    dispatcher = NotificationDispatcher(sink=sink, max_batch_size=2)
+    dispatcher.subscribe("alerts", extra)
+    unsubscribe = dispatcher.subscribe("alerts", failing)
+    assert dispatcher.stats("alerts")["subscribers"] == 2
+    dispatcher.submit("alerts", {"message": "a"})
+    dispatcher.submit("alerts", {"message": "b"})
+    assert len(sink.batches) == len(extra.batches) == 1
+    assert dispatcher.stats("alerts")["dropped"] == 2
+    unsubscribe()
+    stats = dispatcher.stats()
+    assert stats["channels"]["alerts"]["subscribers"] == 1
+    assert stats["totals"]["dropped"] == 2
+
+def test_max_in_flight_sheds_batches_of_a_slow_consumer():
+    release = None
+    async def slow(channel, batch):
+        await release.wait()
+    dispatcher = NotificationDispatcher(sink=slow, max_batch_size=1, max_in_flight=2)
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        for i in range(5):
+            dispatcher.submit("alerts", {"message": f"m{i}"})
+        stats = dispatcher.stats("alerts")
+        assert stats["in_flight"] == 2 and stats["overflow"] == 3 and stats["dropped"] == 3
+        release.set()
+        await asyncio.sleep(0.01)
+    asyncio.run(run())
+    assert dispatcher.stats("alerts")["in_flight"] == 0
@@ -0,0 +1,50 @@
+import pytest
+
+from fastestmcp.components.broker import SubscriptionBroker
+from fastestmcp.components.subscription_filters import compile_filter
+
+EVENT = {"event_type": "alert", "payload": {"level": 4, "source": "sensor.kitchen"}}
+
+@pytest.mark.parametrize("expression, expected", [
+    ("event_type=alert", True),
+    ("event_type=info", False),
+    ("payload.source^=sensor.", True),
+    ("payload.level>=3, payload.level<5", True),
+    ("payload.level=5..9", False),
+    ("payload.level=1..4 and event_type!=info", True),
+    ("payload.missing=1", False),
+    ("payload.level='4'", False),
+])
+def test_compiled_filter_matches(expression, expected):
+    assert compile_filter(expression).matches(EVENT) is expected
+
+def test_match_all_and_invalid_expressions():
+    assert compile_filter("all") is None
+    assert compile_filter(None) is None
+    with pytest.raises(ValueError):
+        compile_filter("level")
+
+def test_index_key_uses_first_equality_clause():
+    compiled = compile_filter("payload.level>=3, event_type=alert")
+    assert compiled.index_key == ("event_type", "alert")
+    assert compiled.residual({"payload": {"level": 1}}) is False
+
+def test_publish_only_visits_matching_buckets():
+    broker = SubscriptionBroker()
+    region_subscribers = {region: broker.subscribe("t", filter_expr=f"region={region}")
+                          for region in ("eu", "us", "ap")}
+    high = broker.subscribe("t", filter_expr="region=eu, level>=3")
+    everyone = broker.subscribe("t")
+
+    state = broker._topics["t"]
+    assert len(state.candidates({"region": "eu"})) == 3
+
+    assert broker.publish("t", {"region": "eu", "level": 1}) == 2
+    assert broker.publish("t", {"region": "eu", "level": 5}) == 3
+    assert region_subscribers["eu"].queue_depth == 2
+    assert region_subscribers["us"].queue_depth == 0
+    assert high.queue_depth == 1 and everyone.queue_depth == 2
+
+    high.close()
+    region_subscribers["ap"].close()
+    assert set(state.index["region"][1]) == {"eu", "us"}
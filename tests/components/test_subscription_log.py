@@ -0,0 +1,104 @@
+import pytest
+
+from fastestmcp.components.broker import SubscriptionBroker
+from fastestmcp.components.subscription_log import SubscriptionLog
+
+def test_append_read_and_rotate(tmp_path):
+    log = SubscriptionLog(str(tmp_path), segment_max_bytes=200)
+    for sequence in range(1, 21):
+        log.append("orders", sequence, {"id": sequence})
+    assert log.stats("orders")["segments"] > 1
+    assert [s for s, _ in log.read("orders", after=15)] == [16, 17, 18, 19, 20]
+    assert log.read("orders", after=3, limit=2, until=10) == [(4, {"id": 4}), (5, {"id": 5})]
+    with pytest.raises(ValueError):
+        log.append("orders", 20, {})
+
+def test_retention_deletes_oldest_segments(tmp_path):
+    log = SubscriptionLog(str(tmp_path), segment_max_bytes=100, retention_bytes=300)
+    for sequence in range(1, 51):
+        log.append("t", sequence, {"n": sequence})
+    stats = log.stats("t")
+    assert stats["first_sequence"] > 1 and stats["last_sequence"] == 50
+    assert stats["bytes"] <= 300 + 100
+
+def test_recovery_after_restart_truncates_torn_record(tmp_path):
+    log = SubscriptionLog(str(tmp_path))
+    log.append("t", 1, {"n": 1})
+    log.append("t", 2, {"n": 2})
+    log.close()
+    segment = next((tmp_path / "t").iterdir())
+    with open(segment, "ab") as f:
+        f.write(b"\x10\x00\x00")
+
+    reopened = SubscriptionLog(str(tmp_path))
+    assert reopened.last_sequence("t") == 2
+    reopened.append("t", 3, {"n": 3})
+    assert [s for s, _ in reopened.read("t")] == [1, 2, 3]
+
+def test_recovery_bounds_closed_segments_by_the_next_base(tmp_path):
+    log = SubscriptionLog(str(tmp_path), segment_max_bytes=100)
+    for sequence in range(1, 21):
+        log.append("t", sequence, {"n": sequence})
+    log.close()
+
+    reopened = SubscriptionLog(str(tmp_path), segment_max_bytes=100)
+    state = reopened._topic("t")
+    assert len(state.segments) > 2
+    for segment, following in zip(state.segments, state.segments[1:]):
+        assert segment.last_sequence == following.base_sequence - 1
+    assert reopened.first_sequence("t") == 1 and reopened.last_sequence("t") == 20
+    assert [s for s, _ in reopened.read("t", after=7, until=12)] == [8, 9, 10, 11, 12]
+
+def test_broker_resumes_from_log_after_restart(tmp_path):
+    broker = SubscriptionBroker(log=SubscriptionLog(str(tmp_path)))
+    for n in range(5):
+        broker.publish("orders", {"n": n})
+
+    restarted = SubscriptionBroker(log=SubscriptionLog(str(tmp_path)), replay_capacity=2)
+    assert restarted.publish("orders", {"n": 5}) == 0
+    assert restarted.last_sequence("orders") == 6
+    subscriber = restarted.subscribe("orders", resume_after=2)
+    assert [subscriber.get_nowait()["n"] for _ in range(4)] == [2, 3, 4, 5]
+    assert subscriber.missed == 0 and subscriber.get_nowait() is None
+
+def test_spill_policy_catches_up_from_log(tmp_path):
+    broker = SubscriptionBroker(log=SubscriptionLog(str(tmp_path)), max_queue_size=3, policy="spill")
+    subscriber = broker.subscribe("t", filter_expr="n>=0")
+    for n in range(10):
+        broker.publish("t", {"n": n})
+    assert subscriber.dropped == 0
+    assert [subscriber.get_nowait()["n"] for _ in range(10)] == list(range(10))
+    assert subscriber.get_nowait() is None
+
+def test_spill_requires_log():
+    with pytest.raises(ValueError):
+        SubscriptionBroker(policy="spill")
+
+def test_spill_while_reading_backlog_does_not_replay_events(tmp_path):
+    broker = SubscriptionBroker(log=SubscriptionLog(str(tmp_path)), max_queue_size=3, policy="spill")
+    subscriber = broker.subscribe("t")
+    for n in range(10):
+        broker.publish("t", {"n": n})
+    received = [subscriber.get_nowait()["n"] for _ in range(2)]
+    for n in range(10, 20):
+        broker.publish("t", {"n": n})
+    while (event := subscriber.get_nowait()) is not None:
+        received.append(event["n"])
+    assert received == list(range(20))
+
+    # A cursor restarted while a page is still loaded continues after that page
+    subscriber._log_cursor = None
+    subscriber._backlog.extend([(21, {}), (22, {})])
+    subscriber._read_from_log(subscriber.last_sequence, 30)
+    assert subscriber._log_cursor == 22
+
+def test_compact_trims_idle_topics(tmp_path):
+    log = SubscriptionLog(str(tmp_path), segment_max_bytes=100, retention_seconds=3600)
+    for sequence in range(1, 21):
+        log.append("idle", sequence, {"n": sequence})
+    segments = log.stats("idle")["segments"]
+    assert segments > 1 and log.compact() == 0
+    log.retention_seconds = -1
+    assert log.compact("idle") == segments - 1
+    stats = log.stats("idle")
+    assert stats["segments"] == 1 and stats["last_sequence"] == 20
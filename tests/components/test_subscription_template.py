@@ -0,0 +1,91 @@
+import asyncio
+from unittest.mock import Mock
+
+from fastestmcp.components.broker import SubscriptionBroker
+from fastestmcp.components.subscriptions.subscription_template import (
+    create_publish_function,
+    create_subscription_function,
+    register_subscriptions,
+)
+
+def test_subscription_streams_published_events():
+    broker = SubscriptionBroker()
+    subscription = create_subscription_function(1, broker)
+    publish = create_publish_function(1, broker)
+
+    async def run():
+        stream = subscription("all")
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        result = publish({"value": 42})
+        event = await asyncio.wait_for(first, 1)
+        await stream.aclose()
+        return result, event
+
+    result, event = asyncio.run(run())
+    assert result["delivered_to"] == 1
+    assert event["subscription_id"] == "subscription_1"
+    assert event["data"]["payload"] == {"value": 42}
+    assert event["data"]["sequence_number"] == 1
+    assert broker.subscriber_count("subscription_1") == 0
+
+def test_register_subscriptions_adds_publish_tools():
+    server = Mock()
+    register_subscriptions(server, count=2)
+    assert server.add_subscription.call_count == 2
+    names = [call.args[0].__name__ for call in server.add_tool.call_args_list]
+    assert "publish_subscription_1" in names and "publish_subscription_2" in names
+
+def test_subscription_resumes_from_last_event_id():
+    broker = SubscriptionBroker()
+    subscription = create_subscription_function(1, broker)
+    publish = create_publish_function(1, broker)
+    for value in range(3):
+        publish({"value": value})
+
+    async def run():
+        stream = subscription("all", last_event_id="event_1_1")
+        events = [await stream.__anext__() for _ in range(2)]
+        await stream.aclose()
+        return events
+
+    events = asyncio.run(run())
+    assert [e["event_id"] for e in events] == ["event_1_2", "event_1_3"]
+    assert [e["data"]["payload"]["value"] for e in events] == [1, 2]
+
+def test_overview_and_status_report_live_counters():
+    from fastestmcp.components.subscriptions.subscription_template import get_subscription_overview
+
+    broker = SubscriptionBroker(max_queue_size=1, policy="drop_newest")
+    server = Mock()
+    register_subscriptions(server, count=1, broker=broker)
+    tools = {call.args[0].__name__: call.args[0] for call in server.add_tool.call_args_list}
+
+    subscriber = broker.subscribe("subscription_1")
+    tools["publish_subscription_1"]({"n": 1})
+    tools["publish_subscription_1"]({"n": 2})
+
+    status = tools["manage_subscription_1"]("status")
+    assert status["events_published"] == 2
+    assert status["events_sent"] == 1 and status["events_dropped"] == 1
+    assert status["subscribers"] == 1 and status["queue_depth"] == 1
+    assert status["last_activity"] is not None
+
+    overview = get_subscription_overview()
+    entry = next(s for s in overview["subscriptions"] if s["id"] == "subscription_1")
+    assert entry["status"] == "active" and entry["published"] == 2
+    assert isinstance(overview["total_subscriptions"], int)
+    subscriber.close()
+
+def test_log_dir_uses_a_private_broker(tmp_path):
+    from unittest.mock import Mock
+    from fastestmcp.components.broker import default_broker
+    from fastestmcp.components.subscriptions.subscription_template import (
+        register_subscriptions, publish_subscription_event, _registered_subscriptions)
+    register_subscriptions(Mock(), count=1, log_dir=str(tmp_path))
+    broker = _registered_subscriptions[1]
+    assert broker is not default_broker and broker.log is not None
+    assert default_broker.log is None
+    publish_subscription_event(1, {"n": 1})
+    assert broker.log.last_sequence("subscription_1") == 1
+    _registered_subscriptions.clear()
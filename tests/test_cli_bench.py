@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from fastmcp import FastMCP
+
+from fastestmcp.cli.bench import format_report, parse_call, parse_mix, run_bench
+
+
+def make_server():
+    mcp = FastMCP("bench")
+
+    @mcp.tool
+    def ping() -> str:
+        return "pong"
+
+    @mcp.tool
+    def echo(message: str) -> str:
+        return message
+
+    @mcp.tool
+    def fail(reason: str) -> str:
+        raise ValueError(reason)
+
+    @mcp.resource("data://status")
+    def status() -> str:
+        return "ok"
+
+    @mcp.prompt
+    def hello() -> str:
+        return "hello"
+
+    return mcp
+
+
+class TestCLIBench:
+    """Test the bench subcommand's workload and report"""
+
+    def test_parse_call_and_mix(self):
+        assert parse_call('tool:echo:{"message": "hi"}') == ("tool", "echo", {"message": "hi"})
+        assert parse_call("resource:data://status") == ("resource", "data://status", {})
+        assert parse_mix("tools=70,resources=30") == {"tool": 70.0, "resource": 30.0}
+        with pytest.raises(ValueError):
+            parse_call("echo")
+
+    def test_discovered_workload_is_reproducible(self):
+        server = make_server()
+        first = asyncio.run(run_bench(server, sessions=3, requests=90, seed=7, warmup=2))
+        second = asyncio.run(run_bench(server, sessions=3, requests=90, seed=7, warmup=2))
+        other = asyncio.run(run_bench(server, sessions=3, requests=90, seed=8, warmup=2))
+        assert first["workload_sha1"] == second["workload_sha1"] != other["workload_sha1"]
+        # echo and fail need arguments, so only argument-free calls are discovered
+        assert set(first["operations"]) == {"tool:ping", "resource:data://status", "prompt:hello"}
+        assert first["requests"] == 90 and first["errors"] == 0 and first["throughput_rps"] > 0
+
+    def test_explicit_calls_and_text_report(self):
+        calls = [parse_call('tool:echo:{"message": "hi"}'), parse_call('tool:fail:{"reason": "nope"}')]
+        report = asyncio.run(run_bench(make_server(), sessions=2, requests=12, calls=calls, mix="tools=1", warmup=0))
+        assert report["requests"] == 12
+        assert report["operations"]["tool:echo"]["errors"] == 0
+        assert report["errors"] == report["operations"]["tool:fail"]["errors"] > 0
+        assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+        text = format_report(report)
+        assert "req/s" in text and "tool:echo" in text and "ToolError" in text
+
+    def test_discovery_skips_kinds_the_server_cannot_list(self):
+        class ToolsOnly:
+            def __init__(self, client):
+                self._client = client
+            def __getattr__(self, name):
+                return getattr(self._client, name)
+            async def __aenter__(self):
+                await self._client.__aenter__()
+                return self
+            async def __aexit__(self, *exc):
+                return await self._client.__aexit__(*exc)
+            async def list_resources(self):
+                raise RuntimeError("Method not found")
+            async def list_prompts(self):
+                raise RuntimeError("Method not found")
+
+        from fastmcp import Client
+        report = asyncio.run(run_bench(make_server(), sessions=1, requests=5, warmup=0,
+                                       client_factory=lambda target: ToolsOnly(Client(target))))
+        assert set(report["operations"]) == {"tool:ping"} and report["errors"] == 0